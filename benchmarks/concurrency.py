@@ -0,0 +1,171 @@
+"""
+Concurrency benchmark for the sync (psycopg2) and async (psycopg 3) user
+repositories.
+
+Drives GET /api/v1/user/{id} through the real ASGI app with a configurable
+number of concurrent clients and reports how many requests were inside the
+repository at the same time on this single worker, along with throughput and
+latency. ``--query-delay-ms`` adds a ``pg_sleep`` to every lookup to model a
+slow query.
+
+Neither driver runs queries on the event loop: the sync repository is called
+in the threadpool, so its requests in flight are capped by the threadpool
+size (``--threads``, 40 by default in AnyIO) and each one holds a thread while
+it waits for a connection, whereas the async repository only waits on the
+connection pool. Throughput of both is bounded by DB_POOL_MAX_SIZE; with more
+clients than threads the sync driver queues requests before they reach the
+repository.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.concurrency \
+        --requests 200 --concurrency 50 --query-delay-ms 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from typing import List
+
+import anyio.to_thread
+import httpx
+
+from src.api.config.database import AsyncDatabasePool, DatabasePool
+from src.api.dependencies.provider import get_user_service
+from src.api.main import app
+from src.api.model.domain import User
+from src.api.repository.async_user_repository import AsyncUserRepository
+from src.api.repository.user_repository import UserRepository
+from src.api.service.user_service import UserService
+
+
+class InFlight:
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        # The sync repository is entered from threadpool threads
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def exit(self):
+        with self._lock:
+            self.current -= 1
+
+
+class TrackedUserRepository(UserRepository):
+    def __init__(self, in_flight: InFlight, delay: float):
+        super().__init__()
+        self.in_flight = in_flight
+        self.delay = delay
+
+    def get_user(self, user_id):
+        self.in_flight.enter()
+        try:
+            if self.delay:
+                with DatabasePool.get_connection() as conn:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT pg_sleep(%s)", (self.delay,))
+            return super().get_user(user_id)
+        finally:
+            self.in_flight.exit()
+
+
+class TrackedAsyncUserRepository(AsyncUserRepository):
+    def __init__(self, in_flight: InFlight, delay: float):
+        super().__init__()
+        self.in_flight = in_flight
+        self.delay = delay
+
+    async def get_user(self, user_id):
+        self.in_flight.enter()
+        try:
+            if self.delay:
+                async with AsyncDatabasePool.get_connection() as conn:
+                    await conn.execute("SELECT pg_sleep(%s)", (self.delay,))
+            return await super().get_user(user_id)
+        finally:
+            self.in_flight.exit()
+
+
+async def run(driver: str, user_ids: List[int], args) -> dict:
+    in_flight = InFlight()
+    delay = args.query_delay_ms / 1000
+    repository = (
+        TrackedAsyncUserRepository(in_flight, delay)
+        if driver == "async"
+        else TrackedUserRepository(in_flight, delay)
+    )
+    service = UserService(repository)
+    app.dependency_overrides[get_user_service] = lambda: service
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one(n):
+            async with semaphore:
+                start = time.perf_counter()
+                user_id = user_ids[n % len(user_ids)]
+                response = await client.get(f"/api/v1/user/{user_id}")
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(n) for n in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    app.dependency_overrides.clear()
+    latencies.sort()
+    return {
+        "driver": driver,
+        "peak_in_flight": in_flight.peak,
+        "requests_per_sec": args.requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main(args):
+    if args.threads:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = args.threads
+    # One user per client: concurrent reads of the same id share one query
+    run_id = time.time_ns()
+    user_ids = [
+        user.id
+        for user in UserRepository().save_many(
+            [
+                User(username=f"bench-{run_id}-{n}", email=f"{run_id}-{n}@bench.io")
+                for n in range(args.concurrency)
+            ]
+        )
+    ]
+    results = [await run(driver, user_ids, args) for driver in ("sync", "async")]
+    await AsyncDatabasePool.close()
+
+    print(
+        f"{'driver':<8}{'peak in flight':>16}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['driver']:<8}{r['peak_in_flight']:>16}{r['requests_per_sec']:>10.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-delay-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--threads", type=int, help="threadpool size for the sync driver"
+    )
+    asyncio.run(main(parser.parse_args()))
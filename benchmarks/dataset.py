@@ -0,0 +1,474 @@
+"""
+Synthetic dataset generator for performance testing at production sizes.
+
+Fills the ``address`` and ``user`` tables of docs/db.schema.sql with users
+whose distributions are skewed the way real data is, so that index
+selectivity, plans and cache behaviour match what production sees:
+
+- roles and statuses: mostly GUEST and ACTIVE, with a long tail of STAFF,
+  ADMIN and SUPER_ADMIN and of inactive, suspended and deleted accounts
+- names, cities and email domains drawn from Zipf-weighted lists, so a few
+  values are very common and most are rare
+- shared addresses: households of several users at one address, a small set
+  of office addresses shared by thousands of staff users, and users without
+  an address at all
+- timestamps: sign-ups accelerating over ``--years`` up to ``--end`` (ids and
+  created_at increase together, as with the serial id), updates after sign-up
+  and last logins that depend on the status
+- phone numbers in several national and international formats, with their
+  E.164 form in phone_e164; some users have no email or no phone
+
+Rows are generated and loaded one chunk at a time with COPY, one transaction
+per chunk, so memory stays bounded by ``--chunk-size`` whatever ``--users``
+is. The same ``--seed``, ``--users``, ``--chunk-size``, ``--offices``,
+``--years`` and ``--end`` always produce the same rows. Ids continue from the
+largest existing ones, and the serial sequences are moved past the loaded rows
+at the end. Loading is faster into a table without the indexes of
+docs/db.indexes.sql; create them afterwards for the largest datasets.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.dataset --users 10000000
+    python -m benchmarks.dataset --users 1000000 --seed 7 --truncate
+"""
+
+import argparse
+import io
+import itertools
+import math
+import random
+import sys
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import psycopg2
+
+from src.api.cli.import_users import ADDRESS_COLUMNS
+from src.api.config import settings
+from src.api.model.enum import UserRole, UserStatus
+from src.api.utils.identifiers import normalize_phone
+
+USER_COLUMNS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "phone_number",
+    "phone_e164",
+    "address_id",
+    "role",
+    "status",
+    "created_at",
+    "updated_at",
+    "last_login_at",
+)
+
+ROLE_WEIGHTS = {
+    UserRole.GUEST.value: 0.80,
+    UserRole.STAFF.value: 0.17,
+    UserRole.ADMIN.value: 0.027,
+    UserRole.SUPER_ADMIN.value: 0.003,
+}
+STATUS_WEIGHTS = {
+    UserStatus.ACTIVE.value: 0.78,
+    UserStatus.INACTIVE.value: 0.14,
+    UserStatus.SUSPENDED.value: 0.05,
+    UserStatus.DELETED.value: 0.03,
+}
+# Users per household: most live alone, some share an address
+HOUSEHOLD_WEIGHTS = {1: 0.62, 2: 0.22, 3: 0.09, 4: 0.05, 5: 0.02}
+
+NO_ADDRESS = 0.08  # Households without an address
+NO_EMAIL = 0.06  # Users registered with a phone number only
+NO_PHONE = 0.35  # Users registered with an email only
+NEVER_LOGGED_IN = 0.12
+AT_OFFICE = 0.6  # STAFF and above registered at an office address
+
+FIRST_NAMES = (
+    "James Mary John Patricia Robert Jennifer Michael Linda David Elizabeth "
+    "William Barbara Richard Susan Joseph Jessica Thomas Sarah Carlos Karen "
+    "Daniel Lisa Matthew Nancy Anthony Betty Mark Sandra Wei Ashley Luis Emily "
+    "Ahmed Maria Hiroshi Fatima Olga Priya Mateo Sofia Noah Aisha Liam Chloe "
+    "Ivan Ingrid Kwame Mei Diego Zainab"
+).split()
+LAST_NAMES = (
+    "Smith Johnson Williams Brown Jones Garcia Miller Davis Rodriguez Martinez "
+    "Hernandez Lopez Gonzalez Wilson Anderson Thomas Taylor Moore Jackson Martin "
+    "Lee Perez Thompson White Harris Sanchez Clark Ramirez Lewis Robinson Walker "
+    "Young Allen King Wright Scott Nguyen Hill Flores Green Adams Nelson Baker "
+    "Kim Mueller Rossi Silva Kowalski Tanaka Okafor"
+).split()
+STREETS = (
+    "Main Oak Pine Maple Cedar Elm Washington Lake Hill Park Sunset Lincoln "
+    "River Church Mill Spring Highland Forest Meadow Ridge"
+).split()
+STREET_SUFFIXES = ("St", "Ave", "Rd", "Blvd", "Ln", "Dr", "Ct", "Way")
+# (city, state, country, postal code prefix), most populous first
+CITIES = (
+    ("New York", "NY", "US", "100"),
+    ("Los Angeles", "CA", "US", "900"),
+    ("London", "England", "GB", "EC"),
+    ("Chicago", "IL", "US", "606"),
+    ("Toronto", "ON", "CA", "M5"),
+    ("Houston", "TX", "US", "770"),
+    ("Berlin", "Berlin", "DE", "10"),
+    ("Phoenix", "AZ", "US", "850"),
+    ("Madrid", "Madrid", "ES", "28"),
+    ("Philadelphia", "PA", "US", "191"),
+    ("Sydney", "NSW", "AU", "20"),
+    ("San Antonio", "TX", "US", "782"),
+    ("Paris", "Ile-de-France", "FR", "75"),
+    ("San Diego", "CA", "US", "921"),
+    ("Dallas", "TX", "US", "752"),
+    ("Mumbai", "Maharashtra", "IN", "400"),
+    ("Austin", "TX", "US", "787"),
+    ("Sao Paulo", "SP", "BR", "01"),
+    ("Seattle", "WA", "US", "981"),
+    ("Denver", "CO", "US", "802"),
+    ("Lagos", "Lagos", "NG", "10"),
+    ("Boston", "MA", "US", "021"),
+    ("Tokyo", "Tokyo", "JP", "100"),
+    ("Portland", "OR", "US", "972"),
+    ("Warsaw", "Mazowieckie", "PL", "00"),
+    ("Nashville", "TN", "US", "372"),
+    ("Milan", "Lombardy", "IT", "201"),
+    ("Springfield", "IL", "US", "627"),
+    ("Reno", "NV", "US", "895"),
+    ("Burlington", "VT", "US", "054"),
+)
+EMAIL_DOMAINS = (
+    "gmail.com",
+    "yahoo.com",
+    "outlook.com",
+    "hotmail.com",
+    "icloud.com",
+    "aol.com",
+    "proton.me",
+    "gmx.de",
+    "mail.ru",
+    "example.org",
+)
+# National and international ways of writing the same number
+PHONE_FORMATS = (
+    "+1 {a} {b} {c}",
+    "({a}) {b}-{c}",
+    "{a}-{b}-{c}",
+    "{a}.{b}.{c}",
+    "+1{a}{b}{c}",
+    "001 {a} {b} {c}",
+)
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..count."""
+    return list(
+        itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1))
+    )
+
+
+def cumulative(weights: dict) -> Tuple[list, List[float]]:
+    return list(weights), list(itertools.accumulate(weights.values()))
+
+
+ROLES, ROLE_CUM = cumulative(ROLE_WEIGHTS)
+STATUSES, STATUS_CUM = cumulative(STATUS_WEIGHTS)
+HOUSEHOLDS, HOUSEHOLD_CUM = cumulative(HOUSEHOLD_WEIGHTS)
+FIRST_CUM = zipf_weights(len(FIRST_NAMES))
+LAST_CUM = zipf_weights(len(LAST_NAMES))
+CITY_CUM = zipf_weights(len(CITIES))
+DOMAIN_CUM = zipf_weights(len(EMAIL_DOMAINS), 1.4)
+STREET_CUM = zipf_weights(len(STREETS), 0.8)
+PHONE_FORMAT_CUM = zipf_weights(len(PHONE_FORMATS), 0.7)
+
+
+def copy_line(values: Sequence) -> str:
+    # Generated values come from the lists above and never contain tabs,
+    # backslashes or newlines, so only NULLs and timestamps need encoding
+    return "\t".join(
+        (
+            "\\N"
+            if value is None
+            else value.isoformat(" ") if isinstance(value, datetime) else str(value)
+        )
+        for value in values
+    )
+
+
+def copy_lines(cur, table: str, columns: Tuple[str, ...], lines: List[str]) -> None:
+    if lines:
+        buffer = io.StringIO("\n".join(lines) + "\n")
+        cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+class Generator:
+    """
+    Generates users and addresses chunk by chunk. Chunk ``n`` draws from its
+    own random.Random seeded with the seed and ``n``, so what it draws does
+    not depend on how the previous chunks were generated.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        users: int,
+        offices: int,
+        years: float,
+        end: datetime,
+        user_start: int = 0,
+        address_start: int = 0,
+    ):
+        self.seed = seed
+        self.users = users
+        self.end = end
+        self.span = timedelta(days=365.25 * years).total_seconds()
+        self.start = end - timedelta(seconds=self.span)
+        self.next_user_id = user_start + 1
+        self.next_address_id = address_start + 1
+        self.offices = [
+            self._address(random.Random(f"{seed}:office:{n}")) for n in range(offices)
+        ]
+        self.office_ids: List[int] = []
+        self.office_cum = zipf_weights(offices)
+
+    def office_rows(self) -> List[tuple]:
+        """Office addresses, shared by staff users; loaded before any user."""
+        rows = []
+        for office in self.offices:
+            self.office_ids.append(self.next_address_id)
+            rows.append((self.next_address_id, *office))
+            self.next_address_id += 1
+        return rows
+
+    def chunks(self, size: int) -> Iterator[Tuple[List[str], List[str]]]:
+        """Yields (address COPY lines, user COPY lines) per chunk."""
+        for number, first in enumerate(range(0, self.users, size)):
+            rng = random.Random(f"{self.seed}:{number}")
+            yield self._chunk(rng, first, min(size, self.users - first))
+
+    def _chunk(self, rng: random.Random, first: int, count: int):
+        roles = rng.choices(ROLES, cum_weights=ROLE_CUM, k=count)
+        statuses = rng.choices(STATUSES, cum_weights=STATUS_CUM, k=count)
+        first_names = rng.choices(FIRST_NAMES, cum_weights=FIRST_CUM, k=count)
+        last_names = rng.choices(LAST_NAMES, cum_weights=LAST_CUM, k=count)
+        domains = rng.choices(EMAIL_DOMAINS, cum_weights=DOMAIN_CUM, k=count)
+
+        address_lines, user_lines = [], []
+        household_left, household_address = 0, None
+        for i in range(count):
+            user_id = self.next_user_id
+            self.next_user_id += 1
+            role, status = roles[i], statuses[i]
+            if role != UserRole.GUEST and self.offices and rng.random() < AT_OFFICE:
+                # A few head offices hold most of the staff
+                address_id = self.office_ids[
+                    bisect_right(self.office_cum, rng.random() * self.office_cum[-1])
+                ]
+            else:
+                if not household_left:
+                    household_left = rng.choices(HOUSEHOLDS, cum_weights=HOUSEHOLD_CUM)[
+                        0
+                    ]
+                    household_address = None
+                    if rng.random() >= NO_ADDRESS:
+                        household_address = self.next_address_id
+                        self.next_address_id += 1
+                        address_lines.append(
+                            copy_line((household_address, *self._address(rng)))
+                        )
+                household_left -= 1
+                address_id = household_address
+
+            first_name, last_name = first_names[i], last_names[i]
+            username = f"{first_name}.{last_name}{user_id}".lower()
+            email = None
+            if rng.random() >= NO_EMAIL:
+                email = f"{first_name}.{last_name}.{user_id}@{domains[i]}".lower()
+            phone = None
+            if email is None or rng.random() >= NO_PHONE:
+                phone = self._phone(rng)
+
+            user_lines.append(
+                copy_line(
+                    (
+                        user_id,
+                        username,
+                        email,
+                        first_name,
+                        last_name,
+                        phone,
+                        normalize_phone(phone),
+                        address_id,
+                        role,
+                        status,
+                        *self._timestamps(
+                            rng, (first + i + rng.random()) / self.users, status
+                        ),
+                    )
+                )
+            )
+        return address_lines, user_lines
+
+    @staticmethod
+    def _address(rng: random.Random) -> tuple:
+        city, state, country, postal_prefix = rng.choices(CITIES, cum_weights=CITY_CUM)[
+            0
+        ]
+        street = rng.choices(STREETS, cum_weights=STREET_CUM)[0]
+        return (
+            f"{rng.randint(1, 9999)} {street} {rng.choice(STREET_SUFFIXES)}",
+            city,
+            state,
+            f"{postal_prefix}{rng.randint(0, 99):02d}",
+            country,
+        )
+
+    @staticmethod
+    def _phone(rng: random.Random) -> str:
+        fmt = rng.choices(PHONE_FORMATS, cum_weights=PHONE_FORMAT_CUM)[0]
+        return fmt.format(
+            a=rng.randint(201, 989),
+            b=f"{rng.randint(0, 999):03d}",
+            c=f"{rng.randint(0, 9999):04d}",
+        )
+
+    def _timestamps(
+        self, rng: random.Random, position: float, status: str
+    ) -> Tuple[datetime, datetime, Optional[datetime]]:
+        # Sign-ups grow linearly over the span, so the cumulative count grows
+        # with the square of time and created_at is the square root of the
+        # user's position in the sequence
+        created_at = self.start + timedelta(seconds=self.span * math.sqrt(position))
+        remaining = (self.end - created_at).total_seconds()
+        updated_at = created_at + timedelta(
+            seconds=min(remaining, rng.expovariate(1 / (30 * 86400)))
+        )
+        last_login_at = None
+        if status != UserStatus.DELETED and rng.random() >= NEVER_LOGGED_IN:
+            # Active users logged in recently, the others a while ago
+            mean_days = 3 if status == UserStatus.ACTIVE else 180
+            ago = min(remaining, rng.expovariate(1 / (mean_days * 86400)))
+            last_login_at = self.end - timedelta(seconds=ago)
+        return created_at, updated_at, last_login_at
+
+
+MAX_IDS = """
+    SELECT (SELECT COALESCE(max(id), 0) FROM "user"),
+           (SELECT COALESCE(max(id), 0) FROM address);
+"""
+
+# Moves the serial sequences past the loaded ids so the API keeps working
+RESET_SEQUENCES = """
+    SELECT setval(pg_get_serial_sequence('"user"', 'id'),
+                  GREATEST((SELECT max(id) FROM "user"), 1)),
+           setval(pg_get_serial_sequence('address', 'id'),
+                  GREATEST((SELECT max(id) FROM address), 1));
+"""
+
+
+def run(args) -> int:
+    conn = psycopg2.connect(args.database_url)
+    started, loaded, addresses = time.perf_counter(), 0, 0
+    try:
+        with conn.cursor() as cur:
+            # Synthetic rows can be regenerated, so do not wait for each
+            # commit to be flushed to disk
+            cur.execute("SET synchronous_commit = off")
+            if args.truncate:
+                cur.execute('TRUNCATE "user", address RESTART IDENTITY')
+            cur.execute(MAX_IDS)
+            user_start, address_start = cur.fetchone()
+            generator = Generator(
+                args.seed,
+                args.users,
+                args.offices,
+                args.years,
+                args.end,
+                user_start,
+                address_start,
+            )
+            offices = generator.office_rows()
+            copy_lines(cur, "address", ADDRESS_COLUMNS, [copy_line(r) for r in offices])
+            addresses = len(offices)
+        conn.commit()
+
+        # The next chunk is generated while the current one is copied (COPY
+        # releases the GIL), so at most two chunks are in memory
+        chunks = generator.chunks(args.chunk_size)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(next, chunks, None)
+            while (chunk := pending.result()) is not None:
+                pending = executor.submit(next, chunks, None)
+                address_lines, user_lines = chunk
+                with conn.cursor() as cur:
+                    copy_lines(cur, "address", ADDRESS_COLUMNS, address_lines)
+                    copy_lines(cur, '"user"', USER_COLUMNS, user_lines)
+                conn.commit()
+                loaded += len(user_lines)
+                addresses += len(address_lines)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"users {loaded:,}/{args.users:,}, addresses {addresses:,}, "
+                    f"{loaded / elapsed:,.0f} users/s",
+                    file=sys.stderr,
+                )
+
+        with conn.cursor() as cur:
+            cur.execute(RESET_SEQUENCES)
+            if args.analyze:
+                cur.execute('ANALYZE "user"')
+                cur.execute("ANALYZE address")
+        conn.commit()
+    finally:
+        conn.close()
+    return loaded
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.dataset",
+        description=__doc__.splitlines()[1],
+    )
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--chunk-size", type=int, default=50_000, help="users per COPY transaction"
+    )
+    parser.add_argument(
+        "--offices", type=int, default=200, help="addresses shared by staff users"
+    )
+    parser.add_argument(
+        "--years", type=float, default=5, help="time span of the sign-ups"
+    )
+    parser.add_argument(
+        "--end",
+        type=datetime.fromisoformat,
+        default=datetime(2025, 1, 1),
+        help="latest timestamp, ISO 8601 (fixed so runs are reproducible)",
+    )
+    parser.add_argument(
+        "--truncate", action="store_true", help="empty the tables first"
+    )
+    parser.add_argument(
+        "--no-analyze",
+        dest="analyze",
+        action="store_false",
+        help="skip ANALYZE after loading",
+    )
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    started = time.perf_counter()
+    loaded = run(parse_args(argv))
+    print(
+        f"done: loaded {loaded:,} users in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Memory and construction cost of the User and Address domain models.
+
+Builds --users users (each with an address) from in-memory tuple rows, as the
+repository does, once with the previous __dict__-based classes and once with
+the slotted models, then stores them in the in-process LRU cache. Reports
+the bytes traced per user (tracemalloc; the row values themselves are
+allocated beforehand and shared by both runs) and the construction time,
+measured separately without tracing.
+
+Usage:
+    python -m benchmarks.domain_memory --users 200000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from src.api.cache import LRUTTLCache
+from src.api.model.domain import Address, User
+from src.api.model.enum import UserRole, UserStatus
+
+
+class LegacyAddress:
+    def __init__(
+        self,
+        id=None,
+        street=None,
+        city=None,
+        state=None,
+        country=None,
+        postal_code=None,
+    ):
+        self.id = id
+        self.street = street
+        self.city = city
+        self.state = state
+        self.country = country
+        self.postal_code = postal_code
+
+
+class LegacyUser:
+    def __init__(
+        self,
+        id=None,
+        username=None,
+        email=None,
+        first_name=None,
+        last_name=None,
+        phone_number=None,
+        address=None,
+        role=UserRole.GUEST,
+        status=UserStatus.ACTIVE,
+        last_login_at=None,
+        created_at=None,
+        updated_at=None,
+    ):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.first_name = first_name
+        self.last_name = last_name
+        self.phone_number = phone_number
+        self.address = address
+        self.role = role
+        self.status = status
+        self.last_login_at = last_login_at
+        self.created_at = created_at or datetime.now(timezone.utc)
+        self.updated_at = updated_at or datetime.now(timezone.utc)
+
+
+def make_rows(count):
+    start = datetime(2024, 1, 1)
+    return [
+        (
+            user_id,
+            f"user{user_id}",
+            f"user{user_id}@example.com",
+            "First",
+            "Last",
+            None,
+            user_id,
+            UserRole.GUEST,
+            UserStatus.ACTIVE,
+            None,
+            start + timedelta(seconds=user_id),
+            start + timedelta(seconds=user_id),
+            f"{user_id} Main St",
+            "Town",
+            None,
+            "US",
+            None,
+        )
+        for user_id in range(count)
+    ]
+
+
+def build(user_class, address_class, rows):
+    return [
+        user_class(
+            *row[:6],
+            address_class(row[6], *row[12:]),
+            *row[7:12],
+        )
+        for row in rows
+    ]
+
+
+def measure(name, user_class, address_class, rows):
+    started = time.perf_counter()
+    build(user_class, address_class, rows)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    users = build(user_class, address_class, rows)
+    objects = tracemalloc.get_traced_memory()[0]
+
+    cache = LRUTTLCache(max_size=len(users), ttl=60)
+    for user in users:
+        cache.set(f"user:{user.id}", user)
+    cached = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (
+        name,
+        objects / len(rows),
+        cached / len(rows),
+        elapsed / len(rows) * 1e6,
+    )
+
+
+def main(args):
+    rows = make_rows(args.users)
+    results = [
+        measure("__dict__", LegacyUser, LegacyAddress, rows),
+        measure("__slots__", User, Address, rows),
+    ]
+    print(f"{args.users} users with an address")
+    print(f"{'model':<11}{'bytes/user':>12}{'cached bytes/user':>19}{'build us':>10}")
+    for name, objects, cached, build_us in results:
+        print(f"{name:<11}{objects:>12.0f}{cached:>19.0f}{build_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200000)
+    main(parser.parse_args())
@@ -0,0 +1,358 @@
+"""
+End-to-end load benchmark for the user service.
+
+Drives ``src.api.main:app`` in-process through an async HTTP client (no
+network, no server) with a configurable number of concurrent clients, and
+reports requests/sec and p50/p95/p99 latency for each scenario:
+
+- ``register``: POST /api/v1/user with a new user per request
+- ``get``: GET /api/v1/user/{id} over users seeded before the run
+- ``health``: GET /health/ready
+
+``--backend memory`` (default) swaps the repository for an in-memory one, so
+the numbers are the cost of the app itself: routing, validation, service,
+cache and serialization. ``--backend postgres`` uses the configured database
+and driver (``DATABASE_URL``, ``DATABASE_DRIVER``) and runs the app lifespan
+as in production.
+
+Results can be written as JSON with ``--output`` and compared against an
+earlier run with ``--compare``, e.g. one file per commit.
+
+Usage:
+    python -m benchmarks.load --concurrency 50 --requests 2000 \
+        --output load-$(git rev-parse --short HEAD).json
+    DATABASE_URL=postgresql://... python -m benchmarks.load --backend postgres \
+        --compare load-main.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException, status
+
+from src.api.cache import UserAvailabilityFilter
+from src.api.config import settings
+from src.api.config.database import AsyncDatabasePool, DatabasePool
+from src.api.dependencies.provider import (
+    Providers,
+    get_health_service,
+    get_user_service,
+)
+from src.api.main import app
+from src.api.model.domain import User
+from src.api.model.enum import UserIdentifier, UserRole, UserStatus
+from src.api.service.health_service import HealthService
+from src.api.service.user_service import UserService
+from src.api.utils.identifiers import normalize_email, normalize_phone
+
+SCENARIOS = ("register", "get", "health")
+
+
+class InMemoryUserRepository:
+    """
+    Repository keeping users in dicts, with the interface and conflict
+    behaviour of AsyncUserRepository. Only meant for benchmarks: nothing is
+    persisted and there is no transaction isolation.
+    """
+
+    def __init__(self, availability_filter: Optional[UserAvailabilityFilter] = None):
+        self.availability_filter = availability_filter
+        self._users: Dict[int, User] = {}
+        self._by_username: Dict[str, User] = {}
+        self._by_email: Dict[str, User] = {}
+        self._by_phone: Dict[str, User] = {}
+        self._ids = itertools.count(1)
+        self._address_ids = itertools.count(1)
+
+    async def check_db_connection(self) -> str:
+        return "Connected"
+
+    def _insert(self, user: User) -> Optional[User]:
+        email = normalize_email(user.email) if user.email else None
+        if user.username in self._by_username or email in self._by_email:
+            return None
+        user.id = next(self._ids)
+        if user.address is not None:
+            user.address.id = next(self._address_ids)
+        self._users[user.id] = user
+        if user.username is not None:
+            self._by_username[user.username] = user
+        if email is not None:
+            self._by_email.setdefault(email, user)
+        phone = normalize_phone(user.phone_number)
+        if phone is not None:
+            self._by_phone.setdefault(phone, user)
+        if self.availability_filter is not None:
+            self.availability_filter.add(user.username, user.email)
+        return user
+
+    async def save(self, user: User) -> Optional[User]:
+        saved_user = self._insert(user)
+        if saved_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="User already exists"
+            )
+        return saved_user
+
+    async def save_many(self, users: List[User]) -> List[Optional[User]]:
+        return [self._insert(user) for user in users]
+
+    async def get_user(self, user_id: int) -> Optional[User]:
+        return self._users.get(user_id)
+
+    async def get_user_by(
+        self, identifier: UserIdentifier, value: str
+    ) -> Optional[User]:
+        index = {
+            UserIdentifier.USERNAME: self._by_username,
+            UserIdentifier.EMAIL: self._by_email,
+            UserIdentifier.PHONE: self._by_phone,
+        }[identifier]
+        return index.get(value)
+
+    async def get_users(self, user_ids: List[int]) -> List[User]:
+        return [self._users[i] for i in user_ids if i in self._users]
+
+    async def list_users(
+        self,
+        limit: int,
+        role: Optional[UserRole] = None,
+        user_status: Optional[UserStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[User]:
+        users = sorted(self._users.values(), key=lambda u: (u.created_at, u.id))
+        return [
+            user
+            for user in users
+            if (role is None or user.role == role)
+            and (user_status is None or user.status == user_status)
+            and (created_from is None or user.created_at >= created_from)
+            and (created_to is None or user.created_at < created_to)
+            and (after is None or (user.created_at, user.id) > after)
+        ][:limit]
+
+    async def iter_users(self, batch_size: int) -> AsyncIterator[List[User]]:
+        users = iter(list(self._users.values()))
+        while batch := list(itertools.islice(users, batch_size)):
+            yield batch
+
+    async def find_taken(
+        self, username: Optional[str], email: Optional[str]
+    ) -> Tuple[bool, bool]:
+        return username in self._by_username, email in self._by_email
+
+    async def iter_identities(
+        self, batch_size: int
+    ) -> AsyncIterator[List[Tuple[Optional[str], Optional[str]]]]:
+        async for users in self.iter_users(batch_size):
+            yield [(user.username, user.email) for user in users]
+
+
+def use_memory_backend() -> None:
+    """Routes the app's services to an InMemoryUserRepository."""
+    repository = InMemoryUserRepository()
+    cache = Providers.get_user_cache()
+    user_service = UserService(
+        repository,
+        cache,
+        stale_while_revalidate=settings.USER_CACHE_STALE_WHILE_REVALIDATE,
+        stale_if_error=settings.USER_CACHE_STALE_IF_ERROR,
+    )
+    health_service = HealthService(
+        repository,
+        cache,
+        ready_ttl=settings.HEALTH_READY_CACHE_TTL,
+        probe_timeout=settings.HEALTH_PROBE_TIMEOUT,
+    )
+    app.dependency_overrides[get_user_service] = lambda: user_service
+    app.dependency_overrides[get_health_service] = lambda: health_service
+
+
+def new_user(run_id: str, n: int) -> dict:
+    return {
+        "username": f"load-{run_id}-{n}",
+        "email": f"load-{run_id}-{n}@bench.io",
+        "firstName": "Load",
+        "lastName": f"User {n}",
+        "phoneNumber": f"+1555{n % 10_000_000:07d}",
+        "address": {
+            "street": f"{n} Main St",
+            "city": "Springfield",
+            "state": "IL",
+            "postalCode": "62701",
+            "country": "US",
+        },
+    }
+
+
+async def seed(client: httpx.AsyncClient, run_id: str, count: int) -> List[int]:
+    """Registers ``count`` users through the batch endpoint; returns their ids."""
+    ids = []
+    for start in range(0, count, settings.USER_BATCH_MAX_SIZE):
+        batch = [
+            new_user(f"{run_id}-seed", n)
+            for n in range(start, min(count, start + settings.USER_BATCH_MAX_SIZE))
+        ]
+        response = await client.post("/api/v1/users:batch", json=batch)
+        response.raise_for_status()
+        ids += [r["user"]["id"] for r in response.json()["results"] if r["user"]]
+    return ids
+
+
+def percentile(latencies: List[float], p: int) -> float:
+    return statistics.quantiles(latencies, n=100, method="inclusive")[p - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: str, run_id: str, user_ids: List[int], args
+) -> dict:
+    counter = itertools.count()
+
+    def request():
+        n = next(counter)
+        if scenario == "register":
+            return client.post("/api/v1/user", json=new_user(run_id, n))
+        if scenario == "get":
+            return client.get(f"/api/v1/user/{user_ids[n % len(user_ids)]}")
+        return client.get("/health/ready")
+
+    async def measure(count: int) -> Tuple[List[float], int]:
+        queue = iter(range(count))
+        latencies, errors = [], 0
+
+        async def worker():
+            nonlocal errors
+            for _ in queue:
+                start = time.perf_counter()
+                response = await request()
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code >= 400
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        return latencies, errors
+
+    await measure(args.warmup)
+    started = time.perf_counter()
+    latencies, errors = await measure(args.requests)
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    run_id = str(time.time_ns())
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        user_ids = await seed(client, run_id, args.users)
+        for scenario in args.scenarios:
+            results[scenario] = await run_scenario(
+                client, scenario, run_id, user_ids, args
+            )
+    return results
+
+
+async def main(args):
+    if args.backend == "memory":
+        use_memory_backend()
+        results = await run(args)
+    else:
+        async with app.router.lifespan_context(app):
+            results = await run(args)
+        DatabasePool.close()
+        await AsyncDatabasePool.close()
+    app.dependency_overrides.clear()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "driver": settings.DATABASE_DRIVER if args.backend == "postgres" else None,
+        "cache": settings.USER_CACHE_BACKEND,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "results": results,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    print(
+        f"{'scenario':<10}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'errors':>8}"
+        + (f"{'req/s vs base':>15}{'p99 vs base':>13}" if baseline else "")
+    )
+    for scenario, r in results.items():
+        line = (
+            f"{scenario:<10}{r['requests_per_sec']:>10.1f}{r['p50_ms']:>9.2f}"
+            f"{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['errors']:>8}"
+        )
+        base = baseline.get(scenario) if baseline else None
+        if base:
+            line += (
+                f"{r['requests_per_sec'] / base['requests_per_sec'] - 1:>+15.1%}"
+                f"{r['p99_ms'] / base['p99_ms'] - 1:>+13.1%}"
+            )
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=("memory", "postgres"), default="memory")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="measured requests per scenario"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=200, help="unmeasured requests per scenario"
+    )
+    parser.add_argument(
+        "--users", type=int, default=1000, help="users seeded for the get scenario"
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=list(SCENARIOS),
+        help=f"comma-separated subset of {','.join(SCENARIOS)}",
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run")
+    asyncio.run(main(parser.parse_args()))
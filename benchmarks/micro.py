@@ -0,0 +1,253 @@
+"""
+Microbenchmarks for the per-request CPU hot paths, stage by stage.
+
+Each stage is timed on its own (best of several repeats, nanoseconds per
+call) and traced with tracemalloc for the memory blocks it leaves allocated
+per call (the objects it returns) and its peak bytes per call (everything it
+allocates on the way, freed or not):
+
+- ``validate_request``: UserRegistrationRequest validation of a decoded JSON
+  body, including the check_phone_or_email validator and EmailStr
+- ``to_domain``: UserMapper.to_domain
+- ``build_user_object``: UserMapper.build_user_object from a dict row
+- ``row_mapper``: the compiled tuple-row mapper used by the repositories
+- ``to_response``: UserMapper.to_response (the UserResponse model)
+- ``to_response_dict``: UserMapper.to_response_dict (the fast path)
+- ``encode_model``: UserResponse.model_dump_json
+- ``encode_fast``: render_json of the response dict
+
+Results are compared with a stored baseline and the run fails (exit status
+1) when a stage leaves more blocks allocated or peaks higher than
+``--threshold`` beyond it. Allocation counts are deterministic for a given
+Python and set of dependencies, so they hold across machines; timings are
+not, and the change in ns against the baseline is printed for information
+only. Record the baseline with ``--save-baseline`` after a dependency or
+Python upgrade, and commit it.
+
+Usage:
+    python -m benchmarks.micro
+    python -m benchmarks.micro --save-baseline
+    python -m benchmarks.micro --stages to_response,encode_fast --threshold 0.1
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+from src.api.mapper.user_mapper import UserMapper
+from src.api.model.schemas import UserRegistrationRequest
+from src.api.utils.responses import render_json
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+
+REQUEST_BODY = {
+    "username": "benchuser",
+    "email": "bench.user@example.com",
+    "firstName": "Bench",
+    "lastName": "User",
+    "phoneNumber": "+1 555 010 0199",
+    "address": {
+        "street": "1 Bench St",
+        "city": "Benchville",
+        "state": "BE",
+        "country": "Belgium",
+        "postalCode": "1000",
+    },
+    "role": "STAFF",
+    "status": "ACTIVE",
+}
+
+# A user row as read by SELECT_USER_BY_ID, with its joined address
+USER_ROW = {
+    "id": 1,
+    "username": "benchuser",
+    "email": "bench.user@example.com",
+    "first_name": "Bench",
+    "last_name": "User",
+    "phone_number": "+1 555 010 0199",
+    "address_id": 1,
+    "role": "STAFF",
+    "status": "ACTIVE",
+    "last_login_at": datetime(2024, 11, 7, 18, 22, 38, tzinfo=timezone.utc),
+    "created_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 6, 7, 8, 9, 10, tzinfo=timezone.utc),
+    "street": "1 Bench St",
+    "city": "Benchville",
+    "state": "BE",
+    "postal_code": "1000",
+    "country": "Belgium",
+}
+
+
+def stages() -> Dict[str, Callable[[], Any]]:
+    """Returns one zero-argument callable per stage, over shared inputs."""
+    request = UserRegistrationRequest.model_validate(REQUEST_BODY)
+    row = tuple(USER_ROW.values())
+    address = UserMapper.build_address_object(USER_ROW)
+    to_user = UserMapper.row_mapper(tuple(USER_ROW))
+    user = to_user(row)
+    response = UserMapper.to_response(user)
+    response_dict = UserMapper.to_response_dict(user)
+    return {
+        "validate_request": lambda: UserRegistrationRequest.model_validate(
+            REQUEST_BODY
+        ),
+        "to_domain": lambda: UserMapper.to_domain(request),
+        "build_user_object": lambda: UserMapper.build_user_object(USER_ROW, address),
+        "row_mapper": lambda: to_user(row),
+        "to_response": lambda: UserMapper.to_response(user),
+        "to_response_dict": lambda: UserMapper.to_response_dict(user),
+        "encode_model": lambda: response.model_dump_json(),
+        "encode_fast": lambda: render_json(response_dict),
+    }
+
+
+def time_stage(func: Callable[[], Any], number: int, repeat: int) -> float:
+    """
+    Returns the best mean nanoseconds per call over ``repeat`` runs of
+    ``number`` calls, or of as many calls as take 0.2s when ``number`` is 0.
+    """
+    timer = timeit.Timer(func)
+    if not number:
+        number = timer.autorange()[0]
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def trace_stage(func: Callable[[], Any], number: int) -> Dict[str, float]:
+    """
+    Returns the blocks and bytes left allocated per call, and the peak bytes
+    allocated by a single call.
+    """
+    func()  # Fill lazy caches (validators, lru_cache) before tracing
+    gc.collect()
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        results = [func() for _ in range(number)]
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        del results
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func()
+        peak = tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    return {
+        "blocks": sum(stat.count_diff for stat in diff) / number,
+        "bytes": sum(stat.size_diff for stat in diff) / number,
+        "peak_bytes": peak,
+    }
+
+
+def regressions(result: dict, baseline: dict, threshold: float) -> list:
+    """
+    Names the allocation metrics of a stage that grew by more than
+    ``threshold``. Timings are left out: they vary from machine to machine.
+    """
+    worse = []
+    for metric in ("blocks", "peak_bytes"):
+        if metric not in baseline:
+            continue
+        # Round so a fraction of a block is not flagged
+        new, old = round(result[metric]), round(baseline[metric])
+        if new > old * (1 + threshold):
+            worse.append(metric)
+    return worse
+
+
+def main(args) -> int:
+    selected = stages()
+    if args.stages:
+        unknown = set(args.stages) - set(selected)
+        if unknown:
+            sys.exit(f"Unknown stages: {', '.join(sorted(unknown))}")
+        selected = {name: selected[name] for name in args.stages}
+
+    results = {}
+    for name, func in selected.items():
+        results[name] = {
+            "ns": time_stage(func, args.number, args.repeat),
+            **trace_stage(func, args.trace_number),
+        }
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored["stages"]
+        if stored.get("python") != platform.python_version():
+            print(
+                f"Baseline was recorded on Python {stored.get('python')}, "
+                f"running {platform.python_version()}"
+            )
+
+    failed = False
+    print(
+        f"{'stage':<20}{'ns/call':>10}{'blocks':>8}{'peak B':>9}"
+        f"{'vs base ns':>12}{'blocks':>8}{'peak B':>9}"
+    )
+    for name, r in results.items():
+        base = baseline.get(name)
+        line = f"{name:<20}{r['ns']:>10.0f}{r['blocks']:>8.1f}{r['peak_bytes']:>9.0f}"
+        if base:
+            line += (
+                f"{r['ns'] / base['ns'] - 1:>+12.1%}"
+                f"{base['blocks']:>8.1f}{base['peak_bytes']:>9.0f}"
+            )
+            worse = regressions(r, base, args.threshold)
+            if worse:
+                failed = True
+                line += f"  REGRESSION ({', '.join(worse)})"
+        print(line)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "recorded_at": datetime.now(timezone.utc).isoformat(),
+                    "stages": results,
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+    elif failed:
+        print(f"Allocations beyond {args.threshold:.0%} of the baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--stages", type=lambda value: value.split(","), help="comma-separated"
+    )
+    parser.add_argument(
+        "--number", type=int, default=0, help="calls per repeat (0: auto)"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--trace-number", type=int, default=1000, help="calls traced per stage"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed allocation growth"
+    )
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="record this run as baseline"
+    )
+    sys.exit(main(parser.parse_args()))
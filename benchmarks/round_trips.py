@@ -0,0 +1,101 @@
+"""
+Round-trip benchmark for the user read path.
+
+Compares the previous two-query lookup (user row, then address row) with the
+single LEFT JOIN in queries.SELECT_USER_BY_ID, counting the statements sent
+per lookup and timing both against the database in DATABASE_URL.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.round_trips --iterations 2000
+"""
+
+import argparse
+import statistics
+import time
+
+from psycopg2.extras import DictCursor
+
+from src.api.config.database import DatabasePool
+from src.api.mapper.user_mapper import UserMapper
+from src.api.model.domain import Address, User
+from src.api.repository import queries
+from src.api.repository.user_repository import UserRepository
+
+LEGACY_SELECT_USER = """
+    SELECT id, username, email, first_name, last_name, phone_number,
+           address_id, role, status, last_login_at, created_at, updated_at
+    FROM "user"
+    WHERE id = %s;
+"""
+
+LEGACY_SELECT_ADDRESS = """
+    SELECT street, city, state, postal_code, country
+    FROM address
+    WHERE id = %s;
+"""
+
+
+class CountingCursor(DictCursor):
+    round_trips = 0
+
+    def execute(self, query, vars=None):
+        CountingCursor.round_trips += 1
+        return super().execute(query, vars)
+
+
+def legacy_get_user(cur, user_id):
+    cur.execute(LEGACY_SELECT_USER, (user_id,))
+    row = cur.fetchone()
+    cur.execute(LEGACY_SELECT_ADDRESS, (row["address_id"],))
+    return UserMapper.build_user_object(
+        row, UserMapper.build_address_object(cur.fetchone())
+    )
+
+
+def joined_get_user(cur, user_id):
+    cur.execute(queries.SELECT_USER_BY_ID, (user_id,))
+    row = cur.fetchone()
+    return UserMapper.build_user_object(row, UserMapper.build_joined_address(row))
+
+
+def measure(name, fetch, user_id, iterations):
+    CountingCursor.round_trips = 0
+    timings = []
+    with DatabasePool.get_connection() as conn:
+        conn.autocommit = True
+        with conn.cursor(cursor_factory=CountingCursor) as cur:
+            for _ in range(iterations):
+                start = time.perf_counter()
+                fetch(cur, user_id)
+                timings.append(time.perf_counter() - start)
+        conn.autocommit = False
+    timings.sort()
+    return (
+        name,
+        CountingCursor.round_trips / iterations,
+        statistics.mean(timings) * 1e6,
+        timings[int(len(timings) * 0.99) - 1] * 1e6,
+    )
+
+
+def main(args):
+    user = UserRepository().save(
+        User(
+            username=f"bench-{time.time_ns()}",
+            email=f"{time.time_ns()}@bench.io",
+            address=Address(street="1 Bench St", city="Bench", country="BE"),
+        )
+    )
+    results = [
+        measure("two queries", legacy_get_user, user.id, args.iterations),
+        measure("join", joined_get_user, user.id, args.iterations),
+    ]
+    print(f"{'path':<14}{'round trips':>13}{'mean us':>10}{'p99 us':>10}")
+    for name, trips, mean, p99 in results:
+        print(f"{name:<14}{trips:>13.1f}{mean:>10.1f}{p99:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    main(parser.parse_args())
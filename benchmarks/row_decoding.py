@@ -0,0 +1,85 @@
+"""
+Row decoding benchmark for the bulk user read paths.
+
+Reads the same rows (users joined with their address, repeated with
+generate_series until --rows is reached) with the previous DictCursor and
+UserMapper.build_user_object path and with plain tuple rows decoded by
+UserMapper.row_mapper, timing the driver fetch and the mapping to domain
+users separately.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.row_decoding --rows 100000
+"""
+
+import argparse
+import time
+
+from psycopg2.extras import DictCursor
+
+from src.api.config.database import DatabasePool
+from src.api.mapper.user_mapper import UserMapper
+
+SELECT_ROWS = """
+    SELECT u.id, u.username, u.email, u.first_name, u.last_name, u.phone_number,
+           u.address_id, u.role, u.status, u.last_login_at, u.created_at,
+           u.updated_at, a.street, a.city, a.state, a.postal_code, a.country
+    FROM "user" u
+    LEFT JOIN address a ON a.id = u.address_id
+    CROSS JOIN generate_series(1, %s)
+    LIMIT %s;
+"""
+
+
+def measure(name, cursor_factory, rows, copies):
+    with DatabasePool.get_connection() as conn:
+        with conn.cursor(cursor_factory=cursor_factory) as cur:
+            cur.execute(SELECT_ROWS, (copies, rows))
+            fetch_start = time.perf_counter()
+            fetched = cur.fetchall()
+            fetch = time.perf_counter() - fetch_start
+
+            map_start = time.perf_counter()
+            if cursor_factory is DictCursor:
+                users = [
+                    UserMapper.build_user_object(
+                        row, UserMapper.build_joined_address(row)
+                    )
+                    for row in fetched
+                ]
+            else:
+                to_user = UserMapper.cursor_mapper(cur.description)
+                users = [to_user(row) for row in fetched]
+            mapping = time.perf_counter() - map_start
+        conn.rollback()
+    assert len(users) == rows, f"only {len(users)} rows; seed more users"
+    return name, fetch * 1e3, mapping * 1e3, (fetch + mapping) / rows * 1e6
+
+
+def main(args):
+    with DatabasePool.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT count(*) FROM "user"')
+            (count,) = cur.fetchone()
+        conn.rollback()
+    copies = -(-args.rows // max(count, 1))
+
+    results = []
+    for _ in range(args.repeat):
+        results.append(measure("DictCursor", DictCursor, args.rows, copies))
+        results.append(measure("tuple rows", None, args.rows, copies))
+    best = {}
+    for result in results:
+        if result[0] not in best or result[3] < best[result[0]][3]:
+            best[result[0]] = result
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"{'path':<12}{'fetch ms':>10}{'map ms':>10}{'us/row':>10}")
+    for name, fetch, mapping, per_row in best.values():
+        print(f"{name:<12}{fetch:>10.1f}{mapping:>10.1f}{per_row:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
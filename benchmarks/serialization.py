@@ -0,0 +1,105 @@
+"""
+Response serialization benchmark for the user read paths.
+
+Compares, per request, the CPU time spent turning domain users into a
+response body the previous way (UserMapper.to_response, then FastAPI's
+response_model validation and serialization, then JSONResponse) with the
+fast path (UserMapper.to_response_dict encoded by FastJSONResponse), for a
+single user and for a page of users. No database or server is needed.
+
+Usage:
+    python -m benchmarks.serialization --iterations 20000 --page-size 50
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.api.mapper.user_mapper import UserMapper
+from src.api.model.domain import Address, User
+from src.api.model.enum import UserRole, UserStatus
+from src.api.model.schemas import UserPage, UserResponse
+from src.api.utils.responses import FastJSONResponse
+
+USER_FIELD = create_model_field(name="Response_get_user", type_=UserResponse)
+PAGE_FIELD = create_model_field(name="Response_list_users", type_=UserPage)
+
+
+def make_user(user_id: int) -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=user_id,
+        username=f"user{user_id}",
+        email=f"user{user_id}@example.com",
+        first_name="Bench",
+        last_name="Mark",
+        phone_number="+15550100",
+        address=Address(street="1 Bench St", city="Bench", country="BE"),
+        role=UserRole.GUEST,
+        status=UserStatus.ACTIVE,
+        last_login_at=now,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+async def pydantic_user(user: User) -> bytes:
+    content = await serialize_response(
+        field=USER_FIELD, response_content=UserMapper.to_response(user)
+    )
+    return JSONResponse(content).body
+
+
+async def fast_user(user: User) -> bytes:
+    return FastJSONResponse(UserMapper.to_response_dict(user)).body
+
+
+async def pydantic_page(users: List[User]) -> bytes:
+    page = UserPage(items=[UserMapper.to_response(user) for user in users])
+    content = await serialize_response(field=PAGE_FIELD, response_content=page)
+    return JSONResponse(content).body
+
+
+async def fast_page(users: List[User]) -> bytes:
+    items = [UserMapper.to_response_dict(user) for user in users]
+    return FastJSONResponse({"items": items, "nextCursor": None}).body
+
+
+async def measure(render, payload, iterations: int) -> float:
+    """Returns the mean CPU microseconds per call."""
+    await render(payload)
+    start = time.process_time()
+    for _ in range(iterations):
+        await render(payload)
+    return (time.process_time() - start) / iterations * 1e6
+
+
+async def main(args):
+    user = make_user(1)
+    users = [make_user(user_id) for user_id in range(args.page_size)]
+    assert await pydantic_user(user) == await fast_user(user)
+    assert await pydantic_page(users) == await fast_page(users)
+
+    page_iterations = max(args.iterations // args.page_size, 1)
+    results = [
+        ("user", "pydantic", await measure(pydantic_user, user, args.iterations)),
+        ("user", "fast", await measure(fast_user, user, args.iterations)),
+        ("page", "pydantic", await measure(pydantic_page, users, page_iterations)),
+        ("page", "fast", await measure(fast_page, users, page_iterations)),
+    ]
+    print(f"{'response':<10}{'path':<10}{'cpu us/request':>16}")
+    for response, path, cpu in results:
+        print(f"{response:<10}{path:<10}{cpu:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,36 @@
+-- Indexes for GET /api/v1/users (keyset pagination on created_at, id).
+--
+-- Every supported filter combination has an index whose equality columns
+-- come first and whose trailing (created_at, id) columns match the ORDER BY,
+-- so each page is a bounded index range scan with no sort, however deep the
+-- cursor is. The created_at range and the cursor are both conditions on the
+-- trailing columns of the same index.
+
+-- No filter, or created_at range only
+CREATE INDEX IF NOT EXISTS user_created_at_id_idx
+    ON "user" (created_at, id);
+
+-- role
+CREATE INDEX IF NOT EXISTS user_role_created_at_id_idx
+    ON "user" (role, created_at, id);
+
+-- status
+CREATE INDEX IF NOT EXISTS user_status_created_at_id_idx
+    ON "user" (status, created_at, id);
+
+-- role and status
+CREATE INDEX IF NOT EXISTS user_role_status_created_at_id_idx
+    ON "user" (role, status, created_at, id);
+
+-- Lookups by identifier (GET /api/v1/user/by-username|by-email|by-phone).
+-- Usernames use the unique index from the schema. Emails are matched case
+-- insensitively through an expression index, and phone numbers through the
+-- E.164 form stored at write time. Rows written before phone_e164 existed
+-- are filled in by: python -m src.api.cli.backfill_phones
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS phone_e164 VARCHAR(16);
+
+CREATE INDEX IF NOT EXISTS user_lower_email_idx
+    ON "user" (lower(email));
+
+CREATE INDEX IF NOT EXISTS user_phone_e164_idx
+    ON "user" (phone_e164);
@@ -16,6 +16,7 @@ CREATE TABLE "user" (
     first_name VARCHAR(100),    -- User's first name
     last_name VARCHAR(100),     -- User's last name
     phone_number VARCHAR(20),   -- User's phone number
+    phone_e164 VARCHAR(16),     -- phone_number normalized to E.164 on write
     address_id INT,             -- Foreign key referencing address table
     role VARCHAR(50),           -- Role (e.g., 'admin', 'user')
     status VARCHAR(50),         -- Status (e.g., 'active', 'inactive')
@@ -24,3 +25,6 @@ CREATE TABLE "user" (
     last_login_at TIMESTAMP,    -- Timestamp when user last logged in
     FOREIGN KEY (address_id) REFERENCES address(id) -- Foreign key constraint to address table
 );
+
+-- Index the foreign key so deleting an address does not scan the user table
+CREATE INDEX user_address_id_idx ON "user" (address_id);
@@ -0,0 +1,16 @@
+from src.api.cache.backend import CacheBackend, CacheEntry, MemoryCacheBackend
+from src.api.cache.bloom import BloomFilter, UserAvailabilityFilter
+from src.api.cache.lru import LRUTTLCache
+from src.api.cache.redis_backend import RedisCacheBackend
+from src.api.cache.serializer import UserSerializer
+
+__all__ = [
+    "BloomFilter",
+    "CacheBackend",
+    "CacheEntry",
+    "LRUTTLCache",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "UserAvailabilityFilter",
+    "UserSerializer",
+]
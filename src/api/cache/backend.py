@@ -0,0 +1,98 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from src.api.cache.lru import LRUTTLCache
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    # Seconds since the entry stopped being fresh; 0 while it is fresh
+    stale_for: float
+
+
+class CacheBackend(ABC):
+    """
+    Async key/value cache used by the user read path.
+
+    Entries are fresh for their TTL and then kept, stale, for the backend's
+    ``stale_ttl`` before they expire. Plain reads return only fresh values and
+    None otherwise; :meth:`get_entry` also returns stale ones. Backends may
+    lose writes (eviction, restarts, an unreachable server) and callers must
+    treat the cache as an optimisation only, never as the source of truth.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Returns the fresh value stored under ``key``, or None."""
+
+    @abstractmethod
+    async def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Returns the fresh or stale entry stored under ``key``, or None."""
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Returns one fresh value (or None) per key, in order, in one round trip."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores ``value`` fresh for ``ttl`` seconds (defaults to the backend TTL)."""
+
+    @abstractmethod
+    async def set_many(
+        self, items: Dict[str, Any], ttl: Optional[float] = None
+    ) -> None:
+        """Stores several values in one round trip."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Removes ``keys`` if present."""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Returns a snapshot of the backend counters."""
+
+    async def check_connection(self) -> str:
+        """
+        Returns "Connected" when the backend can serve requests, otherwise a
+        description of the error. In-process backends are always connected.
+        """
+        return "Connected"
+
+    async def close(self) -> None:
+        """Releases any connections held by the backend."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process backend storing values as-is in an LRUTTLCache. Fastest, but
+    every worker has its own copy and only sees its own invalidations.
+    """
+
+    def __init__(self, cache: LRUTTLCache):
+        self.cache = cache
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.cache.get(key)
+
+    async def get_entry(self, key: str) -> Optional[CacheEntry]:
+        entry = self.cache.get_entry(key)
+        return None if entry is None else CacheEntry(*entry)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        return [self.cache.get(key) for key in keys]
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.cache.set(key, value, ttl)
+
+    async def set_many(
+        self, items: Dict[str, Any], ttl: Optional[float] = None
+    ) -> None:
+        for key, value in items.items():
+            self.cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.delete(key)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self.cache.stats()}
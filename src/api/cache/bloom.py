@@ -0,0 +1,159 @@
+import hashlib
+import math
+import threading
+from typing import Iterable, Optional, Tuple
+
+from src.api.model.domain import User
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Membership tests have no false negatives: ``key in bloom`` is False only
+    if the key was never added. The bit array takes exactly the memory budget
+    it is built with; the number of hash functions is chosen for the target
+    false-positive rate, which holds until ``capacity`` keys have been added
+    and degrades gracefully after that (see ``estimated_error_rate``).
+
+    Positions come from one 128-bit BLAKE2b digest per key, split into two
+    64-bit hashes and combined as h1 + i * h2 (Kirsch-Mitzenmacher).
+    """
+
+    def __init__(self, max_bytes: int, error_rate: float):
+        if max_bytes <= 0 or not 0 < error_rate < 1:
+            raise ValueError("max_bytes must be positive and error_rate in (0, 1)")
+        self.error_rate = error_rate
+        self.size = max_bytes * 8
+        self.hashes = max(1, round(-math.log2(error_rate)))
+        # Keys the filter holds at error_rate with the optimal hash count
+        self.capacity = int(self.size * math.log(2) ** 2 / -math.log(error_rate))
+        self.count = 0
+        self._bits = bytearray(max_bytes)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        positions = self._positions(key)
+        bits = self._bits
+        # Bytes are read-modify-written; lock so concurrent adds lose no bits
+        with self._lock:
+            for position in positions:
+                bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def estimated_error_rate(self) -> float:
+        """False-positive rate expected for the keys added so far."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def stats(self) -> dict:
+        return {
+            "bytes": len(self._bits),
+            "hashes": self.hashes,
+            "capacity": self.capacity,
+            "count": self.count,
+            "error_rate": self.error_rate,
+            "estimated_error_rate": self.estimated_error_rate(),
+        }
+
+
+class UserAvailabilityFilter:
+    """
+    Bloom filter of the usernames and emails already taken.
+
+    A username or email that is not in the filter is free as far as this
+    process knows; one that is may be taken and has to be confirmed against
+    the database. Until the filter has been loaded from the user table
+    (``loaded``) everything may be taken, so callers always fall back to the
+    database.
+
+    Each process has its own filter, built from the user table and then fed
+    by the saves made through this process. Users created by other workers,
+    other instances or the bulk importer are only picked up when the filter
+    is rebuilt, so a taken value can be reported free until then; the unique
+    constraints still reject it on registration.
+    """
+
+    def __init__(self, max_bytes: int, error_rate: float):
+        self.max_bytes = max_bytes
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(max_bytes, error_rate)
+        self.loaded = False
+        # Filter being built by a rebuild in progress; it replaces ``bloom``
+        # when the rebuild finishes
+        self._next: Optional[BloomFilter] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys(username: Optional[str], email: Optional[str]) -> list:
+        keys = []
+        if username is not None:
+            keys.append(f"username:{username}")
+        if email is not None:
+            keys.append(f"email:{email}")
+        return keys
+
+    def add(self, username: Optional[str], email: Optional[str]) -> None:
+        # Saves during a rebuild go to both filters, so none is lost whether
+        # or not the table scan sees them
+        with self._lock:
+            blooms = [b for b in (self.bloom, self._next) if b is not None]
+        for key in self._keys(username, email):
+            for bloom in blooms:
+                bloom.add(key)
+
+    def add_users(self, users: Iterable[Optional[User]]) -> None:
+        """Records saved users; None entries (conflicts) are skipped."""
+        for user in users:
+            if user is not None:
+                self.add(user.username, user.email)
+
+    def start_rebuild(self) -> None:
+        """Starts building a new, empty filter next to the current one."""
+        with self._lock:
+            self._next = BloomFilter(self.max_bytes, self.error_rate)
+
+    def add_rebuilt(self, username: Optional[str], email: Optional[str]) -> None:
+        """Adds a username and email read from the user table to the rebuild."""
+        for key in self._keys(username, email):
+            self._next.add(key)
+
+    def finish_rebuild(self) -> None:
+        """Swaps in the rebuilt filter and marks the filter as loaded."""
+        with self._lock:
+            self.bloom, self._next = self._next, None
+        self.loaded = True
+
+    def abort_rebuild(self) -> None:
+        """Drops a rebuild that failed; the current filter stays in use."""
+        with self._lock:
+            self._next = None
+
+    def might_be_taken(
+        self, username: Optional[str], email: Optional[str]
+    ) -> Tuple[bool, bool]:
+        """
+        Returns, for the username and the email, False when it is definitely
+        free and True when it may be taken. Missing values are never taken.
+        """
+        return (
+            username is not None
+            and (not self.loaded or f"username:{username}" in self.bloom),
+            email is not None and (not self.loaded or f"email:{email}" in self.bloom),
+        )
+
+    def stats(self) -> dict:
+        return {"loaded": self.loaded, **self.bloom.stats()}
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class LRUTTLCache:
+    """
+    Thread-safe, size-bounded cache with least-recently-used eviction and a
+    per-entry time to live.
+
+    Entries are fresh for ``ttl`` seconds after they were stored. They are
+    then kept, stale, for another ``stale_ttl`` seconds so callers that accept
+    stale data can still read them through :meth:`get_entry`; :meth:`get` only
+    returns fresh entries. Expired entries are dropped lazily when they are
+    looked up or when room is needed. Once the cache holds ``max_size``
+    entries, storing a new key evicts the least recently used one.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        stale_ttl: float = 0.0,
+    ):
+        if max_size < 1 or ttl <= 0 or stale_ttl < 0:
+            raise ValueError("Cache max_size must be >= 1, ttl > 0 and stale_ttl >= 0")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        # key -> (value, fresh_until, expires_at)
+        self._entries: OrderedDict = OrderedDict()
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _lookup(self, key: Hashable, now: float) -> Optional[tuple]:
+        """Returns the live entry for ``key``, dropping it if it has expired."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] <= now:
+            del self._entries[key]
+            self._expirations += 1
+            return None
+        return entry
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Returns the cached value, or None if it is missing or not fresh."""
+        with self._lock:
+            now = self._clock()
+            entry = self._lookup(key, now)
+            if entry is None or entry[1] <= now:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Returns ``(value, stale_for)`` for a fresh or stale entry, where
+        ``stale_for`` is how many seconds ago the entry stopped being fresh
+        (0 when it is fresh), or None if it is missing or expired.
+        """
+        with self._lock:
+            now = self._clock()
+            entry = self._lookup(key, now)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            stale_for = max(0.0, now - entry[1])
+            if stale_for:
+                self._stale_hits += 1
+            else:
+                self._hits += 1
+            return entry[0], stale_for
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores ``value`` fresh for ``ttl`` seconds (defaults to the cache TTL)."""
+        fresh_until = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, fresh_until, fresh_until + self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                _, (_, _, oldest_expires_at) = self._entries.popitem(last=False)
+                if oldest_expires_at <= self._clock():
+                    self._expirations += 1
+                else:
+                    self._evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Removes ``key`` if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        """Returns a snapshot of the cache counters."""
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
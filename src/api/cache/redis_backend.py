@@ -0,0 +1,175 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.api.cache.backend import CacheBackend, CacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend shared by every worker and pod through a Redis-protocol server.
+
+    Values are encoded with ``serializer`` (an object with ``dumps``/``loads``)
+    and stored under ``prefix + key`` with a millisecond expiry covering both
+    the fresh TTL and ``stale_ttl``; how stale an entry is follows from its
+    remaining PTTL, so the stored payload is just the value. Batch reads use a
+    single MGET (pipelined with the PTTLs when stale entries are kept) and
+    batch writes a single non-transactional pipeline.
+    Server errors are logged and counted, and reads degrade to misses so an
+    unavailable cache never fails a request.
+    """
+
+    def __init__(
+        self,
+        client: aioredis.Redis,
+        serializer,
+        ttl: float = 60.0,
+        prefix: str = "user-service:",
+        stale_ttl: float = 0.0,
+    ):
+        self.client = client
+        self.serializer = serializer
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.prefix = prefix
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    @classmethod
+    def from_url(cls, url: str, serializer, **kwargs) -> "RedisCacheBackend":
+        return cls(aioredis.Redis.from_url(url), serializer, **kwargs)
+
+    def _count(
+        self, hits: int = 0, stale_hits: int = 0, misses: int = 0, errors: int = 0
+    ) -> None:
+        with self._lock:
+            self._hits += hits
+            self._stale_hits += stale_hits
+            self._misses += misses
+            self._errors += errors
+
+    def _failed(self, operation: str, error: RedisError) -> None:
+        self._count(errors=1)
+        logger.warning("Cache %s failed: %s", operation, error)
+
+    def _decode(self, raw: Optional[bytes]) -> Optional[Any]:
+        if raw is None:
+            return None
+        try:
+            return self.serializer.loads(raw)
+        except ValueError:
+            # Unreadable payload (e.g. written by another version): a miss
+            return None
+
+    def _px(self, ttl: Optional[float]) -> int:
+        fresh = self.ttl if ttl is None else ttl
+        return max(1, int((fresh + self.stale_ttl) * 1000))
+
+    async def _read(self, keys: Sequence[str]) -> List[Optional[CacheEntry]]:
+        """Fetches values and, when stale entries are kept, their PTTLs."""
+        names = [self.prefix + key for key in keys]
+        try:
+            if self.stale_ttl:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    pipe.mget(names)
+                    for name in names:
+                        pipe.pttl(name)
+                    raw_values, *pttls = await pipe.execute()
+            else:
+                raw_values = await self.client.mget(names)
+                pttls = [None] * len(names)
+        except RedisError as e:
+            self._failed("read", e)
+            return [None] * len(keys)
+
+        entries = []
+        for raw, pttl in zip(raw_values, pttls):
+            value = self._decode(raw)
+            if value is None:
+                entries.append(None)
+                continue
+            # Entries expire stale_ttl after they stop being fresh
+            remaining = self.stale_ttl if pttl is None or pttl < 0 else pttl / 1000
+            entries.append(CacheEntry(value, max(0.0, self.stale_ttl - remaining)))
+        return entries
+
+    async def get(self, key: str) -> Optional[Any]:
+        return (await self.get_many([key]))[0]
+
+    async def get_entry(self, key: str) -> Optional[CacheEntry]:
+        (entry,) = await self._read([key])
+        if entry is None:
+            self._count(misses=1)
+        elif entry.stale_for:
+            self._count(stale_hits=1)
+        else:
+            self._count(hits=1)
+        return entry
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        if not keys:
+            return []
+        values = [
+            entry.value if entry is not None and not entry.stale_for else None
+            for entry in await self._read(keys)
+        ]
+        hits = sum(value is not None for value in values)
+        self._count(hits=hits, misses=len(values) - hits)
+        return values
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await self.set_many({key: value}, ttl)
+
+    async def set_many(
+        self, items: Dict[str, Any], ttl: Optional[float] = None
+    ) -> None:
+        if not items:
+            return
+        px = self._px(ttl)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(self.prefix + key, self.serializer.dumps(value), px=px)
+                await pipe.execute()
+        except RedisError as e:
+            self._failed("write", e)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.delete(*(self.prefix + key for key in keys))
+        except RedisError as e:
+            # The entry stays until it expires; there is nothing else to do
+            self._failed("invalidation", e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "redis",
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "errors": self._errors,
+            }
+
+    async def check_connection(self) -> str:
+        try:
+            await self.client.ping()
+            return "Connected"
+        except RedisError as e:
+            return f"Failed to connect to cache: {str(e)}"
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,91 @@
+"""
+Phone number backfill.
+
+Fills in "user".phone_e164 for rows written before the column existed, by
+normalizing phone_number with the same rules as the API (see
+src.api.utils.identifiers.normalize_phone). Rows are walked in id order, one
+transaction per batch; numbers that cannot be normalized stay NULL. Safe to
+re-run: rows that already have phone_e164 are skipped.
+
+Usage:
+    python -m src.api.cli.backfill_phones --batch-size 5000
+"""
+
+import argparse
+import sys
+import time
+
+import psycopg2
+
+from src.api.config import settings
+from src.api.utils.identifiers import normalize_phone
+
+SELECT_UNNORMALIZED = """
+    SELECT id, phone_number
+    FROM "user"
+    WHERE phone_e164 IS NULL AND phone_number IS NOT NULL AND id > %s
+    ORDER BY id
+    LIMIT %s;
+"""
+
+UPDATE_PHONES = """
+    UPDATE "user" u
+    SET phone_e164 = v.phone_e164
+    FROM unnest(%s::int[], %s::varchar[]) AS v(id, phone_e164)
+    WHERE u.id = v.id;
+"""
+
+
+def run(args) -> int:
+    """Backfills every batch and returns the number of rows updated."""
+    conn = psycopg2.connect(args.database_url)
+    last_id, updated, started = 0, 0, time.perf_counter()
+    try:
+        while True:
+            with conn.cursor() as cur:
+                cur.execute(SELECT_UNNORMALIZED, (last_id, args.batch_size))
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                normalized = [
+                    (user_id, phone_e164)
+                    for user_id, phone_number in rows
+                    if (phone_e164 := normalize_phone(phone_number))
+                ]
+                if normalized:
+                    user_ids, phones = zip(*normalized)
+                    cur.execute(UPDATE_PHONES, (list(user_ids), list(phones)))
+            conn.commit()
+            updated += len(normalized)
+            print(
+                f"id {last_id}: updated {updated}, "
+                f"{updated / (time.perf_counter() - started):,.0f} rows/s",
+                file=sys.stderr,
+            )
+    finally:
+        conn.close()
+    return updated
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.api.cli.backfill_phones",
+        description="Fill in E.164 phone numbers for existing users.",
+    )
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    started = time.perf_counter()
+    updated = run(parse_args(argv))
+    print(
+        f"done: updated {updated} in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+"""
+Bulk user import.
+
+Streams a CSV or NDJSON file through UserRegistrationRequest validation and
+loads the valid rows with COPY, one transaction per chunk, in constant memory.
+Rows that cannot be parsed, fail validation, are refused by the database
+(e.g. a value longer than its column) or collide with an existing
+username/email are written to a rejects file (NDJSON), and progress is
+checkpointed after every committed chunk so an interrupted import can be
+resumed.
+
+CSV files use the request field names as headers, with the address fields
+flattened: username, email, firstName, lastName, phoneNumber, street, city,
+state, country, postalCode, role, status. NDJSON lines are request bodies as
+accepted by POST /api/v1/user.
+
+Usage:
+    python -m src.api.cli.import_users users.csv --chunk-size 5000
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import psycopg2
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from src.api.config import settings
+from src.api.mapper.user_mapper import UserMapper
+from src.api.model.domain import User
+from src.api.model.schemas import UserRegistrationRequest
+from src.api.repository import queries
+from src.api.utils.identifiers import normalize_phone
+
+ADDRESS_FIELDS = ("street", "city", "state", "country", "postalCode")
+
+ADDRESS_COLUMNS = ("id", "street", "city", "state", "postal_code", "country")
+USER_COLUMNS = (
+    "line_no",
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "phone_number",
+    "phone_e164",
+    "address_id",
+    "role",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+CREATE_STAGE = """
+    CREATE TEMP TABLE IF NOT EXISTS user_import_stage (
+        line_no BIGINT,
+        id INT,
+        username VARCHAR(255),
+        email VARCHAR(255),
+        first_name VARCHAR(100),
+        last_name VARCHAR(100),
+        phone_number VARCHAR(20),
+        phone_e164 VARCHAR(16),
+        address_id INT,
+        role VARCHAR(50),
+        status VARCHAR(50),
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP
+    ) ON COMMIT DELETE ROWS;
+"""
+
+# Moves staged users into "user", skipping duplicates, and returns the staged
+# rows that were skipped so their addresses can be removed and the lines
+# reported as rejects.
+INSERT_FROM_STAGE = """
+    WITH inserted AS (
+        INSERT INTO "user"
+        (id, username, email, first_name, last_name, phone_number, phone_e164,
+        address_id, role, status, created_at, updated_at)
+        SELECT id, username, email, first_name, last_name, phone_number,
+               phone_e164, address_id, role, status, created_at, updated_at
+        FROM user_import_stage
+        ON CONFLICT DO NOTHING
+        RETURNING id
+    )
+    SELECT s.line_no, s.address_id
+    FROM user_import_stage s
+    WHERE NOT EXISTS (SELECT 1 FROM inserted i WHERE i.id = s.id);
+"""
+
+
+class Unreadable(NamedTuple):
+    """A line that could not be decoded or parsed, kept for the rejects file."""
+
+    raw: str
+    error: str
+
+
+Record = Tuple[int, object]
+# (line number, raw record, User if valid, validation error otherwise)
+Item = Tuple[int, object, Optional[User], Optional[object]]
+
+
+def read_records(path: str, fmt: str) -> Iterator[Record]:
+    """
+    Yields (line number, raw request dict) for each data row in the file, or
+    (line number, Unreadable) for a row that is not valid UTF-8 or, in NDJSON,
+    not a JSON object.
+    """
+    # Undecodable bytes become lone surrogates, so one bad line does not stop
+    # the file from being read; _unreadable() picks them out per row
+    with open(path, newline="", encoding="utf-8", errors="surrogateescape") as handle:
+        if fmt == "csv":
+            # Header is line 1, so data rows start at line 2
+            for line_no, row in enumerate(csv.DictReader(handle), start=2):
+                # Cells past the header are grouped in a list under None
+                cells = [
+                    cell
+                    for value in row.values()
+                    for cell in (value if isinstance(value, list) else [value])
+                ]
+                raw = ",".join(cell or "" for cell in cells)
+                yield line_no, _unreadable(raw) or _unflatten(row)
+        else:
+            for line_no, line in enumerate(handle, start=1):
+                if line.strip():
+                    yield line_no, _unreadable(line.rstrip("\r\n")) or _parse_json(line)
+
+
+def _unreadable(text: str) -> Optional[Unreadable]:
+    """Returns an Unreadable if ``text`` holds bytes that were not UTF-8."""
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return Unreadable(
+            text.encode("utf-8", "surrogateescape").decode("utf-8", "replace"),
+            "not valid UTF-8",
+        )
+    return None
+
+
+def _parse_json(line: str):
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        return Unreadable(line.rstrip("\r\n"), f"invalid JSON: {e}")
+    # Request bodies are objects; null, arrays, strings and numbers are not
+    if not isinstance(record, dict):
+        return Unreadable(line.rstrip("\r\n"), "not a JSON object")
+    return record
+
+
+def _unflatten(row: dict) -> dict:
+    """Turns a flat CSV row into a request body; empty cells become None."""
+    record = {key: (value or None) for key, value in row.items() if key}
+    address = {field: record.pop(field, None) for field in ADDRESS_FIELDS}
+    if any(address.values()):
+        record["address"] = address
+    return {key: value for key, value in record.items() if value is not None}
+
+
+def validate(records: Iterable[Record]) -> Iterator[Item]:
+    """Validates each record against UserRegistrationRequest."""
+    for line_no, record in records:
+        if isinstance(record, Unreadable):
+            yield line_no, record.raw, None, record.error
+            continue
+        try:
+            request = UserRegistrationRequest.model_validate(record)
+        except ValidationError as e:
+            yield line_no, record, None, e.errors(include_url=False)
+        except HTTPException as e:
+            yield line_no, record, None, e.detail
+        else:
+            yield line_no, record, UserMapper.to_domain(request), None
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Groups an iterable into lists of at most ``size`` items."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def copy_field(value) -> str:
+    """Encodes one value for COPY ... FROM STDIN in text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        # The columns are TIMESTAMP without time zone and hold UTC
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(cur, table: str, columns: Tuple[str, ...], rows: Iterable) -> None:
+    """COPYs ``rows`` (tuples in ``columns`` order) into ``table``."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(copy_field(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def load_chunk(conn, users: List[Tuple[int, User]]) -> List[int]:
+    """
+    Loads one chunk of validated users in a single transaction and returns
+    the line numbers that were skipped because the username or email exists.
+    """
+    address_count = sum(user.address is not None for _, user in users)
+    with conn.cursor() as cur:
+        cur.execute(queries.ALLOCATE_IDS, (len(users), address_count))
+        user_ids, address_ids = cur.fetchone()
+        domain_users = [user for _, user in users]
+        user_address_ids = queries.align_address_ids(domain_users, address_ids)
+
+        copy_rows(
+            cur,
+            "address",
+            ADDRESS_COLUMNS,
+            (
+                (address_id, *_address_row(user))
+                for user, address_id in zip(domain_users, user_address_ids)
+                if address_id is not None
+            ),
+        )
+        copy_rows(
+            cur,
+            "user_import_stage",
+            USER_COLUMNS,
+            (
+                (line_no, user_id, *_user_row(user), address_id, *_status_row(user))
+                for (line_no, user), user_id, address_id in zip(
+                    users, user_ids, user_address_ids
+                )
+            ),
+        )
+        cur.execute(INSERT_FROM_STAGE)
+        skipped = cur.fetchall()
+        orphaned = [address_id for _, address_id in skipped if address_id]
+        if orphaned:
+            cur.execute(queries.DELETE_ADDRESSES, (orphaned,))
+    conn.commit()
+    return sorted(line_no for line_no, _ in skipped)
+
+
+def load_rows(conn, users: List[Tuple[int, User]]) -> Tuple[List[int], Dict[int, str]]:
+    """
+    Loads a chunk with load_chunk. If the database refuses a row (say a value
+    longer than its column), the whole COPY fails, so the chunk is rolled
+    back and loaded again one row at a time to keep the other rows.
+
+    Returns the line numbers skipped because the username or email exists,
+    and the database error of each line that was refused.
+    """
+    try:
+        return load_chunk(conn, users), {}
+    except psycopg2.DataError:
+        conn.rollback()
+    skipped, failed = [], {}
+    for line_no, user in users:
+        try:
+            skipped += load_chunk(conn, [(line_no, user)])
+        except psycopg2.DataError as e:
+            conn.rollback()
+            failed[line_no] = e.diag.message_primary or str(e).strip()
+    return skipped, failed
+
+
+def _address_row(user: User) -> tuple:
+    address = user.address
+    return (
+        address.street,
+        address.city,
+        address.state,
+        address.postal_code,
+        address.country,
+    )
+
+
+def _user_row(user: User) -> tuple:
+    return (
+        user.username,
+        user.email,
+        user.first_name,
+        user.last_name,
+        user.phone_number,
+        normalize_phone(user.phone_number),
+    )
+
+
+def _status_row(user: User) -> tuple:
+    return (user.role.value, user.status.value, user.created_at, user.updated_at)
+
+
+class Checkpoint:
+    """Last committed line and running totals, persisted as JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.line = 0
+        self.loaded = 0
+        self.rejected = 0
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                self.__dict__.update(json.load(handle))
+
+    def save(self) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {"line": self.line, "loaded": self.loaded, "rejected": self.rejected},
+                handle,
+            )
+        os.replace(temp_path, self.path)
+
+
+def run(args) -> Checkpoint:
+    checkpoint = Checkpoint(args.checkpoint or f"{args.path}.checkpoint")
+    if checkpoint.line and not args.resume:
+        raise SystemExit(
+            f"Checkpoint {checkpoint.path} exists at line {checkpoint.line}; "
+            "pass --resume to continue or delete it to start over"
+        )
+
+    records = (
+        record
+        for record in read_records(args.path, args.format)
+        if record[0] > checkpoint.line
+    )
+    conn = psycopg2.connect(args.database_url)
+    started, loaded_this_run = time.perf_counter(), 0
+    try:
+        with conn.cursor() as cur:
+            cur.execute(CREATE_STAGE)
+        conn.commit()
+        mode = "a" if args.resume else "w"
+        with open(args.rejects, mode, encoding="utf-8") as rejects:
+            for chunk in chunked(validate(records), args.chunk_size):
+                valid = [(line_no, user) for line_no, _, user, _ in chunk if user]
+                skipped, failed = load_rows(conn, valid) if valid else ([], {})
+                skipped = set(skipped)
+
+                for line_no, record, user, error in chunk:
+                    if line_no in skipped:
+                        error = "username or email already exists"
+                    elif line_no in failed:
+                        error = failed[line_no]
+                    elif user:
+                        continue
+                    reject = {"line": line_no, "error": error, "record": record}
+                    rejects.write(json.dumps(reject, default=str) + "\n")
+                rejects.flush()
+
+                chunk_loaded = len(valid) - len(skipped) - len(failed)
+                chunk_rejected = len(chunk) - chunk_loaded
+                loaded_this_run += chunk_loaded
+                checkpoint.line = chunk[-1][0]
+                checkpoint.loaded += chunk_loaded
+                checkpoint.rejected += chunk_rejected
+                checkpoint.save()
+
+                elapsed = time.perf_counter() - started
+                print(
+                    f"line {checkpoint.line}: loaded {checkpoint.loaded}, "
+                    f"rejected {checkpoint.rejected}, "
+                    f"{loaded_this_run / elapsed:,.0f} rows/s",
+                    file=sys.stderr,
+                )
+    finally:
+        conn.close()
+    return checkpoint
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.api.cli.import_users",
+        description="Stream users from CSV or NDJSON into Postgres with COPY.",
+    )
+    parser.add_argument("path", help="CSV or NDJSON file to import")
+    parser.add_argument(
+        "--format",
+        choices=("csv", "ndjson"),
+        help="input format (default: from the file extension)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--rejects", help="rejects file (default: <path>.rejects)")
+    parser.add_argument(
+        "--checkpoint", help="checkpoint file (default: <path>.checkpoint)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="continue from the checkpoint"
+    )
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args(argv)
+    args.format = args.format or (
+        "csv" if args.path.lower().endswith(".csv") else "ndjson"
+    )
+    args.rejects = args.rejects or f"{args.path}.rejects"
+    return args
+
+
+def main(argv=None) -> None:
+    started = time.perf_counter()
+    checkpoint = run(parse_args(argv))
+    print(
+        f"done: loaded {checkpoint.loaded}, rejected {checkpoint.rejected} "
+        f"in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,262 @@
-from contextlib import contextmanager
-from typing import Generator
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Callable, Dict, Generator, Optional
 
-from psycopg2.pool import SimpleConnectionPool
+import psycopg2
+from psycopg2 import extensions
+from psycopg_pool import AsyncConnectionPool
 
 from src.api.config import settings
+from src.api.utils.metrics import Histogram
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the acquire timeout."""
+
+
+class PoolExhaustedError(Exception):
+    """Raised when the wait queue is full and the caller is rejected outright."""
+
+
+class BoundedConnectionPool:
+    """
+    Thread-safe psycopg2 connection pool.
+
+    Callers block for up to ``timeout`` seconds when all ``max_size``
+    connections are checked out; at most ``max_waiters`` callers may queue at
+    once, anyone beyond that is rejected immediately. Connections are recycled
+    after ``max_lifetime`` seconds, pinged on checkout after being idle for
+    ``validate_after`` seconds, and rolled back on return if they are left
+    inside a transaction.
+    """
+
+    # Upper bounds (seconds) of the checkout wait-time histogram
+    WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(
+        self,
+        connect: Callable,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_waiters: int = 100,
+        timeout: float = 5.0,
+        max_lifetime: float = 1800.0,
+        validate_after: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(
+                "Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1"
+            )
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_waiters = max_waiters
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.validate_after = validate_after
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, returned_at), most recently used last
+        self._created_at: Dict = {}
+        self._in_use = 0
+        self._waiters = 0
+        self._closed = False
+
+        self._acquired = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._recycled = 0
+        self._wait_counts = [0] * (len(self.WAIT_BUCKETS) + 1)
+        self._wait_sum = 0.0
+
+        for _ in range(min_size):
+            self._idle.append((self._open(), self._clock()))
+
+    def _open(self):
+        conn = self._connect()
+        self._created_at[conn] = self._clock()
+        return conn
+
+    def _discard(self, conn):
+        self._created_at.pop(conn, None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _expired(self, conn, now: float) -> bool:
+        return now - self._created_at.get(conn, now) > self.max_lifetime
+
+    def getconn(self, timeout: Optional[float] = None):
+        """
+        Checks out a connection, waiting up to ``timeout`` seconds (defaults to
+        the pool timeout) for one to be returned.
+
+        :raises PoolExhaustedError: if the wait queue is already full.
+        :raises PoolTimeoutError: if no connection became available in time.
+        """
+        start = self._clock()
+        deadline = start + (self.timeout if timeout is None else timeout)
+        conn, returned_at = None, None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise Exception("Connection pool is closed")
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    break
+                if self._in_use < self.max_size:
+                    break
+                if self._waiters >= self.max_waiters:
+                    self._rejected += 1
+                    raise PoolExhaustedError(
+                        f"Connection pool exhausted: {self._waiters} callers waiting"
+                    )
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {self._clock() - start:.3f}s waiting "
+                        "for a database connection"
+                    )
+                self._waiters += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+            # Reserve the slot before any I/O happens outside the lock
+            self._in_use += 1
+
+        try:
+            conn, recycled = self._prepare(conn, returned_at)
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        waited = self._clock() - start
+        with self._cond:
+            self._recycled += recycled
+            self._acquired += 1
+            self._wait_sum += waited
+            for index, bound in enumerate(self.WAIT_BUCKETS):
+                if waited <= bound:
+                    self._wait_counts[index] += 1
+                    break
+            else:
+                self._wait_counts[-1] += 1
+        return conn
+
+    def _prepare(self, conn, returned_at: Optional[float]):
+        """
+        Validates or recycles an idle connection, or opens a new one. Returns
+        the usable connection and whether the original had to be replaced.
+        """
+        if conn is None:
+            return self._open(), False
+        now = self._clock()
+        if conn.closed or self._expired(conn, now):
+            self._discard(conn)
+            return self._open(), True
+        if now - returned_at > self.validate_after:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except Exception:
+                self._discard(conn)
+                return self._open(), True
+        return conn, False
+
+    def putconn(self, conn):
+        """
+        Returns a connection to the pool. Connections left inside a
+        transaction are rolled back; broken or expired ones are closed.
+        """
+        keep = not conn.closed
+        idle = extensions.TRANSACTION_STATUS_IDLE
+        if keep and conn.get_transaction_status() != idle:
+            try:
+                conn.rollback()
+            except Exception:
+                keep = False
+        now = self._clock()
+        expired = keep and self._expired(conn, now)
+        if expired:
+            keep = False
+        if not keep:
+            self._discard(conn)
+
+        with self._cond:
+            self._recycled += expired
+            self._in_use -= 1
+            if keep and not self._closed:
+                self._idle.append((conn, now))
+            elif keep:
+                self._discard(conn)
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Returns a snapshot of the pool counters."""
+        with self._cond:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.WAIT_BUCKETS, self._wait_counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = cumulative + self._wait_counts[-1]
+            return {
+                "max_size": self.max_size,
+                "size": self._in_use + len(self._idle),
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "acquired": self._acquired,
+                "timeouts": self._timeouts,
+                "rejected": self._rejected,
+                "recycled": self._recycled,
+                "wait_seconds": {
+                    "buckets": buckets,
+                    "count": self._acquired,
+                    "sum": self._wait_sum,
+                },
+            }
 
 
 class DatabasePool:
     _pool = None
+    _lock = threading.Lock()
 
     @classmethod
-    def get_pool(cls):
+    def get_pool(cls) -> BoundedConnectionPool:
         if cls._pool is None:
-            try:
-                cls._pool = SimpleConnectionPool(
-                    minconn=1, maxconn=10, dsn=settings.DATABASE_URL
-                )
-            except Exception as e:
-                raise Exception(f"Error creating connection pool: {str(e)}")
+            with cls._lock:
+                if cls._pool is None:
+                    try:
+                        cls._pool = BoundedConnectionPool(
+                            connect=lambda: psycopg2.connect(settings.DATABASE_URL),
+                            min_size=settings.DB_POOL_MIN_SIZE,
+                            max_size=settings.DB_POOL_MAX_SIZE,
+                            max_waiters=settings.DB_POOL_MAX_WAITERS,
+                            timeout=settings.DB_POOL_ACQUIRE_TIMEOUT,
+                            max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+                            validate_after=settings.DB_POOL_VALIDATE_AFTER,
+                        )
+                    except Exception as e:
+                        raise Exception(f"Error creating connection pool: {str(e)}")
         return cls._pool
 
     @classmethod
@@ -29,3 +268,86 @@ class DatabasePool:
             yield conn
         finally:
             pool.putconn(conn)
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {} if cls._pool is None else cls._pool.stats()
+
+    @classmethod
+    def close(cls):
+        if cls._pool is not None:
+            cls._pool.closeall()
+            cls._pool = None
+
+
+class AsyncDatabasePool:
+    _pool = None
+    _lock = asyncio.Lock()
+    # psycopg_pool only reports the total wait, so checkouts are timed here
+    _wait = Histogram(
+        "db_pool_wait_seconds",
+        "Time callers waited for a connection.",
+        buckets=BoundedConnectionPool.WAIT_BUCKETS,
+    )
+
+    @classmethod
+    async def get_pool(cls) -> AsyncConnectionPool:
+        if cls._pool is None:
+            async with cls._lock:
+                if cls._pool is None:
+                    try:
+                        pool = AsyncConnectionPool(
+                            conninfo=settings.DATABASE_URL,
+                            min_size=settings.DB_POOL_MIN_SIZE,
+                            max_size=settings.DB_POOL_MAX_SIZE,
+                            max_waiting=settings.DB_POOL_MAX_WAITERS,
+                            timeout=settings.DB_POOL_ACQUIRE_TIMEOUT,
+                            max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+                            check=AsyncConnectionPool.check_connection,
+                            open=False,
+                        )
+                        await pool.open()
+                        cls._pool = pool
+                    except Exception as e:
+                        raise Exception(
+                            f"Error creating async connection pool: {str(e)}"
+                        )
+        return cls._pool
+
+    @classmethod
+    @asynccontextmanager
+    async def get_connection(cls) -> AsyncGenerator:
+        pool = await cls.get_pool()
+        start = time.monotonic()
+        conn = await pool.getconn()
+        cls._wait.observe(time.monotonic() - start)
+        # Same as pool.connection(): commit or roll back on exit, then return
+        try:
+            async with conn:
+                yield conn
+        finally:
+            await pool.putconn(conn)
+
+    @classmethod
+    def stats(cls) -> dict:
+        if cls._pool is None:
+            return {}
+        raw = cls._pool.get_stats()
+        size = raw.get("pool_size", 0)
+        idle = raw.get("pool_available", 0)
+        return {
+            "max_size": raw.get("pool_max", settings.DB_POOL_MAX_SIZE),
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiters": raw.get("requests_waiting", 0),
+            "acquired": raw.get("requests_num", 0),
+            "timeouts": raw.get("requests_errors", 0),
+            "wait_seconds": cls._wait.snapshot(),
+        }
+
+    @classmethod
+    async def close(cls):
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
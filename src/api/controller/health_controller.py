@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 
 from src.api.dependencies.provider import get_health_service
 from src.api.model.schemas import HealthCheckResponse
@@ -8,7 +8,34 @@ router = APIRouter()
 
 
 @router.get("/health")
-def get_health_status(
+async def get_health_status(
     health_service: HealthService = Depends(get_health_service),
 ) -> HealthCheckResponse:
-    return health_service.check_health()
+    return await health_service.check_health()
+
+
+@router.get("/health/live")
+async def get_liveness(
+    health_service: HealthService = Depends(get_health_service),
+) -> HealthCheckResponse:
+    """Liveness probe: answers without touching any dependency."""
+    return await health_service.check_liveness()
+
+
+@router.get(
+    "/health/ready",
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HealthCheckResponse}},
+)
+async def get_readiness(
+    response: Response,
+    health_service: HealthService = Depends(get_health_service),
+) -> HealthCheckResponse:
+    """
+    Readiness probe: 200 when every dependency is reachable and the
+    connection pool has capacity, 503 otherwise so load balancers stop
+    routing to the pod.
+    """
+    readiness = await health_service.check_readiness()
+    if readiness.status != "Healthy":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
@@ -0,0 +1,64 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from src.api.cache import CacheBackend, UserAvailabilityFilter
+from src.api.dependencies.provider import (
+    DatabasePoolClass,
+    get_database_pool,
+    get_user_availability_filter,
+    get_user_cache,
+)
+from src.api.repository.instrumentation import SLOW_QUERIES, statement_stats
+from src.api.utils.metrics import REGISTRY, cache_metrics, pool_metrics
+
+router = APIRouter(prefix="/metrics")
+
+
+class PrometheusResponse(PlainTextResponse):
+    media_type = "text/plain; version=0.0.4"
+
+
+@router.get("", response_class=PrometheusResponse)
+async def get_metrics(
+    pool: DatabasePoolClass = Depends(get_database_pool),
+    user_cache: Optional[CacheBackend] = Depends(get_user_cache),
+) -> str:
+    """
+    Request, query, connection pool and cache metrics in the Prometheus text
+    exposition format.
+    """
+    lines = REGISTRY.render()
+    lines += pool_metrics(pool.stats())
+    lines += cache_metrics("user", user_cache.stats() if user_cache else None)
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/cache")
+async def get_cache_metrics(
+    user_cache: Optional[CacheBackend] = Depends(get_user_cache),
+    availability_filter: Optional[UserAvailabilityFilter] = Depends(
+        get_user_availability_filter
+    ),
+) -> dict:
+    """Hit, miss and eviction counters of the caches."""
+    return {
+        "user": user_cache.stats() if user_cache is not None else None,
+        "availability": (
+            availability_filter.stats() if availability_filter is not None else None
+        ),
+    }
+
+
+@router.get("/queries")
+async def get_query_metrics() -> dict:
+    """
+    Calls, rows and time per SQL statement fingerprint, slowest in total
+    first, and the most recent slow statements (newest first) with their
+    captured plans.
+    """
+    return {
+        "statements": statement_stats(),
+        "slow": [slow._asdict() for slow in reversed(SLOW_QUERIES)],
+    }
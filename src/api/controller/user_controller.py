@@ -1,10 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Union
 
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import EmailStr
+
+from src.api.config import settings
 from src.api.dependencies.provider import get_user_service
 from src.api.mapper.user_mapper import UserMapper
-from src.api.model.schemas import UserRegistrationRequest, UserResponse
+from src.api.model.domain import User
+from src.api.model.enum import BatchItemStatus, UserIdentifier, UserRole, UserStatus
+from src.api.model.schemas import (
+    BatchUserRegistrationResponse,
+    BatchUserResult,
+    UserAvailabilityResponse,
+    UserBatchGetRequest,
+    UserBatchGetResponse,
+    UserPage,
+    UserRegistrationRequest,
+    UserResponse,
+)
 from src.api.service.user_service import UserService
-
+from src.api.utils.concurrency import iterate_off_loop
+from src.api.utils.conditional import etag_matches, make_etag
+from src.api.utils.pagination import decode_cursor, encode_cursor
+from src.api.utils.responses import FastJSONResponse, render_json
 
 router = APIRouter(prefix="/api/v1")
 
@@ -40,28 +70,314 @@ async def register_user(
             detail=f"Invalid registration data: {str(e)}",
         )
 
+
+@router.post(
+    "/users:batch",
+    response_model=BatchUserRegistrationResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "One result per user: created or conflict"},
+        400: {"description": "Bad request, empty or oversized batch"},
+    },
+)
+async def register_users(
+    requests: List[UserRegistrationRequest],
+    user_service: UserService = Depends(get_user_service),
+) -> BatchUserRegistrationResponse:
+    if not requests or len(requests) > settings.USER_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch must contain 1 to {settings.USER_BATCH_MAX_SIZE} users",
+        )
+
+    users = [UserMapper.to_domain(request) for request in requests]
+    saved_users = await user_service.register_users(users)
+
+    results = [
+        (
+            BatchUserResult(
+                index=index,
+                status=BatchItemStatus.CREATED,
+                user=UserMapper.to_response(saved_user),
+            )
+            if saved_user
+            else BatchUserResult(
+                index=index,
+                status=BatchItemStatus.CONFLICT,
+                detail="User already exists: username or email is taken",
+            )
+        )
+        for index, saved_user in enumerate(saved_users)
+    ]
+    created = sum(result.status == BatchItemStatus.CREATED for result in results)
+    return BatchUserRegistrationResponse(
+        created=created, conflicts=len(results) - created, results=results
+    )
+
+
+@router.get(
+    "/users",
+    response_model=Union[UserPage, UserBatchGetResponse],
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": "With ids: the requested users and the missing ids. "
+            "Otherwise: one page of users ordered by creation time"
+        },
+        400: {"description": "Bad request, invalid cursor or ids"},
+    },
+)
+async def list_users(
+    ids: Optional[str] = Query(
+        None, description="Comma-separated user ids to fetch instead of a page"
+    ),
+    role: Optional[UserRole] = None,
+    user_status: Optional[UserStatus] = Query(None, alias="status"),
+    created_from: Optional[datetime] = Query(None, alias="createdFrom"),
+    created_to: Optional[datetime] = Query(None, alias="createdTo"),
+    cursor: Optional[str] = None,
+    limit: int = Query(
+        settings.USER_PAGE_DEFAULT_SIZE, ge=1, le=settings.USER_PAGE_MAX_SIZE
+    ),
+    user_service: UserService = Depends(get_user_service),
+) -> FastJSONResponse:
+    if ids is not None:
+        if any((role, user_status, created_from, created_to, cursor)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="ids cannot be combined with filters or a cursor",
+            )
+        try:
+            user_ids = [int(user_id) for user_id in ids.split(",") if user_id]
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="ids must be a comma-separated list of integers",
+            )
+        return await _get_users(user_ids, user_service)
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    users, next_key = await user_service.list_users(
+        limit,
+        role=role,
+        user_status=user_status,
+        created_from=created_from,
+        created_to=created_to,
+        after=after,
+    )
+    return FastJSONResponse(
+        {
+            "items": [UserMapper.to_response_dict(user) for user in users],
+            "nextCursor": encode_cursor(next_key) if next_key else None,
+        }
+    )
+
+
+@router.post(
+    "/users:batchGet",
+    response_model=UserBatchGetResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "The requested users and the missing ids"},
+        400: {"description": "Bad request, empty or oversized id list"},
+    },
+)
+async def batch_get_users(
+    request: UserBatchGetRequest,
+    user_service: UserService = Depends(get_user_service),
+) -> FastJSONResponse:
+    return await _get_users(request.ids, user_service)
+
+
+async def _get_users(
+    user_ids: List[int], user_service: UserService
+) -> FastJSONResponse:
+    if not user_ids or len(user_ids) > settings.USER_MULTI_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Request 1 to {settings.USER_MULTI_GET_MAX_IDS} ids",
+        )
+
+    users, missing = await user_service.get_users(user_ids)
+    return FastJSONResponse(
+        {
+            "items": [UserMapper.to_response_dict(user) for user in users],
+            "missing": missing,
+        }
+    )
+
+
+@router.get(
+    "/users/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": "All users as NDJSON, one UserResponse per line; "
+            "gzip-compressed when the client accepts gzip",
+            "content": {"application/x-ndjson": {}},
+        }
+    },
+)
+async def export_users(
+    request: Request,
+    user_service: UserService = Depends(get_user_service),
+) -> StreamingResponse:
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {"Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    batches = user_service.export_users(settings.USER_EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        _export_stream(batches, compress),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+
+async def _export_stream(batches, compress: bool) -> AsyncIterator[bytes]:
+    """Encodes each batch of users as NDJSON, optionally gzip-compressed."""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    async for batch in iterate_off_loop(batches):
+        chunk = b"".join(
+            render_json(UserMapper.to_response_dict(user)) + b"\n" for user in batch
+        )
+        if compressor:
+            # Sync-flush so every batch reaches the client as it is produced
+            chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield chunk
+    if compressor:
+        yield compressor.flush()
+
+
+@router.get(
+    "/user/availability",
+    response_model=UserAvailabilityResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": "Whether each given username and email is still "
+            "free; null for the ones not asked about"
+        },
+        400: {"description": "Bad request, neither username nor email given"},
+    },
+)
+async def check_availability(
+    username: Optional[str] = None,
+    email: Optional[EmailStr] = None,
+    user_service: UserService = Depends(get_user_service),
+) -> UserAvailabilityResponse:
+    if username is None and email is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide a username, an email or both",
+        )
+
+    username_available, email_available = await user_service.check_availability(
+        username, email
+    )
+    return UserAvailabilityResponse(username=username_available, email=email_available)
+
+
+# Shared by GET /user/{id} and the lookups by identifier
+USER_RESPONSES = {
+    200: {
+        "description": "The user, with a strong ETag; X-Cache-Stale: true "
+        "when served from a stale cache entry"
+    },
+    304: {"description": "Not modified: If-None-Match matches the ETag"},
+    404: {"description": "User not found"},
+}
+
+
 @router.get(
     "/user/{id}",
     response_model=UserResponse,
     status_code=status.HTTP_200_OK,
-    responses={404: {"description": "User not found"}},
+    responses=USER_RESPONSES,
 )
-
 async def get_user(
     id: int,
+    if_none_match: Optional[str] = Header(None),
     user_service: UserService = Depends(get_user_service),
-) -> UserResponse:
+) -> Response:
     try:
         # Call service to get user by ID
-        user = await user_service.get_user(id)
-        if not user: 
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"            
-            )
+        user, stale = await user_service.get_user_entry(id)
+        return _user_response(user, stale, if_none_match)
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}",
+        )
 
-        # Convert domain model to response
-        return UserMapper.to_response(user)
+
+@router.get(
+    "/user/by-username/{username}",
+    response_model=UserResponse,
+    status_code=status.HTTP_200_OK,
+    responses=USER_RESPONSES,
+)
+async def get_user_by_username(
+    username: str,
+    if_none_match: Optional[str] = Header(None),
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
+    return await _get_user_by(
+        UserIdentifier.USERNAME, username, if_none_match, user_service
+    )
+
+
+@router.get(
+    "/user/by-email/{email}",
+    response_model=UserResponse,
+    status_code=status.HTTP_200_OK,
+    responses=USER_RESPONSES,
+)
+async def get_user_by_email(
+    email: str,
+    if_none_match: Optional[str] = Header(None),
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
+    """Looks the email up case-insensitively."""
+    return await _get_user_by(UserIdentifier.EMAIL, email, if_none_match, user_service)
+
+
+@router.get(
+    "/user/by-phone/{phone}",
+    response_model=UserResponse,
+    status_code=status.HTTP_200_OK,
+    responses=USER_RESPONSES,
+)
+async def get_user_by_phone(
+    phone: str,
+    if_none_match: Optional[str] = Header(None),
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
+    """
+    Accepts the number in E.164 or national form; national numbers get the
+    default country code.
+    """
+    return await _get_user_by(UserIdentifier.PHONE, phone, if_none_match, user_service)
+
+
+async def _get_user_by(
+    identifier: UserIdentifier,
+    value: str,
+    if_none_match: Optional[str],
+    user_service: UserService,
+) -> Response:
+    try:
+        user, stale = await user_service.get_user_entry_by(identifier, value)
+        return _user_response(user, stale, if_none_match)
 
     except HTTPException as he:
         raise he
@@ -70,3 +386,29 @@ async def get_user(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}",
         )
+
+
+def _user_response(
+    user: Optional[User], stale: bool, if_none_match: Optional[str]
+) -> Response:
+    """Builds the 200, 304 or 404 response for a single user lookup."""
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    headers = {"ETag": make_etag(user.id, user.updated_at)}
+    if settings.USER_CACHE_CONTROL:
+        headers["Cache-Control"] = settings.USER_CACHE_CONTROL
+    # Served from the cache past its TTL (stale-while-revalidate or
+    # stale-if-error)
+    if stale:
+        headers["X-Cache-Stale"] = "true"
+
+    # The client's copy is current: answer from the version stamp alone
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Encode the trusted domain model directly; response_model still
+    # documents the body
+    return FastJSONResponse(UserMapper.to_response_dict(user), headers=headers)
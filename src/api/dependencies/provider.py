@@ -1,65 +1,206 @@
-from typing import Dict
+import asyncio
+from typing import Dict, Optional, Type, Union
 
 from fastapi import Depends
 
+from src.api.cache import (
+    CacheBackend,
+    LRUTTLCache,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    UserAvailabilityFilter,
+    UserSerializer,
+)
+from src.api.config import settings
+from src.api.config.database import AsyncDatabasePool, DatabasePool
+from src.api.repository.async_user_repository import AsyncUserRepository
 from src.api.repository.user_repository import UserRepository
 from src.api.service.health_service import HealthService
 from src.api.service.user_service import UserService
 
+Repository = Union[UserRepository, AsyncUserRepository]
+DatabasePoolClass = Union[Type[DatabasePool], Type[AsyncDatabasePool]]
+
 
 class Providers:
     _instances: Dict = {}
 
     @staticmethod
-    def get_user_repository() -> UserRepository:
+    def get_user_repository() -> Repository:
+        """
+        Singleton provider for the user repository selected by
+        settings.DATABASE_DRIVER ("sync" or "async")
+        """
+        repository_class = (
+            AsyncUserRepository
+            if settings.DATABASE_DRIVER == "async"
+            else UserRepository
+        )
+        if repository_class not in Providers._instances:
+            Providers._instances[repository_class] = repository_class(
+                Providers.get_user_availability_filter()
+            )
+        return Providers._instances[repository_class]
+
+    @staticmethod
+    def get_database_pool() -> DatabasePoolClass:
+        """
+        Returns the connection pool used by the repository selected by
+        settings.DATABASE_DRIVER
+        """
+        if settings.DATABASE_DRIVER == "async":
+            return AsyncDatabasePool
+        return DatabasePool
+
+    @staticmethod
+    def get_user_availability_filter() -> Optional[UserAvailabilityFilter]:
+        """
+        Singleton provider for the Bloom filter of taken usernames and
+        emails, or None when settings.USER_AVAILABILITY_FILTER_MAX_BYTES is 0
+        """
+        if UserAvailabilityFilter not in Providers._instances:
+            availability_filter = None
+            if settings.USER_AVAILABILITY_FILTER_MAX_BYTES > 0:
+                availability_filter = UserAvailabilityFilter(
+                    settings.USER_AVAILABILITY_FILTER_MAX_BYTES,
+                    settings.USER_AVAILABILITY_FILTER_ERROR_RATE,
+                )
+            Providers._instances[UserAvailabilityFilter] = availability_filter
+        return Providers._instances[UserAvailabilityFilter]
+
+    @staticmethod
+    def get_user_cache() -> Optional[CacheBackend]:
         """
-        Singleton provider for UserRepository
+        Singleton provider for the user read cache selected by
+        settings.USER_CACHE_BACKEND, or None when caching is disabled
         """
-        if UserRepository not in Providers._instances:
-            Providers._instances[UserRepository] = UserRepository()
-        return Providers._instances[UserRepository]
+        if CacheBackend not in Providers._instances:
+            backend = settings.USER_CACHE_BACKEND
+            # Keep entries long enough for every stale read mode
+            stale_ttl = max(
+                settings.USER_CACHE_STALE_WHILE_REVALIDATE,
+                settings.USER_CACHE_STALE_IF_ERROR,
+            )
+            cache = None
+            if backend == "redis":
+                cache = RedisCacheBackend.from_url(
+                    settings.REDIS_URL,
+                    UserSerializer,
+                    ttl=settings.USER_CACHE_TTL,
+                    stale_ttl=stale_ttl,
+                )
+            elif backend == "memory" and settings.USER_CACHE_MAX_SIZE > 0:
+                cache = MemoryCacheBackend(
+                    LRUTTLCache(
+                        max_size=settings.USER_CACHE_MAX_SIZE,
+                        ttl=settings.USER_CACHE_TTL,
+                        stale_ttl=stale_ttl,
+                    )
+                )
+            Providers._instances[CacheBackend] = cache
+        return Providers._instances[CacheBackend]
+
+    @staticmethod
+    async def start() -> None:
+        """
+        Starts loading the availability filter from the user table in the
+        background, and rebuilding it every
+        settings.USER_AVAILABILITY_FILTER_REFRESH_INTERVAL seconds; until it
+        is loaded, availability is checked in the database.
+        """
+        if Providers.get_user_availability_filter() is None:
+            return
+        user_service = Providers.get_user_service(
+            Providers.get_user_repository(), Providers.get_user_cache()
+        )
+        Providers._instances[asyncio.Task] = asyncio.create_task(
+            user_service.refresh_availability_filter(
+                settings.USER_EXPORT_BATCH_SIZE,
+                settings.USER_AVAILABILITY_FILTER_REFRESH_INTERVAL,
+            )
+        )
+
+    @staticmethod
+    async def close() -> None:
+        """Releases connections held by provided singletons."""
+        load = Providers._instances.pop(asyncio.Task, None)
+        if load is not None:
+            load.cancel()
+            await asyncio.gather(load, return_exceptions=True)
+        cache = Providers._instances.pop(CacheBackend, None)
+        if cache is not None:
+            await cache.close()
 
     @staticmethod
     def get_user_service(
-        user_repository: UserRepository = Depends(get_user_repository),
+        user_repository: Repository = Depends(get_user_repository),
+        cache: Optional[CacheBackend] = Depends(get_user_cache),
     ) -> UserService:
         """
-        Provider for UserService with repository dependency
+        Provider for UserService with repository and cache dependencies
         """
         if UserService not in Providers._instances:
-            Providers._instances[UserService] = UserService(user_repository)
+            Providers._instances[UserService] = UserService(
+                user_repository,
+                cache,
+                stale_while_revalidate=settings.USER_CACHE_STALE_WHILE_REVALIDATE,
+                stale_if_error=settings.USER_CACHE_STALE_IF_ERROR,
+                availability_filter=Providers.get_user_availability_filter(),
+            )
         return Providers._instances[UserService]
 
     @staticmethod
     def get_health_service(
-        user_repository: UserRepository = Depends(get_user_repository),
+        user_repository: Repository = Depends(get_user_repository),
+        cache: Optional[CacheBackend] = Depends(get_user_cache),
     ) -> HealthService:
         """
-        Provider for HealthService with repository dependency
+        Provider for HealthService with repository and cache dependencies
         """
         if HealthService not in Providers._instances:
-            Providers._instances[HealthService] = HealthService(user_repository)
+            Providers._instances[HealthService] = HealthService(
+                user_repository,
+                cache,
+                pool_stats=Providers.get_database_pool().stats,
+                ready_ttl=settings.HEALTH_READY_CACHE_TTL,
+                probe_timeout=settings.HEALTH_PROBE_TIMEOUT,
+                pool_max_waiters=settings.HEALTH_POOL_MAX_WAITERS,
+            )
         return Providers._instances[HealthService]
 
 
 # FastAPI dependency injection functions
-def get_user_repository() -> UserRepository:
+def get_user_repository() -> Repository:
     return Providers.get_user_repository()
 
 
+def get_user_cache() -> Optional[CacheBackend]:
+    return Providers.get_user_cache()
+
+
+def get_user_availability_filter() -> Optional[UserAvailabilityFilter]:
+    return Providers.get_user_availability_filter()
+
+
+def get_database_pool() -> DatabasePoolClass:
+    return Providers.get_database_pool()
+
+
 def get_health_service(
-    user_repository: UserRepository = Depends(get_user_repository),
+    user_repository: Repository = Depends(get_user_repository),
+    cache: Optional[CacheBackend] = Depends(get_user_cache),
 ) -> HealthService:
     """
     FastAPI dependency for HealthService
     """
-    return Providers.get_health_service(user_repository)
+    return Providers.get_health_service(user_repository, cache)
 
 
 def get_user_service(
-    user_repository: UserRepository = Depends(get_user_repository),
+    user_repository: Repository = Depends(get_user_repository),
+    cache: Optional[CacheBackend] = Depends(get_user_cache),
 ) -> UserService:
     """
     FastAPI dependency for UserService
     """
-    return Providers.get_user_service(user_repository)
+    return Providers.get_user_service(user_repository, cache)
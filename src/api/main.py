@@ -1,8 +1,25 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from src.api.controller import health_controller, user_controller
+from src.api.config.database import AsyncDatabasePool, DatabasePool
+from src.api.controller import health_controller, metrics_controller, user_controller
+from src.api.dependencies.provider import Providers
+from src.api.utils.metrics import MetricsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await Providers.start()
+    yield
+    DatabasePool.close()
+    await AsyncDatabasePool.close()
+    await Providers.close()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(health_controller.router)
+app.include_router(metrics_controller.router)
 app.include_router(user_controller.router)
@@ -1,7 +1,35 @@
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Optional, Sequence, Tuple
+
 from src.api.model.domain import Address, User
+from src.api.model.enum import UserRole, UserStatus
 from src.api.model.schemas import Address as UserRegistrationRequestAddress
 from src.api.model.schemas import UserRegistrationRequest, UserResponse
 
+# Decoded enum members by column value; values outside the enum are kept as
+# the raw string.
+_ROLES = {role.value: role for role in UserRole}
+_STATUSES = {user_status.value: user_status for user_status in UserStatus}
+
+# User columns in User.__init__ order, with address_id in place of address
+_USER_COLUMNS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "phone_number",
+    "address_id",
+    "role",
+    "status",
+    "last_login_at",
+    "created_at",
+    "updated_at",
+)
+# Address columns in Address.__init__ order, after id
+_ADDRESS_COLUMNS = ("street", "city", "state", "country", "postal_code")
+
 
 class UserMapper:
     @staticmethod
@@ -74,6 +102,49 @@ class UserMapper:
             updatedAt=user.updated_at,
         )
 
+    @staticmethod
+    def to_response_dict(user: User) -> dict:
+        """
+        Maps a User object to a dict with the shape and field order of
+        UserResponse, without validating it again.
+
+        Users read from the database were validated when they were written,
+        so read paths encode this dict directly (see ``render_json``) instead
+        of building a UserResponse and having FastAPI validate and serialize
+        it a second time.
+
+        Args:
+            user (User): The user to map.
+
+        Returns:
+            dict: The UserResponse fields, ready for JSON encoding.
+        """
+        address = user.address
+        return {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "firstName": user.first_name,
+            "lastName": user.last_name,
+            "phoneNumber": user.phone_number,
+            "address": (
+                None
+                if address is None
+                else {
+                    "street": address.street,
+                    "city": address.city,
+                    "state": address.state,
+                    "country": address.country,
+                    "postalCode": address.postal_code,
+                }
+            ),
+            "role": user.role,
+            "status": user.status,
+            "lastLoginAt": user.last_login_at,
+            "createdAt": user.created_at,
+            "updatedAt": user.updated_at,
+        }
+
     @staticmethod
     def build_user_object(user: dict, address: Address) -> User:
         """
@@ -100,3 +171,117 @@ class UserMapper:
             created_at=user["created_at"],
             updated_at=user["updated_at"],
         )
+
+    @staticmethod
+    def build_address_object(address: dict) -> Address:
+        """
+        Builds an Address object from a dictionary of address columns.
+
+        Args:
+            address (dict): A dictionary containing address attributes.
+
+        Returns:
+            Address: An Address object constructed from the provided data.
+        """
+        return Address(
+            street=address["street"],
+            city=address["city"],
+            state=address["state"],
+            postal_code=address["postal_code"],
+            country=address["country"],
+        )
+
+    @staticmethod
+    def build_joined_address(row: dict) -> Optional[Address]:
+        """
+        Builds the Address carried on a user row fetched with a LEFT JOIN on
+        address, or None when the user has no address.
+
+        Args:
+            row (dict): A user row that includes the address columns.
+
+        Returns:
+            Optional[Address]: The user's address, if any.
+        """
+        if row["address_id"] is None:
+            return None
+        return UserMapper.build_address_object(row)
+
+    @staticmethod
+    def cursor_mapper(description) -> Callable[[Sequence], User]:
+        """
+        Returns the row mapper for the columns of an executed cursor (works
+        with both psycopg2 and psycopg 3 cursor descriptions).
+
+        Args:
+            description: The cursor's ``description``.
+
+        Returns:
+            Callable[[Sequence], User]: See ``row_mapper``.
+        """
+        return UserMapper.row_mapper(tuple(column.name for column in description))
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def row_mapper(columns: Tuple[str, ...]) -> Callable[[Sequence], User]:
+        """
+        Compiles a function that builds a User, with its address when the row
+        carries the joined address columns, from a tuple row with the given
+        columns.
+
+        Column positions are resolved once per column list (and cached), so
+        decoding a row is two itemgetter calls and the constructors instead
+        of a dozen string-keyed lookups. ``role`` and ``status`` are decoded
+        to enum members through a prebuilt table.
+
+        Args:
+            columns (Tuple[str, ...]): The column names, in row order.
+
+        Returns:
+            Callable[[Sequence], User]: Maps one row to a User.
+        """
+        position = {name: index for index, name in enumerate(columns)}
+        user_columns = itemgetter(*(position[name] for name in _USER_COLUMNS))
+        address_columns = (
+            itemgetter(*(position[name] for name in _ADDRESS_COLUMNS))
+            if all(name in position for name in _ADDRESS_COLUMNS)
+            else None
+        )
+        roles, statuses = _ROLES, _STATUSES
+
+        def to_user(row: Sequence) -> User:
+            (
+                user_id,
+                username,
+                email,
+                first_name,
+                last_name,
+                phone_number,
+                address_id,
+                role,
+                user_status,
+                last_login_at,
+                created_at,
+                updated_at,
+            ) = user_columns(row)
+            address = (
+                None
+                if address_id is None or address_columns is None
+                else Address(address_id, *address_columns(row))
+            )
+            return User(
+                user_id,
+                username,
+                email,
+                first_name,
+                last_name,
+                phone_number,
+                address,
+                roles.get(role, role),
+                statuses.get(user_status, user_status),
+                last_login_at,
+                created_at,
+                updated_at,
+            )
+
+        return to_user
@@ -5,6 +5,9 @@ from src.api.model.enum import UserRole, UserStatus
 
 
 class Address:
+    # No per-instance __dict__: bulk reads and caches hold many of these
+    __slots__ = ("id", "street", "city", "state", "country", "postal_code")
+
     def __init__(
         self,
         id: Optional[int] = None,
@@ -23,6 +26,21 @@ class Address:
 
 
 class User:
+    __slots__ = (
+        "id",
+        "username",
+        "email",
+        "first_name",
+        "last_name",
+        "phone_number",
+        "address",
+        "role",
+        "status",
+        "last_login_at",
+        "_created_at",
+        "_updated_at",
+    )
+
     def __init__(
         self,
         id: Optional[int] = None,
@@ -48,5 +66,28 @@ class User:
         self.role = role
         self.status = status
         self.last_login_at = last_login_at
-        self.created_at = created_at or datetime.now(timezone.utc)
-        self.updated_at = updated_at or datetime.now(timezone.utc)
+        self._created_at = created_at
+        self._updated_at = updated_at
+
+    @property
+    def created_at(self) -> datetime:
+        # Users read from the database always carry their timestamps, so the
+        # clock is only read for new users, on first access.
+        if self._created_at is None:
+            self._created_at = datetime.now(timezone.utc)
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value: Optional[datetime]) -> None:
+        self._created_at = value
+
+    @property
+    def updated_at(self) -> datetime:
+        # A new user is last updated when it is created
+        if self._updated_at is None:
+            self._updated_at = self.created_at
+        return self._updated_at
+
+    @updated_at.setter
+    def updated_at(self, value: Optional[datetime]) -> None:
+        self._updated_at = value
@@ -13,3 +13,14 @@ class UserStatus(str, Enum):
     INACTIVE = "INACTIVE"
     SUSPENDED = "SUSPENDED"
     DELETED = "DELETED"
+
+
+class BatchItemStatus(str, Enum):
+    CREATED = "CREATED"
+    CONFLICT = "CONFLICT"
+
+
+class UserIdentifier(str, Enum):
+    USERNAME = "username"
+    EMAIL = "email"
+    PHONE = "phone"
@@ -1,10 +1,10 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import HTTPException, status
 from pydantic import BaseModel, EmailStr, model_validator
 
-from src.api.model.enum import UserRole, UserStatus
+from src.api.model.enum import BatchItemStatus, UserRole, UserStatus
 
 
 class HealthCheckResponse(BaseModel):
@@ -56,3 +56,35 @@ class UserResponse(BaseModel):
     lastLoginAt: Optional[datetime] = None
     createdAt: datetime
     updatedAt: datetime
+
+
+class BatchUserResult(BaseModel):
+    index: int
+    status: BatchItemStatus
+    user: Optional[UserResponse] = None
+    detail: Optional[str] = None
+
+
+class BatchUserRegistrationResponse(BaseModel):
+    created: int
+    conflicts: int
+    results: List[BatchUserResult]
+
+
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    nextCursor: Optional[str] = None
+
+
+class UserBatchGetRequest(BaseModel):
+    ids: List[int]
+
+
+class UserBatchGetResponse(BaseModel):
+    items: List[UserResponse]
+    missing: List[int]
+
+
+class UserAvailabilityResponse(BaseModel):
+    username: Optional[bool] = None
+    email: Optional[bool] = None
@@ -0,0 +1,346 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from psycopg.rows import dict_row
+
+from src.api.cache import UserAvailabilityFilter
+from src.api.config.database import AsyncDatabasePool
+from src.api.mapper.user_mapper import UserMapper
+from src.api.model.domain import User
+from src.api.model.enum import UserIdentifier, UserRole, UserStatus
+from src.api.repository import queries
+from src.api.repository.instrumentation import execute_async
+from src.api.utils.metrics import instrument_query
+
+
+class AsyncUserRepository:
+    """
+    Async counterpart of UserRepository backed by psycopg 3 and
+    AsyncDatabasePool. Selected with ``DATABASE_DRIVER=async``.
+    """
+
+    def __init__(self, availability_filter: Optional[UserAvailabilityFilter] = None):
+        # Saved usernames and emails are recorded here, when given
+        self.availability_filter = availability_filter
+
+    async def check_db_connection(self):
+        """
+        Attempts to acquire a pooled connection and execute a simple query.
+
+        :return: "Connected" on success, otherwise a description of the error.
+        :rtype: str
+        """
+        try:
+            async with AsyncDatabasePool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await execute_async(cur, "SELECT 1")
+                    return "Connected"
+        except Exception as e:
+            return f"Failed to connect to database: {str(e)}"
+
+    @instrument_query
+    async def save(self, user: User) -> Optional[User]:
+        """
+        Saves a user and its address in a single statement.
+
+        The transaction is committed on success and rolled back on conflict or
+        error, so the connection always goes back to the pool clean.
+
+        :param user: The user to save.
+        :type user: User
+        :return: The saved user, as stored in the database.
+        :rtype: Optional[User]
+        :raises HTTPException: 409 if the username or email is already taken.
+        :raises Exception: if an error occurs while saving the user.
+        """
+        async with AsyncDatabasePool.get_connection() as conn:
+            try:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    await execute_async(cur, *queries.insert_user(user))
+                    result = await cur.fetchone()
+                if result is None:
+                    # ON CONFLICT DO NOTHING skipped the user; undo the address
+                    await conn.rollback()
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="User already exists: username or email is taken",
+                    )
+                await conn.commit()
+            except HTTPException:
+                raise
+            except Exception as e:
+                await conn.rollback()
+                raise Exception(f"Error saving user: {str(e)}")
+
+        saved_user = UserMapper.build_user_object(
+            result, UserMapper.build_joined_address(result)
+        )
+        if self.availability_filter is not None:
+            self.availability_filter.add(saved_user.username, saved_user.email)
+        return saved_user
+
+    @instrument_query
+    async def save_many(self, users: List[User]) -> List[Optional[User]]:
+        """
+        Saves a batch of users and their addresses in one transaction with
+        multi-row inserts: one id allocation, one address insert and one user
+        insert, plus a cleanup of addresses left behind by conflicting users.
+
+        :param users: The users to save.
+        :type users: List[User]
+        :return: One entry per input user, in order: the saved user, or None
+            if its username or email was already taken.
+        :rtype: List[Optional[User]]
+        :raises Exception: if an error occurs while saving the users.
+        """
+        if not users:
+            return []
+        address_count = sum(user.address is not None for user in users)
+        async with AsyncDatabasePool.get_connection() as conn:
+            try:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    await execute_async(
+                        cur, queries.ALLOCATE_IDS, (len(users), address_count)
+                    )
+                    ids = await cur.fetchone()
+                    user_ids, address_ids = ids["user_ids"], ids["address_ids"]
+                    if address_ids:
+                        await execute_async(
+                            cur,
+                            queries.INSERT_ADDRESSES,
+                            queries.insert_addresses(users, address_ids),
+                        )
+                    user_address_ids = queries.align_address_ids(users, address_ids)
+                    await execute_async(
+                        cur,
+                        queries.INSERT_USERS,
+                        queries.insert_users(users, user_ids, user_address_ids),
+                    )
+                    rows = {row["id"]: row for row in await cur.fetchall()}
+                    orphaned = [
+                        address_id
+                        for user_id, address_id in zip(user_ids, user_address_ids)
+                        if address_id is not None and user_id not in rows
+                    ]
+                    if orphaned:
+                        await execute_async(cur, queries.DELETE_ADDRESSES, (orphaned,))
+                await conn.commit()
+            except Exception as e:
+                await conn.rollback()
+                raise Exception(f"Error saving users: {str(e)}")
+
+        saved_users = [
+            (
+                UserMapper.build_user_object(rows[user_id], user.address)
+                if user_id in rows
+                else None
+            )
+            for user, user_id in zip(users, user_ids)
+        ]
+        if self.availability_filter is not None:
+            self.availability_filter.add_users(saved_users)
+        return saved_users
+
+    @instrument_query
+    async def get_user(self, user_id: int) -> Optional[User]:
+        """
+        Fetch a user from the database by their ID.
+
+        Args:
+            user_id (int): The ID of the user to retrieve.
+
+        Returns:
+            Optional[User]: The user object if found, else None.
+        """
+        try:
+            async with AsyncDatabasePool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await execute_async(cur, queries.SELECT_USER_BY_ID, (user_id,))
+                    result = await cur.fetchone()
+
+                    if result:
+                        return UserMapper.cursor_mapper(cur.description)(result)
+                    return None
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error fetching user from database: {str(e)}",
+            )
+
+    @instrument_query
+    async def get_user_by(
+        self, identifier: UserIdentifier, value: str
+    ) -> Optional[User]:
+        """
+        Fetch a user and their address by username, email or phone number.
+
+        Args:
+            identifier (UserIdentifier): Which identifier ``value`` is.
+            value (str): The username, the lower-cased email or the E.164
+                phone number.
+
+        Returns:
+            Optional[User]: The user object if found, else None.
+        """
+        try:
+            async with AsyncDatabasePool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await execute_async(
+                        cur, queries.SELECT_USER_BY_IDENTIFIER[identifier], (value,)
+                    )
+                    result = await cur.fetchone()
+
+                    if result:
+                        return UserMapper.cursor_mapper(cur.description)(result)
+                    return None
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error fetching user from database: {str(e)}",
+            )
+
+    @instrument_query
+    async def get_users(self, user_ids: List[int]) -> List[User]:
+        """
+        Fetch several users and their addresses by ID in a single query.
+
+        Args:
+            user_ids (List[int]): The IDs of the users to retrieve.
+
+        Returns:
+            List[User]: The users that exist, in no particular order.
+        """
+        try:
+            async with AsyncDatabasePool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await execute_async(
+                        cur, queries.SELECT_USERS_BY_IDS, (list(user_ids),)
+                    )
+                    rows = await cur.fetchall()
+                    to_user = UserMapper.cursor_mapper(cur.description)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error fetching users from database: {str(e)}",
+            )
+        return [to_user(row) for row in rows]
+
+    @instrument_query
+    async def list_users(
+        self,
+        limit: int,
+        role: Optional[UserRole] = None,
+        user_status: Optional[UserStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[User]:
+        """
+        Fetch one page of users ordered by (created_at, id), optionally
+        filtered by role, status and a created_at range.
+
+        Args:
+            limit (int): Maximum number of users to return.
+            role (Optional[UserRole]): Only users with this role.
+            user_status (Optional[UserStatus]): Only users with this status.
+            created_from (Optional[datetime]): Created at or after this time.
+            created_to (Optional[datetime]): Created before this time.
+            after (Optional[Tuple[datetime, int]]): The (created_at, id) of
+                the last user of the previous page.
+
+        Returns:
+            List[User]: Up to ``limit`` users.
+        """
+        query, params = queries.select_users_page(
+            limit, role, user_status, created_from, created_to, after
+        )
+        try:
+            async with AsyncDatabasePool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await execute_async(cur, query, params)
+                    rows = await cur.fetchall()
+                    to_user = UserMapper.cursor_mapper(cur.description)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error fetching users from database: {str(e)}",
+            )
+        return [to_user(row) for row in rows]
+
+    @instrument_query
+    async def iter_users(self, batch_size: int) -> AsyncIterator[List[User]]:
+        """
+        Streams every user, in id order, as lists of at most ``batch_size``
+        users read from a server-side cursor, so memory use does not depend
+        on the size of the table.
+
+        The pooled connection is held until the iterator is exhausted or
+        closed.
+
+        Args:
+            batch_size (int): Rows fetched from the server per round trip.
+
+        Yields:
+            List[User]: The next batch of users.
+        """
+        async with AsyncDatabasePool.get_connection() as conn:
+            try:
+                async with conn.cursor(name="user_export") as cur:
+                    await execute_async(cur, queries.SELECT_ALL_USERS)
+                    to_user = UserMapper.cursor_mapper(cur.description)
+                    while rows := await cur.fetchmany(batch_size):
+                        yield [to_user(row) for row in rows]
+            finally:
+                await conn.rollback()
+
+    @instrument_query
+    async def find_taken(
+        self, username: Optional[str], email: Optional[str]
+    ) -> Tuple[bool, bool]:
+        """
+        Checks whether a username and an email are taken, in one indexed
+        query.
+
+        Args:
+            username (Optional[str]): The username to check, if any.
+            email (Optional[str]): The email to check, if any.
+
+        Returns:
+            Tuple[bool, bool]: Whether the username and the email are taken.
+        """
+        try:
+            async with AsyncDatabasePool.get_connection() as conn:
+                async with conn.cursor() as cur:
+                    await execute_async(cur, queries.SELECT_TAKEN, (username, email))
+                    return await cur.fetchone()
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error checking availability: {str(e)}",
+            )
+
+    @instrument_query
+    async def iter_identities(
+        self, batch_size: int
+    ) -> AsyncIterator[List[Tuple[Optional[str], Optional[str]]]]:
+        """
+        Streams the username and email of every user, as lists of at most
+        ``batch_size`` rows read from a server-side cursor.
+
+        Args:
+            batch_size (int): Rows fetched from the server per round trip.
+
+        Yields:
+            List[Tuple[Optional[str], Optional[str]]]: (username, email) rows.
+        """
+        async with AsyncDatabasePool.get_connection() as conn:
+            try:
+                async with conn.cursor(name="user_identities") as cur:
+                    await execute_async(cur, queries.SELECT_USER_IDENTITIES)
+                    while rows := await cur.fetchmany(batch_size):
+                        yield rows
+            finally:
+                await conn.rollback()
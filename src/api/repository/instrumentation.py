@@ -0,0 +1,245 @@
+"""
+Instrumented statement execution shared by the user repositories.
+
+Every statement goes through :func:`execute` (psycopg2) or
+:func:`execute_async` (psycopg 3), which record its duration and row count
+under a normalized fingerprint of the SQL, log it when it is slower than
+settings.DB_SLOW_QUERY_THRESHOLD and, when settings.DB_EXPLAIN_SLOW_QUERIES
+is turned on, capture the plan of slow SELECTs with
+``EXPLAIN (ANALYZE, BUFFERS)``.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Deque, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from psycopg import pq
+from psycopg2 import extensions
+
+from src.api.config import settings
+from src.api.utils.metrics import QUERY_BUCKETS, REGISTRY, Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+DB_STATEMENT_DURATION = REGISTRY.register(
+    Histogram(
+        "db_statement_duration_seconds",
+        "Time to execute SQL statements, by statement fingerprint.",
+        ("statement",),
+        buckets=QUERY_BUCKETS,
+    )
+)
+DB_STATEMENT_ROWS = REGISTRY.register(
+    Counter(
+        "db_statement_rows_total",
+        "Rows returned or affected by SQL statements, by statement fingerprint.",
+        ("statement",),
+    )
+)
+
+# Normalized SQL of every fingerprint seen, for reading the metric labels
+STATEMENTS: Dict[str, str] = {}
+
+# Most recent slow statements, newest last
+SLOW_QUERIES: Deque["SlowQuery"] = deque(maxlen=100)
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|%s|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+# Statements whose plan can be captured by running them again: plain SELECTs
+# that do not draw from sequences
+_EXPLAINABLE = re.compile(r"^select\b(?!.*\b(?:nextval|setval)\s*\()", re.I | re.S)
+
+_SAVEPOINT = "SAVEPOINT explain_slow_query"
+_ROLLBACK = "ROLLBACK TO SAVEPOINT explain_slow_query"
+
+
+class SlowQuery(NamedTuple):
+    fingerprint: str
+    statement: str
+    duration: float
+    rows: int
+    params: str
+    plan: Optional[str]
+    at: datetime
+
+
+@lru_cache(maxsize=256)
+def fingerprint(query: str) -> Tuple[str, str]:
+    """
+    Returns a short id and the normalized text of a statement: comments
+    removed, literals and placeholders replaced by ``?`` and whitespace
+    collapsed, so the same statement always has the same fingerprint
+    whatever its parameters.
+    """
+    statement = _COMMENTS.sub(" ", query)
+    statement = _LITERALS.sub("?", statement)
+    statement = _WHITESPACE.sub(" ", statement).strip().rstrip(";").strip()
+    digest = hashlib.blake2b(statement.encode(), digest_size=6).hexdigest()
+    STATEMENTS.setdefault(digest, statement)
+    return digest, statement
+
+
+def redact(params: Optional[Sequence[Any]]) -> str:
+    """Describes parameters by type only, so logs never carry user data."""
+    if params is None:
+        return "()"
+
+    def describe(value: Any) -> str:
+        if value is None:
+            return "NULL"
+        if isinstance(value, (list, tuple)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    return f"({', '.join(describe(value) for value in params)})"
+
+
+def _record(query: str, duration: float, rows: int) -> Tuple[str, str]:
+    digest, statement = fingerprint(query)
+    DB_STATEMENT_DURATION.observe(duration, digest)
+    if rows > 0:
+        DB_STATEMENT_ROWS.inc(digest, amount=rows)
+    return digest, statement
+
+
+def _is_slow(duration: float) -> bool:
+    threshold = settings.DB_SLOW_QUERY_THRESHOLD
+    return 0 < threshold <= duration
+
+
+def _wants_plan(cur, statement: str) -> bool:
+    # Named cursors only DECLARE here; the rows are fetched later
+    return (
+        settings.DB_EXPLAIN_SLOW_QUERIES
+        and getattr(cur, "name", None) is None
+        and _EXPLAINABLE.match(statement) is not None
+    )
+
+
+def _log_slow(
+    digest: str,
+    statement: str,
+    duration: float,
+    rows: int,
+    params: Optional[Sequence[Any]],
+    plan: Optional[str],
+) -> None:
+    slow = SlowQuery(
+        digest,
+        statement,
+        duration,
+        rows,
+        redact(params),
+        plan,
+        datetime.now(timezone.utc),
+    )
+    SLOW_QUERIES.append(slow)
+    logger.warning(
+        "Slow query %s (%.1f ms, %d rows): %s params=%s%s",
+        digest,
+        duration * 1000,
+        rows,
+        statement,
+        slow.params,
+        f"\n{plan}" if plan else "",
+    )
+
+
+def execute(cur, query: str, *args: Any) -> None:
+    """
+    Executes ``query`` on a psycopg2 cursor, recording its duration, row
+    count and fingerprint. Takes the same arguments as ``cursor.execute``.
+    """
+    start = time.perf_counter()
+    cur.execute(query, *args)
+    duration = time.perf_counter() - start
+    rows = cur.rowcount
+    digest, statement = _record(query, duration, rows)
+    if _is_slow(duration):
+        params = args[0] if args else None
+        plan = _explain(cur, query, params) if _wants_plan(cur, statement) else None
+        _log_slow(digest, statement, duration, rows, params, plan)
+
+
+async def execute_async(cur, query: str, *args: Any) -> None:
+    """Async counterpart of :func:`execute` for psycopg 3 cursors."""
+    start = time.perf_counter()
+    await cur.execute(query, *args)
+    duration = time.perf_counter() - start
+    rows = cur.rowcount
+    digest, statement = _record(query, duration, rows)
+    if _is_slow(duration):
+        params = args[0] if args else None
+        plan = None
+        if _wants_plan(cur, statement):
+            plan = await _explain_async(cur, query, params)
+        _log_slow(digest, statement, duration, rows, params, plan)
+
+
+def _explain(cur, query: str, params: Optional[Sequence[Any]]) -> Optional[str]:
+    # The results of ``cur`` are already client-side, so a second cursor can
+    # run on the same connection. Inside a transaction a savepoint keeps a
+    # failing EXPLAIN from aborting it.
+    conn = cur.connection
+    in_transaction = (
+        conn.get_transaction_status() == extensions.TRANSACTION_STATUS_INTRANS
+    )
+    try:
+        with conn.cursor() as explain_cur:
+            if in_transaction:
+                explain_cur.execute(_SAVEPOINT)
+            try:
+                explain_cur.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                return "\n".join(row[0] for row in explain_cur.fetchall())
+            finally:
+                if in_transaction:
+                    explain_cur.execute(_ROLLBACK)
+    except Exception as e:
+        logger.warning("Could not capture the plan of a slow query: %s", e)
+        return None
+
+
+async def _explain_async(
+    cur, query: str, params: Optional[Sequence[Any]]
+) -> Optional[str]:
+    conn = cur.connection
+    in_transaction = conn.info.transaction_status == pq.TransactionStatus.INTRANS
+    try:
+        async with conn.cursor() as explain_cur:
+            if in_transaction:
+                await explain_cur.execute(_SAVEPOINT)
+            try:
+                await explain_cur.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                return "\n".join(row[0] for row in await explain_cur.fetchall())
+            finally:
+                if in_transaction:
+                    await explain_cur.execute(_ROLLBACK)
+    except Exception as e:
+        logger.warning("Could not capture the plan of a slow query: %s", e)
+        return None
+
+
+def statement_stats() -> list:
+    """
+    Returns per-statement totals (calls, rows, time), slowest in total first.
+    """
+    stats = []
+    for (digest,), snapshot in DB_STATEMENT_DURATION.snapshots().items():
+        calls, total = snapshot["count"], snapshot["sum"]
+        stats.append(
+            {
+                "fingerprint": digest,
+                "statement": STATEMENTS.get(digest),
+                "calls": calls,
+                "rows": DB_STATEMENT_ROWS.value(digest),
+                "total_seconds": total,
+                "mean_seconds": total / calls if calls else 0.0,
+            }
+        )
+    return sorted(stats, key=lambda row: row["total_seconds"], reverse=True)
@@ -0,0 +1,279 @@
+"""
+SQL shared by the sync (psycopg2) and async (psycopg 3) user repositories.
+
+Both drivers use ``%s`` placeholders, so the statements are written once here.
+"""
+
+from src.api.model.enum import UserIdentifier
+from src.api.utils.identifiers import normalize_phone
+
+# Users are written with ON CONFLICT DO NOTHING: a duplicate username or email
+# returns no row instead of raising, and the caller rolls back the transaction.
+INSERT_USER = """
+    INSERT INTO "user"
+    (username, email, first_name, last_name, phone_number, phone_e164,
+    address_id, role, status, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s, %s, NULL, %s, %s, %s, %s)
+    ON CONFLICT DO NOTHING
+    RETURNING id, username, email, first_name, last_name,
+            phone_number, address_id, role, status,
+            last_login_at, created_at, updated_at;
+"""
+
+# Address and user in one data-modifying CTE, returning the joined row.
+INSERT_USER_WITH_ADDRESS = """
+    WITH new_address AS (
+        INSERT INTO address (street, city, state, postal_code, country)
+        VALUES (%s, %s, %s, %s, %s)
+        RETURNING id, street, city, state, postal_code, country
+    ), new_user AS (
+        INSERT INTO "user"
+        (username, email, first_name, last_name, phone_number, phone_e164,
+        address_id, role, status, created_at, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, (SELECT id FROM new_address),
+                %s, %s, %s, %s)
+        ON CONFLICT DO NOTHING
+        RETURNING id, username, email, first_name, last_name,
+                phone_number, address_id, role, status,
+                last_login_at, created_at, updated_at
+    )
+    SELECT u.*, a.street, a.city, a.state, a.postal_code, a.country
+    FROM new_user u
+    JOIN new_address a ON a.id = u.address_id;
+"""
+
+# One round trip: the address columns ride along on the user row and are NULL
+# when the user has no address.
+SELECT_USER_BY_ID = """
+    SELECT u.id, u.username, u.email, u.first_name, u.last_name, u.phone_number,
+           u.address_id, u.role, u.status, u.last_login_at, u.created_at,
+           u.updated_at, a.street, a.city, a.state, a.postal_code, a.country
+    FROM "user" u
+    LEFT JOIN address a ON a.id = u.address_id
+    WHERE u.id = %s;
+"""
+
+
+# Multi-get: every requested user and its address in one round trip. Order
+# and missing ids are resolved by the caller.
+SELECT_USERS_BY_IDS = """
+    SELECT u.id, u.username, u.email, u.first_name, u.last_name, u.phone_number,
+           u.address_id, u.role, u.status, u.last_login_at, u.created_at,
+           u.updated_at, a.street, a.city, a.state, a.postal_code, a.country
+    FROM "user" u
+    LEFT JOIN address a ON a.id = u.address_id
+    WHERE u.id = ANY(%s);
+"""
+
+# Lookups by identifier, each served by an index: the unique username index,
+# lower(email) and phone_e164 (see docs/db.indexes.sql). Emails differing only
+# in case and shared phone numbers resolve to the oldest user.
+SELECT_USER_BY_USERNAME = """
+    SELECT u.id, u.username, u.email, u.first_name, u.last_name, u.phone_number,
+           u.address_id, u.role, u.status, u.last_login_at, u.created_at,
+           u.updated_at, a.street, a.city, a.state, a.postal_code, a.country
+    FROM "user" u
+    LEFT JOIN address a ON a.id = u.address_id
+    WHERE u.username = %s;
+"""
+
+SELECT_USER_BY_EMAIL = """
+    SELECT u.id, u.username, u.email, u.first_name, u.last_name, u.phone_number,
+           u.address_id, u.role, u.status, u.last_login_at, u.created_at,
+           u.updated_at, a.street, a.city, a.state, a.postal_code, a.country
+    FROM "user" u
+    LEFT JOIN address a ON a.id = u.address_id
+    WHERE lower(u.email) = %s
+    ORDER BY u.id
+    LIMIT 1;
+"""
+
+SELECT_USER_BY_PHONE = """
+    SELECT u.id, u.username, u.email, u.first_name, u.last_name, u.phone_number,
+           u.address_id, u.role, u.status, u.last_login_at, u.created_at,
+           u.updated_at, a.street, a.city, a.state, a.postal_code, a.country
+    FROM "user" u
+    LEFT JOIN address a ON a.id = u.address_id
+    WHERE u.phone_e164 = %s
+    ORDER BY u.id
+    LIMIT 1;
+"""
+
+SELECT_USER_BY_IDENTIFIER = {
+    UserIdentifier.USERNAME: SELECT_USER_BY_USERNAME,
+    UserIdentifier.EMAIL: SELECT_USER_BY_EMAIL,
+    UserIdentifier.PHONE: SELECT_USER_BY_PHONE,
+}
+
+# Full table scan in id order, read through a named (server-side) cursor.
+SELECT_ALL_USERS = """
+    SELECT u.id, u.username, u.email, u.first_name, u.last_name, u.phone_number,
+           u.address_id, u.role, u.status, u.last_login_at, u.created_at,
+           u.updated_at, a.street, a.city, a.state, a.postal_code, a.country
+    FROM "user" u
+    LEFT JOIN address a ON a.id = u.address_id
+    ORDER BY u.id;
+"""
+
+# Every taken username and email, streamed through a named cursor to build
+# the availability Bloom filter.
+SELECT_USER_IDENTITIES = """
+    SELECT username, email FROM "user";
+"""
+
+# Confirms a possibly taken username and email with the unique indexes on
+# both columns; a NULL argument is never taken.
+SELECT_TAKEN = """
+    SELECT EXISTS (SELECT 1 FROM "user" WHERE username = %s),
+           EXISTS (SELECT 1 FROM "user" WHERE email = %s);
+"""
+
+# Keyset pagination over (created_at, id). ``{where}`` is filled in by
+# select_users_page() from a fixed set of conditions, each of which is served
+# by one of the indexes in docs/db.indexes.sql, so a page costs the same at
+# any depth.
+SELECT_USERS_PAGE = """
+    SELECT u.id, u.username, u.email, u.first_name, u.last_name, u.phone_number,
+           u.address_id, u.role, u.status, u.last_login_at, u.created_at,
+           u.updated_at, a.street, a.city, a.state, a.postal_code, a.country
+    FROM "user" u
+    LEFT JOIN address a ON a.id = u.address_id
+    {where}
+    ORDER BY u.created_at, u.id
+    LIMIT %s;
+"""
+
+# Batch registration. Ids are drawn from the serial sequences up front so
+# every input row knows its user and address id before anything is written;
+# rows are then inserted from parallel arrays with unnest(), one statement per
+# table regardless of batch size.
+ALLOCATE_IDS = """
+    SELECT
+        ARRAY(SELECT nextval(pg_get_serial_sequence('"user"', 'id'))
+              FROM generate_series(1, %s)) AS user_ids,
+        ARRAY(SELECT nextval(pg_get_serial_sequence('address', 'id'))
+              FROM generate_series(1, %s)) AS address_ids;
+"""
+
+INSERT_ADDRESSES = """
+    INSERT INTO address (id, street, city, state, postal_code, country)
+    SELECT * FROM unnest(
+        %s::int[], %s::varchar[], %s::varchar[], %s::varchar[],
+        %s::varchar[], %s::varchar[]
+    );
+"""
+
+INSERT_USERS = """
+    INSERT INTO "user"
+    (id, username, email, first_name, last_name, phone_number, phone_e164,
+    address_id, role, status, created_at, updated_at)
+    SELECT * FROM unnest(
+        %s::int[], %s::varchar[], %s::varchar[], %s::varchar[], %s::varchar[],
+        %s::varchar[], %s::varchar[], %s::int[], %s::varchar[], %s::varchar[],
+        %s::timestamp[], %s::timestamp[]
+    )
+    ON CONFLICT DO NOTHING
+    RETURNING id, username, email, first_name, last_name,
+            phone_number, address_id, role, status,
+            last_login_at, created_at, updated_at;
+"""
+
+DELETE_ADDRESSES = """
+    DELETE FROM address WHERE id = ANY(%s);
+"""
+
+
+def insert_user(user) -> tuple:
+    """Returns the insert statement and parameters for a user and its address."""
+    params = (
+        user.username,
+        user.email,
+        user.first_name,
+        user.last_name,
+        user.phone_number,
+        normalize_phone(user.phone_number),
+        user.role.value,
+        user.status.value,
+        user.created_at,
+        user.updated_at,
+    )
+    if user.address is None:
+        return INSERT_USER, params
+    address = user.address
+    return INSERT_USER_WITH_ADDRESS, (
+        address.street,
+        address.city,
+        address.state,
+        address.postal_code,
+        address.country,
+        *params,
+    )
+
+
+def insert_addresses(users, address_ids) -> tuple:
+    """Column arrays for INSERT_ADDRESSES, for the users that have an address."""
+    addresses = [user.address for user in users if user.address is not None]
+    return (
+        list(address_ids),
+        [address.street for address in addresses],
+        [address.city for address in addresses],
+        [address.state for address in addresses],
+        [address.postal_code for address in addresses],
+        [address.country for address in addresses],
+    )
+
+
+def align_address_ids(users, address_ids) -> list:
+    """
+    Spreads ``address_ids`` (one per user with an address, in input order)
+    over all users, with None for users without an address.
+    """
+    remaining = iter(address_ids)
+    return [None if user.address is None else next(remaining) for user in users]
+
+
+def insert_users(users, user_ids, user_address_ids) -> tuple:
+    """Column arrays for INSERT_USERS."""
+    return (
+        list(user_ids),
+        [user.username for user in users],
+        [user.email for user in users],
+        [user.first_name for user in users],
+        [user.last_name for user in users],
+        [user.phone_number for user in users],
+        [normalize_phone(user.phone_number) for user in users],
+        list(user_address_ids),
+        [user.role.value for user in users],
+        [user.status.value for user in users],
+        [user.created_at for user in users],
+        [user.updated_at for user in users],
+    )
+
+
+def select_users_page(
+    limit, role=None, status=None, created_from=None, created_to=None, after=None
+) -> tuple:
+    """
+    Returns the statement and parameters for one page of users.
+
+    ``created_from`` is inclusive and ``created_to`` exclusive; ``after`` is
+    the ``(created_at, id)`` of the last row of the previous page.
+    """
+    conditions, params = [], []
+    if role is not None:
+        conditions.append("u.role = %s")
+        params.append(role.value)
+    if status is not None:
+        conditions.append("u.status = %s")
+        params.append(status.value)
+    if created_from is not None:
+        conditions.append("u.created_at >= %s")
+        params.append(created_from)
+    if created_to is not None:
+        conditions.append("u.created_at < %s")
+        params.append(created_to)
+    if after is not None:
+        conditions.append("(u.created_at, u.id) > (%s, %s)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return SELECT_USERS_PAGE.format(where=where), (*params, limit)
@@ -1,13 +1,77 @@
+import asyncio
+import time
+from typing import Callable, Dict, Optional, Union
+
+from src.api.cache import CacheBackend
 from src.api.model.schemas import HealthCheckResponse
-from src.api.repository import user_repository
+from src.api.repository.async_user_repository import AsyncUserRepository
 from src.api.repository.user_repository import UserRepository
+from src.api.utils.concurrency import run_off_loop
 
 
 class HealthService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: Union[UserRepository, AsyncUserRepository],
+        cache: Optional[CacheBackend] = None,
+        pool_stats: Optional[Callable[[], dict]] = None,
+        ready_ttl: float = 0.0,
+        probe_timeout: Optional[float] = None,
+        pool_max_waiters: int = 0,
+    ):
+        """
+        Args:
+            user_repository: Repository whose database connection is probed.
+            cache: User cache backend to probe, if any.
+            pool_stats: Returns the connection pool counters (see
+                DatabasePool.stats); readiness reports them and fails while
+                the pool is saturated.
+            ready_ttl: Seconds a readiness result is reused (0 disables).
+            probe_timeout: Seconds each dependency probe may take, or None
+                to wait indefinitely.
+            pool_max_waiters: Callers allowed to queue on a fully used pool
+                before the service reports not ready.
+        """
         self.user_repository = user_repository
+        self.cache = cache
+        self.pool_stats = pool_stats
+        self.ready_ttl = ready_ttl
+        self.probe_timeout = probe_timeout
+        self.pool_max_waiters = pool_max_waiters
+        self._ready: Optional[HealthCheckResponse] = None
+        self._ready_until = 0.0
+        self._ready_lock = asyncio.Lock()
+
+    async def check_liveness(self) -> HealthCheckResponse:
+        """
+        Reports that the process is up and serving requests. Does no I/O, so
+        a failing dependency never gets a healthy pod restarted.
+        """
+        return HealthCheckResponse(status="Healthy")
+
+    async def check_readiness(self) -> HealthCheckResponse:
+        """
+        Checks whether the service can take traffic: every dependency answers
+        within the probe timeout and the connection pool is not saturated.
+
+        Dependencies are probed concurrently. The result is reused for
+        ``ready_ttl`` seconds and concurrent callers share a single round of
+        probes, so frequent probes hold at most one pooled connection at a
+        time per process.
 
-    def check_health(self):
+        :return: The overall status ("Healthy" or "Unhealthy"), the status of
+            each dependency and, when available, the pool figures.
+        :rtype: HealthCheckResponse
+        """
+        if self._ready is not None and time.monotonic() < self._ready_until:
+            return self._ready
+        async with self._ready_lock:
+            if self._ready is None or time.monotonic() >= self._ready_until:
+                self._ready = await self._probe_dependencies()
+                self._ready_until = time.monotonic() + self.ready_ttl
+            return self._ready
+
+    async def check_health(self) -> HealthCheckResponse:
         """
         Checks the health of the User Service, by attempting to connect to
         the configured database.
@@ -17,14 +81,50 @@ class HealthService:
 
         A "Healthy" status indicates that all dependencies are connected
         and available. An "Unhealthy" status means that one or more
-        dependencies are not available.
+        dependencies are not available. Results are shared with
+        :meth:`check_readiness`.
         """
-        response = HealthCheckResponse(status="Healthy")
-        dependencies = {
-            "database": self.user_repository.check_db_connection(),
+        return await self.check_readiness()
+
+    async def _probe_dependencies(self) -> HealthCheckResponse:
+        checks: Dict[str, Callable] = {
+            "database": self.user_repository.check_db_connection
         }
-        for name, status in dependencies.items():
+        if self.cache is not None:
+            checks["cache"] = self.cache.check_connection
+        results = await asyncio.gather(
+            *(self._probe(check) for check in checks.values())
+        )
+
+        response = HealthCheckResponse(status="Healthy")
+        for name, status in zip(checks, results):
             if status != "Connected":
                 response.status = "Unhealthy"
             response.add_detail(name, status)
+        pool = self.pool_stats() if self.pool_stats is not None else {}
+        if pool:
+            saturated = (
+                pool["in_use"] >= pool["max_size"]
+                and pool["waiters"] > self.pool_max_waiters
+            )
+            if saturated:
+                response.status = "Unhealthy"
+            response.add_detail(
+                "pool",
+                {
+                    "max_size": pool["max_size"],
+                    "in_use": pool["in_use"],
+                    "waiters": pool["waiters"],
+                    "utilization": round(pool["in_use"] / pool["max_size"], 3),
+                    "saturated": saturated,
+                },
+            )
         return response
+
+    async def _probe(self, check: Callable) -> str:
+        try:
+            return await asyncio.wait_for(run_off_loop(check), self.probe_timeout)
+        except asyncio.TimeoutError:
+            return f"Timed out after {self.probe_timeout}s"
+        except Exception as e:
+            return f"Failed: {str(e)}"
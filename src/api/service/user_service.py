@@ -1,12 +1,62 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
 from fastapi import HTTPException, status
 
+from src.api.cache import CacheBackend, CacheEntry, UserAvailabilityFilter
 from src.api.model.domain import User
+from src.api.model.enum import UserIdentifier, UserRole, UserStatus
+from src.api.repository.async_user_repository import AsyncUserRepository
 from src.api.repository.user_repository import UserRepository
+from src.api.utils.concurrency import iterate_off_loop, run_off_loop
+from src.api.utils.identifiers import normalize_email, normalize_phone
+from src.api.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 
 class UserService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: Union[UserRepository, AsyncUserRepository],
+        cache: Optional[CacheBackend] = None,
+        stale_while_revalidate: float = 0.0,
+        stale_if_error: float = 0.0,
+        availability_filter: Optional[UserAvailabilityFilter] = None,
+    ):
         self.user_repository = user_repository
+        # Read-through cache of users by id; None disables caching
+        self.cache = cache
+        # Seconds past freshness a cached user is served while it is
+        # refreshed in the background, and while the database is failing
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        # Concurrent get_user calls for the same id share one query
+        self._user_loads = SingleFlight()
+        self._refreshes = set()
+        # Bloom filter of taken usernames and emails; None disables it
+        self.availability_filter = availability_filter
+
+    @staticmethod
+    def _cache_key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    async def _invalidate(self, *user_ids: int) -> None:
+        """Drops users from the read cache after they have been written."""
+        if self.cache is not None and user_ids:
+            await self.cache.delete(*map(self._cache_key, user_ids))
 
     async def register_user(self, user: User) -> User:
         """
@@ -19,25 +69,159 @@ class UserService:
             User: The registered user.
 
         Raises:
-            HTTPException: If the user cannot be registered (500).
+            HTTPException: If the user already exists (409) or cannot be
+                registered (500).
         """
 
         try:
-            saved_user = self.user_repository.save(user)
+            saved_user = await run_off_loop(self.user_repository.save, user)
             if not saved_user:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Failed to create user",
                 )
+            await self._invalidate(saved_user.id)
             return saved_user
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
 
+    async def register_users(self, users: List[User]) -> List[Optional[User]]:
+        """
+        Registers a batch of users in one transaction.
+
+        Args:
+            users (List[User]): The users to register.
+
+        Returns:
+            List[Optional[User]]: One entry per input user, in order: the
+                registered user, or None if its username or email was taken.
+
+        Raises:
+            HTTPException: If the batch cannot be registered (500).
+        """
+        try:
+            saved_users = await run_off_loop(self.user_repository.save_many, users)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+            )
+        await self._invalidate(*(user.id for user in saved_users if user))
+        return saved_users
+
+    async def get_users(self, user_ids: List[int]) -> Tuple[List[User], List[int]]:
+        """
+        Fetch several users by ID: one cache round trip, then one repository
+        call for the IDs that were not cached.
+
+        Args:
+            user_ids (List[int]): The IDs to fetch; duplicates are ignored.
+
+        Returns:
+            Tuple[List[User], List[int]]: The users found, in the order their
+                IDs were requested, and the requested IDs that do not exist.
+
+        Raises:
+            HTTPException: If the users cannot be fetched (500).
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+        by_id = {}
+        if self.cache is not None:
+            cached_users = await self.cache.get_many(
+                [self._cache_key(user_id) for user_id in unique_ids]
+            )
+            by_id = {user.id: user for user in cached_users if user is not None}
+
+        uncached_ids = [user_id for user_id in unique_ids if user_id not in by_id]
+        if uncached_ids:
+            try:
+                users = await run_off_loop(self.user_repository.get_users, uncached_ids)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Error fetching users: {str(e)}",
+                )
+            by_id.update((user.id, user) for user in users)
+            if self.cache is not None and users:
+                await self.cache.set_many(
+                    {self._cache_key(user.id): user for user in users}
+                )
+        found = [by_id[user_id] for user_id in unique_ids if user_id in by_id]
+        missing = [user_id for user_id in unique_ids if user_id not in by_id]
+        return found, missing
+
+    async def list_users(
+        self,
+        limit: int,
+        role: Optional[UserRole] = None,
+        user_status: Optional[UserStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> Tuple[List[User], Optional[Tuple[datetime, int]]]:
+        """
+        Fetch one page of users ordered by (created_at, id).
+
+        One extra row is requested to find out whether another page follows
+        without a separate count query.
+
+        Args:
+            limit (int): Page size.
+            role (Optional[UserRole]): Only users with this role.
+            user_status (Optional[UserStatus]): Only users with this status.
+            created_from (Optional[datetime]): Created at or after this time.
+            created_to (Optional[datetime]): Created before this time.
+            after (Optional[Tuple[datetime, int]]): Position to continue after.
+
+        Returns:
+            Tuple[List[User], Optional[Tuple[datetime, int]]]: The page and the
+                (created_at, id) to continue after, or None on the last page.
+
+        Raises:
+            HTTPException: If the users cannot be fetched (500).
+        """
+        try:
+            users = await run_off_loop(
+                self.user_repository.list_users,
+                limit + 1,
+                role=role,
+                user_status=user_status,
+                created_from=created_from,
+                created_to=created_to,
+                after=after,
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error fetching users: {str(e)}",
+            )
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        return users, (users[-1].created_at, users[-1].id)
+
+    def export_users(
+        self, batch_size: int
+    ) -> Union[Iterator[List[User]], AsyncIterator[List[User]]]:
+        """
+        Streams all users in batches from the repository.
+
+        Args:
+            batch_size (int): Number of users per batch.
+
+        Returns:
+            An iterator (sync repository) or async iterator (async repository)
+            of user batches; see ``iterate_off_loop`` to consume either.
+        """
+        return self.user_repository.iter_users(batch_size)
+
     async def get_user(self, user_id: int) -> User:
         """
-        Fetch a user by their ID.
+        Fetch a user by their ID, from the read cache when possible.
+        Concurrent calls for an id that is not cached share one query.
 
         Args:
             user_id (int): The ID of the user to fetch.
@@ -46,13 +230,242 @@ class UserService:
             User: The user with the given ID.
 
         Raises:
-            HTTPException: If the user cannot be found (404).
+            HTTPException: If the user cannot be fetched (500).
+        """
+        user, _ = await self.get_user_entry(user_id)
+        return user
+
+    async def get_user_entry(self, user_id: int) -> Tuple[Optional[User], bool]:
+        """
+        Fetch a user by their ID and report whether it came from a stale
+        cache entry.
+
+        A stale entry is returned at once, and refreshed in the background,
+        for up to ``stale_while_revalidate`` seconds after it stopped being
+        fresh. Past that it is only returned if reading the database fails,
+        for up to ``stale_if_error`` seconds.
+
+        Args:
+            user_id (int): The ID of the user to fetch.
+
+        Returns:
+            Tuple[Optional[User], bool]: The user (None if it does not
+                exist) and whether it is stale.
+
+        Raises:
+            HTTPException: If the user cannot be fetched and no usable stale
+                copy is cached (500).
+        """
+        return await self._get_entry(
+            self._cache_key(user_id), lambda: self._load_user(user_id)
+        )
+
+    async def get_user_entry_by(
+        self, identifier: UserIdentifier, value: str
+    ) -> Tuple[Optional[User], bool]:
+        """
+        Fetch a user by username, email (case-insensitive) or phone number
+        (any format that normalizes to E.164), with the same cache,
+        single-flight and stale handling as ``get_user_entry``.
+
+        Users found this way are cached under the identifier and under their
+        ID, so a following lookup by ID is a cache hit too.
+
+        Args:
+            identifier (UserIdentifier): Which identifier ``value`` is.
+            value (str): The username, email or phone number.
+
+        Returns:
+            Tuple[Optional[User], bool]: The user (None if it does not
+                exist) and whether it is stale.
+
+        Raises:
+            HTTPException: If the user cannot be fetched and no usable stale
+                copy is cached (500).
         """
+        if identifier is UserIdentifier.EMAIL:
+            value = normalize_email(value)
+        elif identifier is UserIdentifier.PHONE:
+            value = normalize_phone(value)
+            if value is None:
+                return None, False
+        key = f"user:{identifier.value}:{value}"
+        return await self._get_entry(
+            key, lambda: self._load_user_by(key, identifier, value)
+        )
+
+    async def _get_entry(
+        self, key: str, load: Callable[[], Awaitable[Optional[User]]]
+    ) -> Tuple[Optional[User], bool]:
+        """
+        Reads ``key`` from the cache, or through ``load`` (one call shared by
+        concurrent readers of the key), serving stale entries as described in
+        ``get_user_entry``.
+        """
+        entry: Optional[CacheEntry] = None
+        if self.cache is not None:
+            entry = await self.cache.get_entry(key)
+            if entry is not None and not entry.stale_for:
+                return entry.value, False
+            if entry is not None and entry.stale_for <= self.stale_while_revalidate:
+                self._refresh_in_background(key, load)
+                return entry.value, True
+        try:
+            user = await self._user_loads.do(key, load)
+        except HTTPException:
+            if entry is not None and entry.stale_for <= self.stale_if_error:
+                return entry.value, True
+            raise
+        return user, False
+
+    def _refresh_in_background(
+        self, key: str, load: Callable[[], Awaitable[Optional[User]]]
+    ) -> None:
+        """Reloads a cache entry without waiting for the result."""
+        refresh = asyncio.ensure_future(self._user_loads.do(key, load))
+        # Keep a reference until it finishes
+        self._refreshes.add(refresh)
+        refresh.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, refresh: asyncio.Future) -> None:
+        self._refreshes.discard(refresh)
+        # A failed refresh is retried by the next read; only mark the
+        # exception as retrieved
+        if not refresh.cancelled():
+            refresh.exception()
+
+    async def _load_user(self, user_id: int) -> Optional[User]:
+        """Reads a user from the repository and stores it in the cache."""
         try:
-            user = self.user_repository.get_user(user_id)
-            return user
+            user = await run_off_loop(self.user_repository.get_user, user_id)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error fetching user: {str(e)}",
             )
+        # Only existing users are cached, so a new id is never served as missing
+        if user is not None and self.cache is not None:
+            await self.cache.set(self._cache_key(user_id), user)
+        return user
+
+    async def _load_user_by(
+        self, key: str, identifier: UserIdentifier, value: str
+    ) -> Optional[User]:
+        """
+        Reads a user by identifier from the repository and caches it under
+        ``key`` and under its ID.
+        """
+        try:
+            user = await run_off_loop(
+                self.user_repository.get_user_by, identifier, value
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error fetching user: {str(e)}",
+            )
+        if user is not None and self.cache is not None:
+            await self.cache.set_many({key: user, self._cache_key(user.id): user})
+        return user
+
+    async def check_availability(
+        self, username: Optional[str], email: Optional[str]
+    ) -> Tuple[Optional[bool], Optional[bool]]:
+        """
+        Checks whether a username and an email are still free.
+
+        Values the availability filter has never seen are reported free
+        without a query; the rest (all of them, without a loaded filter)
+        are confirmed with one indexed lookup. The filter is per process and
+        only rebuilt periodically, so a value taken through another process
+        since the last rebuild can be reported free: the answer is a hint,
+        and registration still enforces uniqueness.
+
+        Args:
+            username (Optional[str]): The username to check, if any.
+            email (Optional[str]): The email to check, if any.
+
+        Returns:
+            Tuple[Optional[bool], Optional[bool]]: Whether the username and
+                the email are available; None for a value not asked about.
+
+        Raises:
+            HTTPException: If the database cannot be queried (500).
+        """
+        if self.availability_filter is not None:
+            check_username, check_email = self.availability_filter.might_be_taken(
+                username, email
+            )
+        else:
+            check_username, check_email = username is not None, email is not None
+
+        username_taken = email_taken = False
+        if check_username or check_email:
+            try:
+                username_taken, email_taken = await run_off_loop(
+                    self.user_repository.find_taken,
+                    username if check_username else None,
+                    email if check_email else None,
+                )
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Error checking availability: {str(e)}",
+                )
+        return (
+            None if username is None else not username_taken,
+            None if email is None else not email_taken,
+        )
+
+    async def load_availability_filter(self, batch_size: int) -> None:
+        """
+        Rebuilds the availability filter from the user table: every existing
+        username and email is streamed into a new filter, which then replaces
+        the current one and marks it as loaded. Users saved meanwhile are
+        added to both, so none are missed.
+
+        Args:
+            batch_size (int): Rows fetched from the server per round trip.
+        """
+        availability_filter = self.availability_filter
+        if availability_filter is None:
+            return
+        started = time.perf_counter()
+        availability_filter.start_rebuild()
+        try:
+            batches = self.user_repository.iter_identities(batch_size)
+            async for rows in iterate_off_loop(batches):
+                for username, email in rows:
+                    availability_filter.add_rebuilt(username, email)
+        except Exception as e:
+            # Keep the current filter; if it was never loaded, every check
+            # keeps going to the database
+            availability_filter.abort_rebuild()
+            logger.warning("Could not load the availability filter: %s", e)
+            return
+        availability_filter.finish_rebuild()
+        logger.info(
+            "Availability filter loaded in %.1fs: %s",
+            time.perf_counter() - started,
+            availability_filter.stats(),
+        )
+
+    async def refresh_availability_filter(
+        self, batch_size: int, interval: float
+    ) -> None:
+        """
+        Loads the availability filter, then rebuilds it every ``interval``
+        seconds so it picks up users created by other processes. Runs until
+        cancelled; with an ``interval`` of 0 it loads the filter once.
+
+        Args:
+            batch_size (int): Rows fetched from the server per round trip.
+            interval (float): Seconds between rebuilds.
+        """
+        while True:
+            await self.load_availability_filter(batch_size)
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
@@ -0,0 +1,51 @@
+import inspect
+from typing import Any, AsyncIterator, Callable, Iterable, Union
+
+import anyio
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+
+async def maybe_await(value: Any) -> Any:
+    """
+    Awaits ``value`` if it is awaitable, otherwise returns it unchanged.
+
+    Lets the service layer call either UserRepository (sync) or
+    AsyncUserRepository (async) through the same code path.
+    """
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def run_off_loop(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    Awaits ``func`` directly when it is a coroutine function, otherwise runs it
+    in the threadpool so blocking I/O never runs on the event loop.
+    """
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+async def iterate_off_loop(iterable: Union[Iterable, AsyncIterator]) -> AsyncIterator:
+    """
+    Iterates either an async iterator or a blocking iterator; each step of a
+    blocking iterator runs in the threadpool.
+
+    The source is always closed when iteration stops, including on client
+    disconnects, so generators holding a pooled connection release it
+    promptly instead of at garbage collection.
+    """
+    try:
+        if hasattr(iterable, "__aiter__"):
+            async for item in iterable:
+                yield item
+        else:
+            async for item in iterate_in_threadpool(iterable):
+                yield item
+    finally:
+        with anyio.CancelScope(shield=True):
+            if hasattr(iterable, "aclose"):
+                await iterable.aclose()
+            elif hasattr(iterable, "close"):
+                await run_in_threadpool(iterable.close)
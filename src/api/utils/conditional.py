@@ -0,0 +1,30 @@
+import hashlib
+from typing import Any, Optional
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Builds a strong entity tag from the values that identify a
+    representation's version, e.g. a user's id and updated_at.
+
+    :return: The quoted ETag header value.
+    """
+    version = ":".join(str(part) for part in parts).encode()
+    return f'"{hashlib.blake2b(version, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluates an If-None-Match header against the current ETag, using the weak
+    comparison RFC 9110 prescribes for If-None-Match.
+
+    :param if_none_match: The raw header value, if any.
+    :param etag: The current ETag, quoted.
+    :return: True if the client's copy is current and a 304 can be sent.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in candidates)
@@ -0,0 +1,60 @@
+import re
+from functools import lru_cache
+from typing import Optional
+
+from src.api.config import settings
+
+# Formatting characters people put in phone numbers
+_PHONE_SEPARATORS = re.compile(r"[\s.\-()/]")
+
+
+def normalize_email(email: str) -> str:
+    """
+    Returns the form emails are compared in: trimmed and lower-cased, as in
+    the ``lower(email)`` index.
+    """
+    return _normalize_email(email)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """
+    Returns a phone number in E.164 form (``+`` and up to 15 digits), or None
+    if it cannot be read as one.
+
+    Numbers written with ``+`` or the ``00`` international prefix are taken
+    as they are. National numbers lose one leading trunk ``0`` and get
+    settings.USER_PHONE_DEFAULT_COUNTRY_CODE. Spaces, dots, dashes, slashes
+    and parentheses are ignored. Results are cached, so repeated lookups of
+    the same number skip the parsing.
+
+    :param phone: The phone number as entered.
+    :return: The E.164 number, or None.
+    :rtype: Optional[str]
+    """
+    if not phone:
+        return None
+    return _normalize_phone(phone, settings.USER_PHONE_DEFAULT_COUNTRY_CODE)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_phone(phone: str, default_country_code: str) -> Optional[str]:
+    number = _PHONE_SEPARATORS.sub("", phone)
+    if number.startswith("+"):
+        digits = number[1:]
+    elif number.startswith("00"):
+        digits = number[2:]
+    else:
+        if number.startswith("0"):
+            number = number[1:]
+        digits = default_country_code + number
+    # Country codes never start with 0; E.164 allows at most 15 digits
+    if not (digits.isascii() and digits.isdigit()) or digits[0] == "0":
+        return None
+    if not 8 <= len(digits) <= 15:
+        return None
+    return f"+{digits}"
@@ -0,0 +1,464 @@
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds (seconds) of the request and query latency histograms
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(v))}"' for name, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _header(name: str, kind: str, documentation: str) -> List[str]:
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+
+
+class _Metric:
+    """
+    Base of the recorded metrics.
+
+    Every thread records into its own shard (a dict of label values to
+    series), so the hot path takes no lock and threads never contend; shards
+    are only merged when the metric is rendered. Under the GIL a scrape may
+    see an observation half-applied (count bumped, sum not yet), which is
+    harmless for monitoring.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def _merged(self) -> Dict[Labels, List]:
+        with self._lock:
+            shards = list(self._shards)
+        merged: Dict[Labels, List] = {}
+        for shard in shards:
+            for labels, series in list(shard.items()):
+                total = merged.get(labels)
+                if total is None:
+                    merged[labels] = list(series)
+                else:
+                    for index, value in enumerate(series):
+                        total[index] += value
+        return merged
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            series = shard[labels] = [0]
+        series[0] += amount
+
+    def value(self, *labels: str) -> float:
+        return self._merged().get(labels, [0])[0]
+
+    def render(self) -> List[str]:
+        lines = _header(self.name, self.kind, self.documentation)
+        for labels, (value,) in sorted(self._merged().items()):
+            lines.append(
+                f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            )
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # One count per bucket plus +Inf, then the sum
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def _snapshot(self, series: List) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, count in zip((*self.buckets, "+Inf"), series):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {"buckets": buckets, "count": cumulative, "sum": series[-1]}
+
+    def snapshot(self, *labels: str) -> dict:
+        """
+        Returns the series for ``labels`` as cumulative bucket counts keyed by
+        upper bound, with the count and sum (the shape of the pool wait stats).
+        """
+        series = self._merged().get(labels)
+        if series is None:
+            series = [0] * (len(self.buckets) + 1) + [0.0]
+        return self._snapshot(series)
+
+    def snapshots(self) -> Dict[Labels, dict]:
+        """Returns the snapshot of every series, keyed by label values."""
+        return {
+            labels: self._snapshot(series) for labels, series in self._merged().items()
+        }
+
+    def render(self) -> List[str]:
+        lines = _header(self.name, self.kind, self.documentation)
+        for labels, series in sorted(self._merged().items()):
+            lines.extend(
+                histogram_samples(
+                    self.name, self._snapshot(series), self.labelnames, labels
+                )
+            )
+        return lines
+
+
+def histogram_samples(
+    name: str,
+    snapshot: dict,
+    labelnames: Sequence[str] = (),
+    labels: Sequence[str] = (),
+) -> List[str]:
+    """Renders a histogram snapshot (see Histogram.snapshot) as samples."""
+    lines = [
+        f"{name}_bucket{_labels(labelnames, labels, le=bound)} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_count{_labels(labelnames, labels)} {snapshot['count']}")
+    lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(snapshot['sum'])}")
+    return lines
+
+
+def collected(
+    name: str,
+    kind: str,
+    documentation: str,
+    samples: Iterable[Tuple[Dict[str, str], float]],
+) -> List[str]:
+    """Renders values read at scrape time, given as (labels, value) pairs."""
+    lines = _header(name, kind, documentation)
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labels, labels.values())} {_number(value)}")
+    return lines
+
+
+def pool_metrics(stats: dict) -> List[str]:
+    """
+    Renders connection pool stats (see DatabasePool.stats): connections by
+    state, saturation, waiters, checkout failures and the checkout wait-time
+    histogram. Nothing is rendered before the pool is created.
+    """
+    if not stats:
+        return []
+    lines = collected(
+        "db_pool_connections",
+        "gauge",
+        "Pooled connections by state.",
+        [({"state": "in_use"}, stats["in_use"]), ({"state": "idle"}, stats["idle"])],
+    )
+    lines += collected(
+        "db_pool_max_connections",
+        "gauge",
+        "Connections the pool may open.",
+        [({}, stats["max_size"])],
+    )
+    lines += collected(
+        "db_pool_saturation_ratio",
+        "gauge",
+        "Share of the pool's connections checked out.",
+        [({}, stats["in_use"] / stats["max_size"])],
+    )
+    lines += collected(
+        "db_pool_waiters",
+        "gauge",
+        "Callers queued for a connection.",
+        [({}, stats["waiters"])],
+    )
+    lines += collected(
+        "db_pool_checkout_failures_total",
+        "counter",
+        "Checkouts that timed out or were rejected by a full wait queue.",
+        [
+            ({"reason": "timeout"}, stats["timeouts"]),
+            ({"reason": "rejected"}, stats.get("rejected", 0)),
+        ],
+    )
+    if "wait_seconds" in stats:
+        name = "db_pool_wait_seconds"
+        lines += _header(name, "histogram", "Time callers waited for a connection.")
+        lines += histogram_samples(name, stats["wait_seconds"])
+    return lines
+
+
+def cache_metrics(cache: str, stats: Optional[dict]) -> List[str]:
+    """
+    Renders the counters of a cache backend (see CacheBackend.stats) and its
+    hit ratio: the share of reads answered from the cache, fresh or stale.
+    """
+    if stats is None:
+        return []
+    hits, stale_hits, misses = stats["hits"], stats["stale_hits"], stats["misses"]
+    reads = hits + stale_hits + misses
+    lines = collected(
+        "cache_reads_total",
+        "counter",
+        "Cache reads by result.",
+        [
+            ({"cache": cache, "result": "hit"}, hits),
+            ({"cache": cache, "result": "stale_hit"}, stale_hits),
+            ({"cache": cache, "result": "miss"}, misses),
+        ],
+    )
+    lines += collected(
+        "cache_hit_ratio",
+        "gauge",
+        "Share of cache reads answered from the cache, fresh or stale.",
+        [({"cache": cache}, (hits + stale_hits) / reads if reads else 0.0)],
+    )
+    for key, documentation in (
+        ("evictions", "Entries evicted to make room."),
+        ("errors", "Cache server errors."),
+    ):
+        if key in stats:
+            lines += collected(
+                f"cache_{key}_total",
+                "counter",
+                documentation,
+                [({"cache": cache}, stats[key])],
+            )
+    return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> List[str]:
+        """Returns the exposition lines of every registered metric."""
+        return [line for metric in self._metrics for line in metric.render()]
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time to serve HTTP requests, by route template.",
+        ("method", "route"),
+    )
+)
+HTTP_RESPONSES = REGISTRY.register(
+    Counter(
+        "http_responses_total",
+        "HTTP responses sent, by route template and status code.",
+        ("method", "route", "status"),
+    )
+)
+DB_QUERY_DURATION = REGISTRY.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Time spent in repository methods, including the connection checkout.",
+        ("repository", "method"),
+        buckets=QUERY_BUCKETS,
+    )
+)
+DB_QUERY_ERRORS = REGISTRY.register(
+    Counter(
+        "db_query_errors_total",
+        "Repository calls that failed with a server error.",
+        ("repository", "method"),
+    )
+)
+
+
+def _is_error(error: Exception) -> bool:
+    # Conflicts and other client errors raised by repositories are expected
+    return getattr(error, "status_code", 500) >= 500
+
+
+def instrument_query(func: Callable) -> Callable:
+    """
+    Records the latency and server errors of a repository method in
+    DB_QUERY_DURATION and DB_QUERY_ERRORS, labelled by class and method name.
+
+    Works on plain and async methods and on (async) generators; for
+    generators the time spent producing every item is summed and recorded
+    once, when iteration stops, so consumer time is not counted.
+    """
+    repository, _, method = func.__qualname__.rpartition(".")
+    labels = (repository, method)
+
+    if inspect.isasyncgenfunction(func):
+
+        @functools.wraps(func)
+        async def async_gen_wrapper(*args, **kwargs):
+            source, elapsed = func(*args, **kwargs), 0.0
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = await source.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        elapsed += time.perf_counter() - start
+                    yield item
+            except Exception as e:
+                if _is_error(e):
+                    DB_QUERY_ERRORS.inc(*labels)
+                raise
+            finally:
+                await source.aclose()
+                DB_QUERY_DURATION.observe(elapsed, *labels)
+
+        return async_gen_wrapper
+
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def gen_wrapper(*args, **kwargs):
+            source, elapsed = func(*args, **kwargs), 0.0
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = next(source)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += time.perf_counter() - start
+                    yield item
+            except Exception as e:
+                if _is_error(e):
+                    DB_QUERY_ERRORS.inc(*labels)
+                raise
+            finally:
+                source.close()
+                DB_QUERY_DURATION.observe(elapsed, *labels)
+
+        return gen_wrapper
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if _is_error(e):
+                    DB_QUERY_ERRORS.inc(*labels)
+                raise
+            finally:
+                DB_QUERY_DURATION.observe(time.perf_counter() - start, *labels)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if _is_error(e):
+                DB_QUERY_ERRORS.inc(*labels)
+            raise
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - start, *labels)
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording HTTP_REQUEST_DURATION and HTTP_RESPONSES.
+
+    Requests are labelled with the route template (``/api/v1/user/{id}``)
+    rather than the path, so label cardinality stays bounded; requests that
+    match no route are labelled "unmatched". The duration covers the whole
+    response, including streamed bodies.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._routes: Optional[Dict[Callable, str]] = None
+
+    def _route(self, scope: Scope) -> str:
+        if self._routes is None:
+            self._routes = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._routes.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            method, route = scope["method"], self._route(scope)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method, route)
+            HTTP_RESPONSES.inc(method, route, str(status_code))
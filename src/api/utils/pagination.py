@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+Key = Tuple[datetime, int]
+
+
+def encode_cursor(key: Key) -> str:
+    """
+    Encodes a keyset position as an opaque, URL-safe cursor.
+
+    :param key: The (created_at, id) of the last row of a page.
+    :return: The cursor string for the next page.
+    """
+    created_at, user_id = key
+    raw = json.dumps([created_at.isoformat(), user_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Key:
+    """
+    Decodes a cursor produced by :func:`encode_cursor`.
+
+    :param cursor: The cursor string from a previous page.
+    :return: The (created_at, id) to continue after.
+    :raises ValueError: if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, user_id = json.loads(raw)
+        if not isinstance(user_id, int):
+            raise TypeError("id must be an integer")
+        return datetime.fromisoformat(created_at), user_id
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
@@ -0,0 +1,32 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# Matches Pydantic's JSON output: enums as values, UTC datetimes with a "Z"
+JSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def render_json(content: Any) -> bytes:
+    """
+    Encodes trusted content (dicts, lists, enums, datetimes) straight to JSON
+    bytes with orjson, byte-for-byte like Pydantic's ``model_dump_json``.
+
+    :param content: The value to encode.
+    :return: The UTF-8 encoded JSON document.
+    :rtype: bytes
+    """
+    return orjson.dumps(content, option=JSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with ``render_json``.
+
+    Returning it from a route skips FastAPI's response_model validation and
+    serialization, while the declared response_model still documents the
+    body in the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
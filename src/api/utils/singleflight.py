@@ -0,0 +1,65 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single execution.
+
+    The first caller for a key starts ``func``; callers arriving while it is
+    still running wait for the same result instead of starting their own. The
+    result, or the exception, is delivered to every waiter. A waiter that is
+    cancelled stops waiting without affecting the others; the shared call is
+    cancelled only when its last waiter gives up, and is forgotten at that
+    moment. Once the call finishes or is given up the key is forgotten, so
+    later callers start a fresh one.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            # shield() keeps one waiter's cancellation from cancelling the call
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Forget the call before cancelling it: the task only ends on
+                # its next step, and a caller joining meanwhile would get the
+                # cancellation instead of starting a fresh call
+                self._drop(key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _drop(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        self._drop(key, call)
+        # Mark the exception as retrieved when every waiter was cancelled
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def __len__(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._calls)
@@ -0,0 +1,172 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException, status
+from psycopg import errors
+
+from src.api.repository import queries
+from src.api.repository.async_user_repository import AsyncUserRepository
+from tests.test_data import (
+    address,
+    get_user,
+    get_user_row,
+    save_user_dict,
+    user_row_description,
+)
+
+
+# Test fixtures
+@pytest.fixture
+def user_repository():
+    return AsyncUserRepository()
+
+
+@pytest.fixture
+def mock_db_cursor():
+    cursor = MagicMock()
+    cursor.__aenter__ = AsyncMock(return_value=cursor)
+    cursor.__aexit__ = AsyncMock(return_value=None)
+    cursor.execute = AsyncMock()
+    cursor.fetchone = AsyncMock()
+    cursor.description = user_row_description
+    cursor.rowcount = 1
+    return cursor
+
+
+@pytest.fixture
+def mock_db_connection(mock_db_cursor):
+    connection = MagicMock()
+    connection.cursor.return_value = mock_db_cursor
+    connection.commit = AsyncMock()
+    connection.rollback = AsyncMock()
+    return connection
+
+
+@pytest.fixture
+def mock_db_pool(mock_db_connection):
+    @asynccontextmanager
+    async def get_connection():
+        yield mock_db_connection
+
+    with patch(
+        "src.api.config.database.AsyncDatabasePool.get_connection",
+        side_effect=get_connection,
+    ) as mock_get_connection:
+        yield mock_get_connection
+
+
+@pytest.fixture
+def sample_user():
+    return get_user(address)
+
+
+@pytest.mark.asyncio
+async def test_check_db_connection_success(
+    user_repository, mock_db_pool, mock_db_cursor
+):
+    result = await user_repository.check_db_connection()
+
+    assert result == "Connected"
+    mock_db_cursor.execute.assert_awaited_once_with("SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_check_db_connection_failure(
+    user_repository, mock_db_pool, mock_db_cursor
+):
+    mock_db_cursor.execute.side_effect = Exception("Connection failed")
+
+    result = await user_repository.check_db_connection()
+
+    assert "Failed to connect to database" in result
+    assert "Connection failed" in result
+
+
+@pytest.mark.asyncio
+async def test_save_user_success(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor, sample_user
+):
+    mock_db_cursor.fetchone.side_effect = save_user_dict
+
+    result = await user_repository.save(sample_user)
+
+    assert result is not None
+    assert result.username == sample_user.username
+    assert result.email == sample_user.email
+    mock_db_connection.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_save_user_conflict(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor, sample_user
+):
+    mock_db_cursor.fetchone.return_value = None
+
+    with pytest.raises(HTTPException) as exc_info:
+        await user_repository.save(sample_user)
+
+    assert exc_info.value.status_code == status.HTTP_409_CONFLICT
+    assert "User already exists" in str(exc_info.value.detail)
+    mock_db_connection.rollback.assert_awaited_once()
+    mock_db_connection.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_save_user_error_rolls_back(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor, sample_user
+):
+    mock_db_cursor.execute.side_effect = errors.OperationalError("connection lost")
+
+    with pytest.raises(Exception) as exc_info:
+        await user_repository.save(sample_user)
+
+    assert "Error saving user" in str(exc_info.value)
+    mock_db_connection.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_user_success(user_repository, mock_db_pool, mock_db_cursor):
+    mock_db_cursor.fetchone.side_effect = get_user_row
+
+    user = await user_repository.get_user(1)
+
+    assert user.username == "testuser"
+    assert user.address.city == "Test City"
+
+
+@pytest.mark.asyncio
+async def test_get_user_not_found(user_repository, mock_db_pool, mock_db_cursor):
+    mock_db_cursor.fetchone.return_value = None
+
+    user = await user_repository.get_user(999)
+
+    assert user is None
+    mock_db_cursor.execute.assert_awaited_once_with(queries.SELECT_USER_BY_ID, (999,))
+
+
+@pytest.mark.asyncio
+async def test_list_users_success(user_repository, mock_db_pool, mock_db_cursor):
+    mock_db_cursor.fetchall = AsyncMock(return_value=get_user_row)
+
+    users = await user_repository.list_users(10, after=(datetime(2024, 1, 1), 7))
+
+    assert [user.address.city for user in users] == ["Test City"]
+    query, params = mock_db_cursor.execute.call_args.args
+    assert "(u.created_at, u.id) > (%s, %s)" in query
+    assert params == (datetime(2024, 1, 1), 7, 10)
+
+
+@pytest.mark.asyncio
+async def test_get_users_uses_single_query(
+    user_repository, mock_db_pool, mock_db_cursor
+):
+    mock_db_cursor.fetchall = AsyncMock(return_value=get_user_row)
+
+    users = await user_repository.get_users([1, 2])
+
+    assert [user.username for user in users] == ["testuser"]
+    mock_db_cursor.execute.assert_awaited_once_with(
+        queries.SELECT_USERS_BY_IDS, ([1, 2],)
+    )
@@ -0,0 +1,90 @@
+import pytest
+
+from src.api.cache import BloomFilter, UserAvailabilityFilter
+from src.api.model.domain import User
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(max_bytes=4096, error_rate=0.01)
+    keys = [f"user{index}" for index in range(bloom.capacity)]
+
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert bloom.count == len(keys)
+
+
+def test_bloom_filter_false_positive_rate_at_capacity():
+    bloom = BloomFilter(max_bytes=16384, error_rate=0.01)
+    for index in range(bloom.capacity):
+        bloom.add(f"taken{index}")
+
+    false_positives = sum(f"free{index}" in bloom for index in range(20000))
+
+    assert false_positives / 20000 < 0.02
+    assert bloom.estimated_error_rate() == pytest.approx(0.01, rel=0.1)
+
+
+def test_bloom_filter_sizing_follows_budget_and_error_rate():
+    bloom = BloomFilter(max_bytes=1024 * 1024, error_rate=0.001)
+
+    assert bloom.stats()["bytes"] == 1024 * 1024
+    assert bloom.hashes == 10
+    assert bloom.capacity == 583450
+
+
+@pytest.mark.parametrize("max_bytes, error_rate", [(0, 0.01), (1024, 0), (1024, 1)])
+def test_bloom_filter_rejects_invalid_settings(max_bytes, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(max_bytes, error_rate)
+
+
+def test_availability_filter_is_conservative_until_loaded():
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    availability_filter.add_users([User(username="alice", email="a@example.com"), None])
+
+    assert availability_filter.might_be_taken("bob", "b@example.com") == (True, True)
+
+    availability_filter.loaded = True
+
+    assert availability_filter.might_be_taken("bob", "b@example.com") == (False, False)
+    assert availability_filter.might_be_taken("alice", "a@example.com") == (True, True)
+    # Usernames and emails do not collide with each other
+    assert availability_filter.might_be_taken("a@example.com", "alice") == (
+        False,
+        False,
+    )
+    assert availability_filter.might_be_taken(None, None) == (False, False)
+
+
+def test_availability_filter_rebuild_replaces_contents_and_keeps_concurrent_saves():
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    availability_filter.add("gone", None)
+
+    availability_filter.start_rebuild()
+    availability_filter.add_rebuilt("alice", "a@example.com")
+    # Saved while the table was being scanned
+    availability_filter.add("bob", None)
+    assert availability_filter.might_be_taken("bob", None) == (True, False)
+    availability_filter.finish_rebuild()
+
+    assert availability_filter.loaded
+    assert availability_filter.might_be_taken("alice", "a@example.com") == (True, True)
+    assert availability_filter.might_be_taken("bob", None) == (True, False)
+    assert availability_filter.might_be_taken("gone", None) == (False, False)
+
+
+def test_availability_filter_aborted_rebuild_keeps_current_filter():
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    availability_filter.add("alice", None)
+    availability_filter.loaded = True
+
+    availability_filter.start_rebuild()
+    availability_filter.add_rebuilt("bob", None)
+    availability_filter.abort_rebuild()
+    availability_filter.add("carol", None)
+
+    assert availability_filter.might_be_taken("alice", None) == (True, False)
+    assert availability_filter.might_be_taken("bob", None) == (False, False)
+    assert availability_filter.might_be_taken("carol", None) == (True, False)
@@ -0,0 +1,177 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis import aioredis as fake_aioredis
+from redis.exceptions import ConnectionError
+
+from src.api.cache import (
+    LRUTTLCache,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    UserSerializer,
+)
+from src.api.mapper.user_mapper import UserMapper
+from src.api.model.enum import UserRole, UserStatus
+from tests.test_data import address, get_user
+
+
+@pytest.fixture
+def sample_user():
+    user = get_user(address)
+    user.id = 7
+    user.created_at = datetime(2024, 11, 7, 18, 22, 38, 816855)
+    user.updated_at = datetime(2024, 11, 8, 9, 0, 0)
+    return user
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+@pytest.fixture
+def redis_backend(server):
+    client = fake_aioredis.FakeRedis(server=server)
+    return RedisCacheBackend(client, UserSerializer, ttl=60, prefix="test:")
+
+
+def fields(obj) -> dict:
+    return {name: getattr(obj, name) for name in type(obj).__slots__}
+
+
+def test_serializer_round_trip(sample_user):
+    loaded = UserSerializer.loads(UserSerializer.dumps(sample_user))
+
+    assert fields(loaded) | {"address": None} == fields(sample_user) | {"address": None}
+    assert fields(loaded.address) == fields(sample_user.address)
+
+
+def test_serializer_stores_aware_datetimes_as_naive_utc(sample_user):
+    sample_user.last_login_at = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+    loaded = UserSerializer.loads(UserSerializer.dumps(sample_user))
+
+    assert loaded.last_login_at == datetime(2024, 1, 1, 12)
+
+
+def test_serializer_is_smaller_than_json(sample_user):
+    as_json = UserMapper.to_response(sample_user).model_dump_json()
+
+    assert len(UserSerializer.dumps(sample_user)) < len(as_json) / 2
+    assert json.loads(as_json)["id"] == 7
+
+
+def test_serializer_rejects_other_versions(sample_user, monkeypatch):
+    payload = UserSerializer.dumps(sample_user)
+    monkeypatch.setattr(UserSerializer, "VERSION", 2)
+
+    assert UserSerializer.loads(payload) is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_get_many():
+    backend = MemoryCacheBackend(LRUTTLCache(max_size=10, ttl=60))
+    await backend.set_many({"a": 1, "b": 2})
+    await backend.delete("b")
+
+    assert await backend.get_many(["a", "b"]) == [1, None]
+    assert backend.stats()["backend"] == "memory"
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_round_trip(redis_backend, sample_user):
+    await redis_backend.set("user:7", sample_user)
+
+    loaded = await redis_backend.get("user:7")
+
+    assert loaded.username == sample_user.username
+    assert loaded.address.city == sample_user.address.city
+    assert 0 < await redis_backend.client.pttl("test:user:7") <= 60000
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_is_shared_between_clients(server, sample_user):
+    writer = RedisCacheBackend(fake_aioredis.FakeRedis(server=server), UserSerializer)
+    reader = RedisCacheBackend(fake_aioredis.FakeRedis(server=server), UserSerializer)
+
+    await writer.set("user:7", sample_user)
+    assert (await reader.get("user:7")).id == 7
+
+    await writer.delete("user:7")
+    assert await reader.get("user:7") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_get_many_uses_one_mget(redis_backend, sample_user):
+    other = get_user(None)
+    other.id, other.created_at, other.updated_at = 8, datetime(2024, 1, 1), None
+    await redis_backend.set_many({"user:7": sample_user, "user:8": other})
+    mget, calls = redis_backend.client.mget, []
+
+    async def spy(keys):
+        calls.append(keys)
+        return await mget(keys)
+
+    redis_backend.client.mget = spy
+
+    users = await redis_backend.get_many(["user:7", "user:9", "user:8"])
+
+    assert [user and user.id for user in users] == [7, None, 8]
+    assert calls == [["test:user:7", "test:user:9", "test:user:8"]]
+    assert redis_backend.stats() == {
+        "backend": "redis",
+        "ttl": 60,
+        "stale_ttl": 0,
+        "hits": 2,
+        "stale_hits": 0,
+        "misses": 1,
+        "errors": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_treats_unreadable_payloads_as_misses(redis_backend):
+    await redis_backend.client.set("test:user:7", b"\xc1")
+
+    assert await redis_backend.get("user:7") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_degrades_to_misses_when_server_is_down(redis_backend):
+    redis_backend.client.mget = AsyncMock(side_effect=ConnectionError("down"))
+    redis_backend.client.delete = AsyncMock(side_effect=ConnectionError("down"))
+
+    assert await redis_backend.get_many(["user:1", "user:2"]) == [None, None]
+    await redis_backend.delete("user:1")
+
+    assert redis_backend.stats()["errors"] == 2
+    assert redis_backend.stats()["misses"] == 2
+
+
+def test_serializer_accepts_raw_role_and_status_strings(sample_user):
+    sample_user.role, sample_user.status = "STAFF", "INACTIVE"
+
+    loaded = UserSerializer.loads(UserSerializer.dumps(sample_user))
+
+    assert (loaded.role, loaded.status) == (UserRole.STAFF, UserStatus.INACTIVE)
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_reports_staleness_from_pttl(server, sample_user):
+    backend = RedisCacheBackend(
+        fake_aioredis.FakeRedis(server=server), UserSerializer, stale_ttl=60
+    )
+    await backend.set("user:7", sample_user, ttl=0.05)
+    assert (await backend.get_entry("user:7")).stale_for == 0
+
+    await asyncio.sleep(0.1)
+
+    entry = await backend.get_entry("user:7")
+    assert entry.value.id == 7
+    assert 0 < entry.stale_for < 1
+    assert await backend.get("user:7") is None
+    assert backend.stats()["stale_hits"] == 1
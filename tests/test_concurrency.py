@@ -0,0 +1,29 @@
+import pytest
+
+from src.api.utils.concurrency import iterate_off_loop
+
+
+@pytest.mark.asyncio
+async def test_iterate_off_loop_closes_sync_generator_on_early_exit():
+    closed = []
+
+    def source():
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    items = iterate_off_loop(source())
+    assert await items.__anext__() == 0
+    await items.aclose()
+
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_iterate_off_loop_passes_async_iterators_through():
+    async def source():
+        for item in range(3):
+            yield item
+
+    assert [item async for item in iterate_off_loop(source())] == [0, 1, 2]
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from src.api.utils.conditional import etag_matches, make_etag
+
+
+def test_make_etag_changes_with_version():
+    etag = make_etag(1, datetime(2024, 1, 1))
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(1, datetime(2024, 1, 1))
+    assert etag != make_etag(1, datetime(2024, 1, 2))
+    assert etag != make_etag(2, datetime(2024, 1, 1))
+
+
+def test_etag_matches_lists_wildcards_and_weak_tags():
+    etag = '"abc"'
+
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"xyz", "abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"xyz"', etag)
+    assert not etag_matches(None, etag)
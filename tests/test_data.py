@@ -1,3 +1,6 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
 from src.api.model.domain import Address, User
 from src.api.model.enum import UserRole, UserStatus
 from src.api.model.schemas import HealthCheckResponse
@@ -40,11 +43,11 @@ user_request_no_email_phone_no_json = {
 user_response_valid_json = """{"id":123,"username":"testuser","email":"test@example.com","firstName":null,"lastName":null,"phoneNumber":null,"address":null,"role":"GUEST","status":"ACTIVE","lastLoginAt":null,"createdAt":"2024-11-07T18:22:38.816855Z","updatedAt":"2024-11-07T18:22:38.816855Z"}"""
 
 user_minimal = User(
-    id="123",
+    id=123,
     username="testuser",
     email="test@example.com",
-    created_at="2024-11-07T18:22:38.816855Z",
-    updated_at="2024-11-07T18:22:38.816855Z",
+    created_at=datetime(2024, 11, 7, 18, 22, 38, 816855, tzinfo=timezone.utc),
+    updated_at=datetime(2024, 11, 7, 18, 22, 38, 816855, tzinfo=timezone.utc),
 )
 
 user = User(
@@ -93,7 +96,6 @@ def get_user(address: Address) -> User:
 
 # REPOSITORY TEST DATA
 save_user_dict = [
-    {"id": 1},  # First fetch for address_id
     {
         "id": 1,
         "username": "testuser",
@@ -107,6 +109,11 @@ save_user_dict = [
         "last_login_at": None,
         "created_at": "2024-11-07T18:22:38.816855Z",
         "updated_at": "2024-11-07T18:22:38.816855Z",
+        "street": "123 Test St",
+        "city": "Test City",
+        "state": "Test State",
+        "postal_code": "12345",
+        "country": "Test Country",
     },
 ]
 
@@ -124,13 +131,15 @@ get_user_dict = [
         "last_login_at": None,
         "created_at": "2024-11-07T18:22:38.816855Z",
         "updated_at": "2024-11-07T18:22:38.816855Z",
-    },
-    {
-        "id": 1,
         "street": "123 Test St",
         "city": "Test City",
         "state": "Test State",
         "postal_code": "12345",
         "country": "Test Country",
-    }
+    },
 ]
+
+# Read paths fetch tuple rows and map them by the cursor's column names
+user_row_description = [SimpleNamespace(name=column) for column in get_user_dict[0]]
+
+get_user_row = [tuple(row.values()) for row in get_user_dict]
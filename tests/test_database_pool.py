@@ -0,0 +1,145 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from psycopg2 import extensions
+
+from src.api.config.database import (
+    BoundedConnectionPool,
+    PoolExhaustedError,
+    PoolTimeoutError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+@pytest.fixture
+def connect():
+    return MagicMock(side_effect=lambda: make_connection())
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_pool(connect, clock=None, **kwargs):
+    options = dict(min_size=1, max_size=2, max_waiters=1, timeout=0.05)
+    options.update(kwargs)
+    if clock is not None:
+        options["clock"] = clock
+    return BoundedConnectionPool(connect, **options)
+
+
+def test_opens_min_size_connections_and_reuses_idle(connect):
+    pool = make_pool(connect)
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    assert pool.getconn() is conn
+    assert connect.call_count == 1
+
+
+def test_grows_up_to_max_size_then_times_out(connect):
+    pool = make_pool(connect)
+
+    pool.getconn()
+    pool.getconn()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+    assert connect.call_count == 2
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiter_receives_returned_connection(connect):
+    pool = make_pool(connect, max_size=1, timeout=2)
+    conn = pool.getconn()
+    received = []
+
+    waiter = threading.Thread(target=lambda: received.append(pool.getconn()))
+    waiter.start()
+    while pool.stats()["waiters"] == 0:
+        pass
+    pool.putconn(conn)
+    waiter.join(timeout=2)
+
+    assert received == [conn]
+
+
+def test_rejects_when_wait_queue_is_full(connect):
+    pool = make_pool(connect, max_size=1, max_waiters=0)
+    pool.getconn()
+
+    with pytest.raises(PoolExhaustedError):
+        pool.getconn()
+    assert pool.stats()["rejected"] == 1
+
+
+def test_rolls_back_connection_returned_inside_transaction(connect):
+    pool = make_pool(connect)
+    conn = pool.getconn()
+    conn.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_INERROR
+
+    pool.putconn(conn)
+
+    conn.rollback.assert_called_once()
+    assert pool.stats()["idle"] == 1
+
+
+def test_recycles_connection_past_max_lifetime(connect, clock):
+    pool = make_pool(connect, clock, max_lifetime=10, validate_after=100)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    clock.now = 11
+
+    replacement = pool.getconn()
+
+    assert replacement is not conn
+    conn.close.assert_called_once()
+    assert pool.stats()["recycled"] == 1
+
+
+def test_replaces_idle_connection_that_fails_validation(connect, clock):
+    pool = make_pool(connect, clock, validate_after=5)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.cursor.return_value.__enter__.return_value.execute.side_effect = Exception(
+        "server closed the connection"
+    )
+    clock.now = 6
+
+    replacement = pool.getconn()
+
+    assert replacement is not conn
+    conn.close.assert_called_once()
+
+
+def test_stats_track_usage_and_wait_histogram(connect):
+    pool = make_pool(connect)
+
+    first = pool.getconn()
+    pool.getconn()
+    pool.putconn(first)
+    stats = pool.stats()
+
+    assert stats["in_use"] == 1
+    assert stats["idle"] == 1
+    assert stats["size"] == 2
+    assert stats["acquired"] == 2
+    assert stats["wait_seconds"]["count"] == 2
+    assert stats["wait_seconds"]["buckets"]["+Inf"] == 2
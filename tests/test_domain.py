@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from src.api.model.domain import Address, User
+
+
+def test_models_have_no_instance_dict():
+    user = User(address=Address(city="Town"))
+
+    assert not hasattr(user, "__dict__")
+    assert not hasattr(user.address, "__dict__")
+
+
+def test_timestamps_default_lazily_to_creation_time():
+    user = User(username="new")
+
+    assert user._created_at is None
+    assert user.created_at.tzinfo is not None
+    assert user.updated_at == user.created_at
+
+
+def test_timestamps_from_the_database_are_kept():
+    created_at, updated_at = datetime(2024, 1, 1), datetime(2024, 1, 2)
+
+    user = User(created_at=created_at, updated_at=updated_at)
+
+    assert (user.created_at, user.updated_at) == (created_at, updated_at)
+    user.updated_at = None
+    assert user.updated_at == created_at
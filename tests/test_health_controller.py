@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 
 from src.api.controller.health_controller import router
 from src.api.dependencies.provider import get_health_service
+from src.api.model.schemas import HealthCheckResponse
 from src.api.service.health_service import HealthService
 from tests.test_data import (
     health_check_db_error_response,
@@ -66,3 +67,46 @@ def test_get_health_status_error(
     assert response.status_code == 200
     assert response.json() == health_check_db_error_response_json
     mock_health_service.check_health.assert_called_once()
+
+
+def test_get_liveness(app, client, mock_health_service, mock_get_health_service):
+    app.dependency_overrides[get_health_service] = mock_get_health_service
+    mock_health_service.check_liveness.return_value = HealthCheckResponse(
+        status="Healthy"
+    )
+
+    response = client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "Healthy", "dependencies": {}}
+    mock_health_service.check_readiness.assert_not_called()
+
+
+def test_get_readiness_ready(app, client, mock_health_service, mock_get_health_service):
+    app.dependency_overrides[get_health_service] = mock_get_health_service
+    readiness = HealthCheckResponse(status="Healthy")
+    readiness.add_detail("database", "Connected")
+    mock_health_service.check_readiness.return_value = readiness
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "Healthy",
+        "dependencies": {"database": "Connected"},
+    }
+
+
+def test_get_readiness_not_ready(
+    app, client, mock_health_service, mock_get_health_service
+):
+    app.dependency_overrides[get_health_service] = mock_get_health_service
+    readiness = HealthCheckResponse(status="Unhealthy")
+    readiness.add_detail("database", "Connected")
+    readiness.add_detail("pool", {"in_use": 10, "max_size": 10, "saturated": True})
+    mock_health_service.check_readiness.return_value = readiness
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["dependencies"]["pool"]["saturated"] is True
@@ -1,7 +1,10 @@
+import asyncio
+import time
 from unittest.mock import MagicMock
 
 import pytest
 
+from src.api.cache import CacheBackend
 from src.api.dependencies.provider import get_health_service
 from src.api.model.schemas import HealthCheckResponse
 from src.api.repository.user_repository import UserRepository
@@ -18,21 +21,149 @@ def health_service(mock_user_repository):
     return HealthService(mock_user_repository)
 
 
-def test_check_health_all_ok(health_service, mock_user_repository):
+@pytest.mark.asyncio
+async def test_check_health_all_ok(health_service, mock_user_repository):
     mock_user_repository.check_db_connection.return_value = "Connected"
 
-    response = health_service.check_health()
+    response = await health_service.check_health()
 
     assert isinstance(response, HealthCheckResponse)
     assert response.status == "Healthy"
     assert response.dependencies == {"database": "Connected"}
 
 
-def test_check_health_database_error(health_service, mock_user_repository):
+@pytest.mark.asyncio
+async def test_check_health_database_error(health_service, mock_user_repository):
     mock_user_repository.check_db_connection.return_value = "Failed to connect"
 
-    response = health_service.check_health()
+    response = await health_service.check_health()
 
     assert isinstance(response, HealthCheckResponse)
     assert response.status == "Unhealthy"
     assert response.dependencies == {"database": "Failed to connect"}
+
+
+@pytest.mark.asyncio
+async def test_check_liveness_does_no_io(health_service, mock_user_repository):
+    response = await health_service.check_liveness()
+
+    assert response.status == "Healthy"
+    assert response.dependencies == {}
+    mock_user_repository.check_db_connection.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_check_readiness_probes_dependencies_concurrently(mock_user_repository):
+    async def slow_check():
+        await asyncio.sleep(0.2)
+        return "Connected"
+
+    mock_user_repository.check_db_connection = slow_check
+    cache = MagicMock(spec=CacheBackend)
+    cache.check_connection = slow_check
+    health_service = HealthService(mock_user_repository, cache)
+
+    started = time.monotonic()
+    response = await health_service.check_readiness()
+
+    assert time.monotonic() - started < 0.35
+    assert response.status == "Healthy"
+    assert response.dependencies == {"database": "Connected", "cache": "Connected"}
+
+
+@pytest.mark.asyncio
+async def test_check_readiness_times_out_slow_probe(mock_user_repository):
+    async def hanging_check():
+        await asyncio.sleep(10)
+
+    mock_user_repository.check_db_connection = hanging_check
+    health_service = HealthService(mock_user_repository, probe_timeout=0.05)
+
+    response = await health_service.check_readiness()
+
+    assert response.status == "Unhealthy"
+    assert response.dependencies == {"database": "Timed out after 0.05s"}
+
+
+@pytest.mark.asyncio
+async def test_check_readiness_reports_probe_errors(
+    health_service, mock_user_repository
+):
+    mock_user_repository.check_db_connection.side_effect = RuntimeError("boom")
+
+    response = await health_service.check_readiness()
+
+    assert response.status == "Unhealthy"
+    assert response.dependencies == {"database": "Failed: boom"}
+
+
+@pytest.mark.asyncio
+async def test_check_readiness_is_cached(mock_user_repository):
+    mock_user_repository.check_db_connection.return_value = "Connected"
+    health_service = HealthService(mock_user_repository, ready_ttl=60)
+
+    responses = await asyncio.gather(
+        *(health_service.check_readiness() for _ in range(5))
+    )
+    responses.append(await health_service.check_readiness())
+
+    assert all(response.status == "Healthy" for response in responses)
+    mock_user_repository.check_db_connection.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_check_readiness_probes_again_after_ttl(
+    health_service, mock_user_repository
+):
+    mock_user_repository.check_db_connection.side_effect = ["Connected", "Down"]
+
+    first = await health_service.check_readiness()
+    second = await health_service.check_readiness()
+
+    assert first.status == "Healthy"
+    assert second.status == "Unhealthy"
+
+
+@pytest.mark.asyncio
+async def test_check_readiness_reports_pool_figures(mock_user_repository):
+    mock_user_repository.check_db_connection.return_value = "Connected"
+    stats = {"max_size": 10, "size": 8, "in_use": 4, "idle": 4, "waiters": 0}
+    health_service = HealthService(mock_user_repository, pool_stats=lambda: stats)
+
+    response = await health_service.check_readiness()
+
+    assert response.status == "Healthy"
+    assert response.dependencies["pool"] == {
+        "max_size": 10,
+        "in_use": 4,
+        "waiters": 0,
+        "utilization": 0.4,
+        "saturated": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_check_readiness_fails_when_pool_saturated(mock_user_repository):
+    mock_user_repository.check_db_connection.return_value = "Connected"
+    stats = {"max_size": 10, "size": 10, "in_use": 10, "idle": 0, "waiters": 3}
+    health_service = HealthService(
+        mock_user_repository, pool_stats=lambda: stats, pool_max_waiters=2
+    )
+
+    response = await health_service.check_readiness()
+
+    assert response.status == "Unhealthy"
+    assert response.dependencies["database"] == "Connected"
+    assert response.dependencies["pool"]["saturated"] is True
+
+
+@pytest.mark.asyncio
+async def test_check_readiness_skips_pool_figures_before_pool_exists(
+    mock_user_repository,
+):
+    mock_user_repository.check_db_connection.return_value = "Connected"
+    health_service = HealthService(mock_user_repository, pool_stats=dict)
+
+    response = await health_service.check_readiness()
+
+    assert response.dependencies == {"database": "Connected"}
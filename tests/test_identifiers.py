@@ -0,0 +1,45 @@
+import pytest
+
+from src.api.config import settings
+from src.api.utils import identifiers
+from src.api.utils.identifiers import normalize_email, normalize_phone
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("+44 20 7946 0958", "+442079460958"),
+        ("0044 (20) 7946-0958", "+442079460958"),
+        ("(555) 010-0199", "+15550100199"),
+        ("0555.010.0199", "+15550100199"),
+        ("+1/555/010/0199", "+15550100199"),
+        ("555-0199 ext 2", None),
+        ("+0 555 0100", None),
+        ("+123", None),
+        ("+1234567890123456", None),
+        ("+٤٤٢٠٧٩٤٦٠٩٥٨", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_normalize_phone(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+def test_normalize_phone_uses_default_country_code(monkeypatch):
+    monkeypatch.setattr(settings, "USER_PHONE_DEFAULT_COUNTRY_CODE", "44")
+
+    assert normalize_phone("020 7946 0958") == "+442079460958"
+
+
+def test_normalization_is_cached():
+    identifiers._normalize_phone.cache_clear()
+
+    for _ in range(3):
+        normalize_phone("+44 20 7946 0958")
+
+    assert identifiers._normalize_phone.cache_info().hits == 2
+
+
+def test_normalize_email():
+    assert normalize_email(" Alice@Example.COM ") == "alice@example.com"
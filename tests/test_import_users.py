@@ -0,0 +1,275 @@
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from psycopg2 import errors
+
+from src.api.cli import import_users
+from src.api.repository import queries
+
+CSV_HEADER = (
+    "username,email,firstName,lastName,phoneNumber,"
+    "street,city,state,country,postalCode,role,status\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(
+        CSV_HEADER
+        + "alice,alice@example.com,Alice,,,1 Main St,Town,,US,,GUEST,ACTIVE\n"
+        + "bob,not-an-email,,,,,,,,,GUEST,ACTIVE\n"
+        + "carol,,,,,,,,,,GUEST,ACTIVE\n"
+        + "dave,dave@example.com,,,,,,,,,STAFF,ACTIVE\n"
+    )
+    return path
+
+
+@pytest.fixture
+def mock_cursor():
+    cursor = MagicMock()
+    cursor.__enter__.return_value = cursor
+    return cursor
+
+
+@pytest.fixture
+def mock_connection(mock_cursor):
+    connection = MagicMock()
+    connection.cursor.return_value = mock_cursor
+    return connection
+
+
+def test_read_records_csv_nests_address_and_drops_empty_cells(csv_file):
+    records = list(import_users.read_records(str(csv_file), "csv"))
+
+    assert records[0] == (
+        2,
+        {
+            "username": "alice",
+            "email": "alice@example.com",
+            "firstName": "Alice",
+            "role": "GUEST",
+            "status": "ACTIVE",
+            "address": {
+                "street": "1 Main St",
+                "city": "Town",
+                "state": None,
+                "country": "US",
+                "postalCode": None,
+            },
+        },
+    )
+    assert "address" not in records[3][1]
+
+
+def test_read_records_ndjson_skips_blank_lines(tmp_path):
+    path = tmp_path / "users.ndjson"
+    path.write_text(
+        '{"username": "a", "email": "a@example.com"}\n\n{"username": "b"}\n'
+    )
+
+    records = list(import_users.read_records(str(path), "ndjson"))
+
+    assert [line_no for line_no, _ in records] == [1, 3]
+
+
+def test_read_records_ndjson_marks_unreadable_lines(tmp_path):
+    path = tmp_path / "users.ndjson"
+    path.write_bytes(
+        b'{"username": "a", "email": "a@example.com"}\n'
+        b'{"username": "b", \n'
+        b'{"username": "caf\xe9", "email": "c@example.com"}\n'
+        b'{"username": "d", "email": "d@example.com"}\n'
+    )
+
+    items = list(import_users.validate(import_users.read_records(str(path), "ndjson")))
+
+    assert [line_no for line_no, _, user, _ in items if user] == [1, 4]
+    rejects = {
+        line_no: (record, error) for line_no, record, user, error in items if not user
+    }
+    assert rejects[2][0] == '{"username": "b", '
+    assert rejects[2][1].startswith("invalid JSON")
+    assert rejects[3] == (
+        '{"username": "caf\ufffd", "email": "c@example.com"}',
+        "not valid UTF-8",
+    )
+
+
+def test_validate_separates_valid_rows_from_rejects(csv_file):
+    items = list(import_users.validate(import_users.read_records(str(csv_file), "csv")))
+
+    valid = [(line_no, user.username) for line_no, _, user, _ in items if user]
+    errors = {line_no: error for line_no, _, user, error in items if not user}
+    assert valid == [(2, "alice"), (5, "dave")]
+    assert errors[3][0]["loc"] == ("email",)
+    assert errors[4] == "Either phone_number or email must be provided."
+
+
+def test_chunked_groups_items():
+    assert list(import_users.chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_copy_field_escapes_text_format():
+    assert import_users.copy_field(None) == "\\N"
+    assert import_users.copy_field("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+    assert (
+        import_users.copy_field(datetime(2024, 1, 2, 3, 4, 5)) == "2024-01-02T03:04:05"
+    )
+
+
+def test_copy_field_writes_aware_datetimes_as_naive_utc():
+    cest = timezone(timedelta(hours=2))
+
+    assert (
+        import_users.copy_field(datetime(2024, 1, 2, 3, 4, 5, tzinfo=cest))
+        == "2024-01-02T01:04:05"
+    )
+    assert (
+        import_users.copy_field(datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+        == "2024-01-02T03:04:05"
+    )
+
+
+def test_load_chunk_copies_rows_and_reports_conflicts(mock_connection, mock_cursor):
+    items = list(
+        import_users.validate(
+            [
+                (
+                    2,
+                    {
+                        "username": "a",
+                        "email": "a@example.com",
+                        "address": {"city": "X"},
+                    },
+                ),
+                (3, {"username": "b", "email": "b@example.com"}),
+            ]
+        )
+    )
+    users = [(line_no, user) for line_no, _, user, _ in items]
+    mock_cursor.fetchone.return_value = ([10, 11], [20])
+    mock_cursor.fetchall.return_value = [(2, 20)]
+
+    skipped = import_users.load_chunk(mock_connection, users)
+
+    assert skipped == [2]
+    copied_tables = [call.args[0] for call in mock_cursor.copy_expert.call_args_list]
+    assert copied_tables[0].startswith("COPY address ")
+    assert copied_tables[1].startswith("COPY user_import_stage ")
+    address_rows = mock_cursor.copy_expert.call_args_list[0].args[1].getvalue()
+    assert address_rows == "20\t\\N\tX\t\\N\t\\N\t\\N\n"
+    mock_cursor.execute.assert_any_call(queries.DELETE_ADDRESSES, ([20],))
+    mock_connection.commit.assert_called_once()
+
+
+def test_load_rows_rejects_rows_the_database_refuses(mock_connection, mock_cursor):
+    # The schema does not cap first_name, the column is VARCHAR(100)
+    items = list(
+        import_users.validate(
+            [
+                (1, {"username": "a", "email": "a@example.com"}),
+                (
+                    2,
+                    {"username": "b", "email": "b@example.com", "firstName": "x" * 101},
+                ),
+                (3, {"username": "c", "email": "c@example.com"}),
+            ]
+        )
+    )
+    users = [(line_no, user) for line_no, _, user, _ in items]
+
+    def copy_expert(sql, buffer):
+        if "x" * 101 in buffer.getvalue():
+            raise errors.StringDataRightTruncation(
+                "value too long for type character varying(100)"
+            )
+
+    mock_cursor.copy_expert.side_effect = copy_expert
+    mock_cursor.fetchone.side_effect = lambda: ([1] * 3, [])
+    mock_cursor.fetchall.return_value = []
+
+    skipped, failed = import_users.load_rows(mock_connection, users)
+
+    assert skipped == []
+    assert failed == {2: "value too long for type character varying(100)"}
+    # The chunk and then the refused row were rolled back; rows 1 and 3 were
+    # loaded on their own
+    assert mock_connection.rollback.call_count == 2
+    assert mock_connection.commit.call_count == 2
+
+
+def test_run_writes_rejects_and_resumes_from_checkpoint(csv_file, mock_connection):
+    checkpoint_path = f"{csv_file}.checkpoint"
+    with open(checkpoint_path, "w") as handle:
+        json.dump({"line": 2, "loaded": 1, "rejected": 0}, handle)
+
+    with (
+        patch.object(import_users.psycopg2, "connect", return_value=mock_connection),
+        patch.object(import_users, "load_chunk", return_value=[]) as load_chunk,
+    ):
+        checkpoint = import_users.run(
+            import_users.parse_args([str(csv_file), "--resume", "--chunk-size", "10"])
+        )
+
+    loaded_lines = [line_no for line_no, _ in load_chunk.call_args.args[1]]
+    assert loaded_lines == [5]
+    assert (checkpoint.line, checkpoint.loaded, checkpoint.rejected) == (5, 2, 2)
+    with open(f"{csv_file}.rejects") as handle:
+        assert [json.loads(line)["line"] for line in handle] == [3, 4]
+
+
+def test_run_rejects_ndjson_values_that_are_not_objects(tmp_path, mock_connection):
+    path = tmp_path / "users.ndjson"
+    path.write_text(
+        '{"username": "a", "email": "a@example.com"}\n'
+        'null\n[]\n"abc"\n42\n'
+        '{"username": "b", "email": "b@example.com"}\n'
+    )
+
+    with (
+        patch.object(import_users.psycopg2, "connect", return_value=mock_connection),
+        patch.object(import_users, "load_chunk", return_value=[]) as load_chunk,
+    ):
+        checkpoint = import_users.run(import_users.parse_args([str(path)]))
+
+    loaded = [
+        (line_no, user.username) for line_no, user in load_chunk.call_args.args[1]
+    ]
+    assert loaded == [(1, "a"), (6, "b")]
+    assert (checkpoint.line, checkpoint.loaded, checkpoint.rejected) == (6, 2, 4)
+    with open(f"{path}.rejects") as handle:
+        rejects = [json.loads(line) for line in handle]
+    assert [(reject["line"], reject["record"]) for reject in rejects] == [
+        (2, "null"),
+        (3, "[]"),
+        (4, '"abc"'),
+        (5, "42"),
+    ]
+    assert {reject["error"] for reject in rejects} == {"not a JSON object"}
+
+
+def test_run_refuses_to_restart_over_existing_checkpoint(csv_file):
+    with open(f"{csv_file}.checkpoint", "w") as handle:
+        json.dump({"line": 2, "loaded": 1, "rejected": 0}, handle)
+
+    with pytest.raises(SystemExit):
+        import_users.run(import_users.parse_args([str(csv_file)]))
+
+
+def test_run_rejects_rows_refused_by_the_database(csv_file, mock_connection):
+    with (
+        patch.object(import_users.psycopg2, "connect", return_value=mock_connection),
+        patch.object(
+            import_users, "load_rows", return_value=([], {5: "value too long"})
+        ),
+    ):
+        checkpoint = import_users.run(import_users.parse_args([str(csv_file)]))
+
+    assert (checkpoint.line, checkpoint.loaded, checkpoint.rejected) == (5, 1, 3)
+    with open(f"{csv_file}.rejects") as handle:
+        rejects = [json.loads(line) for line in handle]
+    assert [reject["line"] for reject in rejects] == [3, 4, 5]
+    assert rejects[-1]["error"] == "value too long"
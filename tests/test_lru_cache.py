@@ -0,0 +1,83 @@
+import pytest
+
+from src.api.cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_get_returns_cached_value_and_counts_hits(clock):
+    cache = LRUTTLCache(max_size=2, ttl=10, clock=clock)
+    cache.set(1, "alice")
+
+    assert cache.get(1) == "alice"
+    assert cache.get(2) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = LRUTTLCache(max_size=2, ttl=10, clock=clock)
+    cache.set(1, "alice")
+    cache.set(2, "bob")
+    cache.get(1)
+
+    cache.set(3, "carol")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "alice"
+    assert cache.get(3) == "carol"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUTTLCache(max_size=2, ttl=10, clock=clock)
+    cache.set(1, "alice")
+    cache.set(2, "bob", ttl=30)
+
+    clock.now = 10
+    assert cache.get(1) is None
+    assert cache.get(2) == "bob"
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 1
+
+
+def test_delete_removes_entry(clock):
+    cache = LRUTTLCache(max_size=2, ttl=10, clock=clock)
+    cache.set(1, "alice")
+
+    cache.delete(1)
+    cache.delete(99)
+
+    assert cache.get(1) is None
+
+
+def test_invalid_configuration_is_rejected():
+    with pytest.raises(ValueError):
+        LRUTTLCache(max_size=0)
+    with pytest.raises(ValueError):
+        LRUTTLCache(ttl=0)
+
+
+def test_stale_entries_are_only_returned_by_get_entry(clock):
+    cache = LRUTTLCache(max_size=2, ttl=10, stale_ttl=5, clock=clock)
+    cache.set(1, "alice")
+
+    assert cache.get_entry(1) == ("alice", 0)
+    clock.now = 12
+    assert cache.get(1) is None
+    assert cache.get_entry(1) == ("alice", 2)
+    clock.now = 15
+    assert cache.get_entry(1) is None
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["expirations"] == 1
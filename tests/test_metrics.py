@@ -0,0 +1,200 @@
+import threading
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.api.utils.metrics import (
+    DB_QUERY_DURATION,
+    DB_QUERY_ERRORS,
+    HTTP_REQUEST_DURATION,
+    HTTP_RESPONSES,
+    Counter,
+    Histogram,
+    MetricsMiddleware,
+    cache_metrics,
+    instrument_query,
+    pool_metrics,
+)
+
+
+def test_counter_merges_per_thread_shards():
+    counter = Counter("jobs_total", "Jobs.", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc("b", amount=2)
+
+    assert counter.value("a") == 4000
+    assert counter.render() == [
+        "# HELP jobs_total Jobs.",
+        "# TYPE jobs_total counter",
+        'jobs_total{kind="a"} 4000',
+        'jobs_total{kind="b"} 2',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, "/a")
+
+    assert histogram.snapshot("/a") == {
+        "buckets": {"0.1": 2, "1": 3, "+Inf": 4},
+        "count": 4,
+        "sum": 3.65,
+    }
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_count{route="/a"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("odd_total", "Odd labels.", ("value",))
+    counter.inc('a"b\\c\nd')
+
+    assert counter.render()[-1] == 'odd_total{value="a\\"b\\\\c\\nd"} 1'
+
+
+class Repository:
+    @instrument_query
+    def get(self, fail=None):
+        if fail:
+            raise fail
+        return "row"
+
+    @instrument_query
+    async def aget(self):
+        return "row"
+
+    @instrument_query
+    def iterate(self):
+        yield 1
+        yield 2
+
+    @instrument_query
+    async def aiterate(self):
+        yield 1
+        yield 2
+
+
+def test_instrument_query_records_plain_methods():
+    before = DB_QUERY_DURATION.snapshot("Repository", "get")["count"]
+
+    assert Repository().get() == "row"
+    assert DB_QUERY_DURATION.snapshot("Repository", "get")["count"] == before + 1
+
+
+def test_instrument_query_counts_server_errors_only():
+    errors = DB_QUERY_ERRORS.value("Repository", "get")
+
+    with pytest.raises(HTTPException):
+        Repository().get(HTTPException(status_code=409))
+    assert DB_QUERY_ERRORS.value("Repository", "get") == errors
+
+    with pytest.raises(HTTPException):
+        Repository().get(HTTPException(status_code=500))
+    with pytest.raises(RuntimeError):
+        Repository().get(RuntimeError("boom"))
+    assert DB_QUERY_ERRORS.value("Repository", "get") == errors + 2
+
+
+@pytest.mark.asyncio
+async def test_instrument_query_records_async_methods():
+    before = DB_QUERY_DURATION.snapshot("Repository", "aget")["count"]
+
+    assert await Repository().aget() == "row"
+    assert DB_QUERY_DURATION.snapshot("Repository", "aget")["count"] == before + 1
+
+
+def test_instrument_query_records_generators_once_when_closed():
+    before = DB_QUERY_DURATION.snapshot("Repository", "iterate")["count"]
+
+    rows = Repository().iterate()
+    assert next(rows) == 1
+    assert DB_QUERY_DURATION.snapshot("Repository", "iterate")["count"] == before
+    rows.close()
+    assert list(Repository().iterate()) == [1, 2]
+
+    assert DB_QUERY_DURATION.snapshot("Repository", "iterate")["count"] == before + 2
+
+
+@pytest.mark.asyncio
+async def test_instrument_query_records_async_generators():
+    before = DB_QUERY_DURATION.snapshot("Repository", "aiterate")["count"]
+
+    assert [row async for row in Repository().aiterate()] == [1, 2]
+    assert DB_QUERY_DURATION.snapshot("Repository", "aiterate")["count"] == before + 1
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/things/{thing_id}")
+    async def get_thing(thing_id: int):
+        if thing_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": thing_id}
+
+    route = "/things/{thing_id}"
+    before = HTTP_REQUEST_DURATION.snapshot("GET", route)["count"]
+    ok = HTTP_RESPONSES.value("GET", route, "200")
+    unmatched = HTTP_RESPONSES.value("GET", "unmatched", "404")
+    client = TestClient(app)
+
+    client.get("/things/1")
+    client.get("/things/2")
+    client.get("/things/0")
+    client.get("/elsewhere")
+
+    assert HTTP_REQUEST_DURATION.snapshot("GET", route)["count"] == before + 3
+    assert HTTP_RESPONSES.value("GET", route, "200") == ok + 2
+    assert HTTP_RESPONSES.value("GET", route, "404") == 1
+    assert HTTP_RESPONSES.value("GET", "unmatched", "404") == unmatched + 1
+
+
+def test_pool_metrics():
+    stats = {
+        "max_size": 4,
+        "size": 4,
+        "in_use": 3,
+        "idle": 1,
+        "waiters": 2,
+        "timeouts": 5,
+        "rejected": 1,
+        "wait_seconds": {"buckets": {"0.1": 1, "+Inf": 2}, "count": 2, "sum": 0.5},
+    }
+
+    lines = pool_metrics(stats)
+
+    assert 'db_pool_connections{state="in_use"} 3' in lines
+    assert "db_pool_saturation_ratio 0.75" in lines
+    assert "db_pool_waiters 2" in lines
+    assert 'db_pool_checkout_failures_total{reason="timeout"} 5' in lines
+    assert 'db_pool_wait_seconds_bucket{le="+Inf"} 2' in lines
+    assert "db_pool_wait_seconds_sum 0.5" in lines
+    assert pool_metrics({}) == []
+
+
+def test_cache_metrics():
+    stats = {"hits": 6, "stale_hits": 2, "misses": 2, "errors": 1}
+
+    lines = cache_metrics("user", stats)
+
+    assert 'cache_reads_total{cache="user",result="hit"} 6' in lines
+    assert 'cache_hit_ratio{cache="user"} 0.8' in lines
+    assert 'cache_errors_total{cache="user"} 1' in lines
+    assert not any(line.startswith("cache_evictions_total") for line in lines)
+    assert cache_metrics("user", None) == []
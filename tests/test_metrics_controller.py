@@ -0,0 +1,105 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.cache import LRUTTLCache, MemoryCacheBackend, UserAvailabilityFilter
+from src.api.controller.metrics_controller import router
+from src.api.dependencies.provider import (
+    get_database_pool,
+    get_user_availability_filter,
+    get_user_cache,
+)
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_user_availability_filter] = lambda: None
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return TestClient(app)
+
+
+def test_cache_metrics(app, client):
+    lru = LRUTTLCache(max_size=5, ttl=30)
+    lru.set("user:1", "alice")
+    lru.get("user:1")
+    lru.get("user:2")
+    app.dependency_overrides[get_user_cache] = lambda: MemoryCacheBackend(lru)
+
+    response = client.get("/metrics/cache")
+
+    assert response.status_code == 200
+    assert response.json()["user"] == {
+        "backend": "memory",
+        "max_size": 5,
+        "ttl": 30,
+        "stale_ttl": 0,
+        "size": 1,
+        "hits": 1,
+        "stale_hits": 0,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 0,
+    }
+
+
+def test_cache_metrics_when_cache_is_disabled(app, client):
+    app.dependency_overrides[get_user_cache] = lambda: None
+
+    response = client.get("/metrics/cache")
+
+    assert response.json() == {"user": None, "availability": None}
+
+
+def test_availability_filter_metrics(app, client):
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    availability_filter.add("alice", "alice@example.com")
+    app.dependency_overrides[get_user_availability_filter] = lambda: (
+        availability_filter
+    )
+
+    stats = client.get("/metrics/cache").json()["availability"]
+
+    assert stats["loaded"] is False
+    assert (stats["bytes"], stats["hashes"], stats["count"]) == (1024, 7, 2)
+    assert stats["capacity"] == 854
+
+
+def test_prometheus_metrics(app, client):
+    lru = LRUTTLCache(max_size=5, ttl=30)
+    lru.get("user:1")
+    pool = MagicMock()
+    pool.stats.return_value = {
+        "max_size": 10,
+        "size": 2,
+        "in_use": 1,
+        "idle": 1,
+        "waiters": 0,
+        "timeouts": 0,
+    }
+    app.dependency_overrides[get_user_cache] = lambda: MemoryCacheBackend(lru)
+    app.dependency_overrides[get_database_pool] = lambda: pool
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "# TYPE http_request_duration_seconds histogram" in lines
+    assert "# TYPE db_query_duration_seconds histogram" in lines
+    assert "db_pool_saturation_ratio 0.1" in lines
+    assert 'cache_reads_total{cache="user",result="miss"} 1' in lines
+
+
+def test_query_metrics(client):
+    response = client.get("/metrics/queries")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"statements", "slow"}
@@ -0,0 +1,170 @@
+import logging
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from psycopg import pq
+from psycopg2 import extensions
+
+from src.api.config import settings
+from src.api.repository import queries
+from src.api.repository.instrumentation import (
+    DB_STATEMENT_DURATION,
+    DB_STATEMENT_ROWS,
+    SLOW_QUERIES,
+    execute,
+    execute_async,
+    fingerprint,
+    redact,
+    statement_stats,
+)
+
+
+@pytest.fixture
+def slow(monkeypatch):
+    """Makes every statement slow."""
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_THRESHOLD", 1e-9)
+    monkeypatch.setattr(settings, "DB_EXPLAIN_SLOW_QUERIES", True)
+    SLOW_QUERIES.clear()
+
+
+@pytest.fixture
+def explain_cursor():
+    cursor = MagicMock()
+    cursor.__enter__ = Mock(return_value=cursor)
+    cursor.__exit__ = Mock(return_value=None)
+    cursor.fetchall.return_value = [("Index Scan using user_pkey",), ("  rows=1",)]
+    return cursor
+
+
+@pytest.fixture
+def cursor(explain_cursor):
+    cursor = MagicMock()
+    cursor.name = None
+    cursor.rowcount = 3
+    cursor.connection.cursor.return_value = explain_cursor
+    cursor.connection.get_transaction_status.return_value = (
+        extensions.TRANSACTION_STATUS_INTRANS
+    )
+    return cursor
+
+
+def test_fingerprint_normalizes_literals_and_whitespace():
+    digest, statement = fingerprint(
+        """
+        SELECT id FROM "user"  -- by name
+        WHERE username = %s AND role = 'ADMIN' LIMIT 10;
+        """
+    )
+
+    assert statement == 'SELECT id FROM "user" WHERE username = ? AND role = ? LIMIT ?'
+    assert (
+        fingerprint(
+            "SELECT id FROM \"user\" WHERE username = 'x' AND role = %s LIMIT 5"
+        )[0]
+        == digest
+    )
+    assert fingerprint(queries.SELECT_USER_BY_ID)[0] != digest
+
+
+def test_redact_keeps_only_types():
+    assert redact(("alice", 7, None, [1, 2])) == "(str, int, NULL, list[2])"
+    assert redact(None) == "()"
+
+
+def test_execute_records_duration_and_rows(cursor):
+    digest, _ = fingerprint(queries.SELECT_USERS_BY_IDS)
+    calls = DB_STATEMENT_DURATION.snapshot(digest)["count"]
+    rows = DB_STATEMENT_ROWS.value(digest)
+
+    execute(cursor, queries.SELECT_USERS_BY_IDS, ([1, 2, 3],))
+
+    cursor.execute.assert_called_once_with(queries.SELECT_USERS_BY_IDS, ([1, 2, 3],))
+    assert DB_STATEMENT_DURATION.snapshot(digest)["count"] == calls + 1
+    assert DB_STATEMENT_ROWS.value(digest) == rows + 3
+    assert digest in {row["fingerprint"] for row in statement_stats()}
+
+
+def test_execute_passes_arguments_through(cursor):
+    execute(cursor, "SELECT 1")
+
+    cursor.execute.assert_called_once_with("SELECT 1")
+
+
+def test_fast_statements_are_not_logged(cursor, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_THRESHOLD", 60.0)
+
+    with caplog.at_level(logging.WARNING):
+        execute(cursor, queries.SELECT_USER_BY_ID, (1,))
+
+    assert caplog.records == []
+    cursor.connection.cursor.assert_not_called()
+
+
+def test_slow_select_is_logged_redacted_with_plan(cursor, explain_cursor, slow, caplog):
+    with caplog.at_level(logging.WARNING):
+        execute(cursor, queries.SELECT_USER_BY_USERNAME, ("alice",))
+
+    message = caplog.records[0].getMessage()
+    assert "Slow query" in message
+    assert "params=(str)" in message
+    assert "alice" not in message
+    assert "Index Scan using user_pkey" in message
+    explain_cursor.execute.assert_any_call(
+        f"EXPLAIN (ANALYZE, BUFFERS) {queries.SELECT_USER_BY_USERNAME}", ("alice",)
+    )
+    # The EXPLAIN runs inside a savepoint that is rolled back
+    statements = [call.args[0] for call in explain_cursor.execute.call_args_list]
+    assert statements[0].startswith("SAVEPOINT")
+    assert statements[-1].startswith("ROLLBACK TO SAVEPOINT")
+    assert SLOW_QUERIES[-1].plan == "Index Scan using user_pkey\n  rows=1"
+    assert SLOW_QUERIES[-1].params == "(str)"
+
+
+def test_slow_writes_are_not_explained(cursor, slow):
+    execute(cursor, *queries.insert_user(MagicMock(address=None, phone_number=None)))
+    execute(cursor, queries.ALLOCATE_IDS, (2, 1))
+
+    cursor.connection.cursor.assert_not_called()
+    assert [slow.plan for slow in SLOW_QUERIES] == [None, None]
+
+
+def test_plans_are_captured_only_when_enabled(cursor, slow, monkeypatch):
+    monkeypatch.setattr(settings, "DB_EXPLAIN_SLOW_QUERIES", False)
+
+    execute(cursor, queries.SELECT_USER_BY_ID, (1,))
+
+    cursor.connection.cursor.assert_not_called()
+    assert SLOW_QUERIES[-1].plan is None
+
+
+def test_failed_explain_is_logged_and_ignored(cursor, explain_cursor, slow, caplog):
+    explain_cursor.fetchall.side_effect = Exception("canceled")
+
+    with caplog.at_level(logging.WARNING):
+        execute(cursor, queries.SELECT_USER_BY_ID, (1,))
+
+    assert SLOW_QUERIES[-1].plan is None
+    assert "Could not capture the plan" in caplog.text
+    assert explain_cursor.execute.call_args.args[0].startswith("ROLLBACK TO")
+
+
+@pytest.mark.asyncio
+async def test_execute_async_captures_plan(slow):
+    explain_cursor = MagicMock()
+    explain_cursor.__aenter__ = AsyncMock(return_value=explain_cursor)
+    explain_cursor.__aexit__ = AsyncMock(return_value=None)
+    explain_cursor.execute = AsyncMock()
+    explain_cursor.fetchall = AsyncMock(return_value=[("Seq Scan on address",)])
+    cursor = MagicMock(spec=["execute", "rowcount", "connection"])
+    cursor.execute = AsyncMock()
+    cursor.rowcount = 1
+    cursor.connection.cursor.return_value = explain_cursor
+    cursor.connection.info.transaction_status = pq.TransactionStatus.IDLE
+
+    await execute_async(cursor, queries.SELECT_USER_BY_ID, (1,))
+
+    cursor.execute.assert_awaited_once_with(queries.SELECT_USER_BY_ID, (1,))
+    explain_cursor.execute.assert_awaited_once_with(
+        f"EXPLAIN (ANALYZE, BUFFERS) {queries.SELECT_USER_BY_ID}", (1,)
+    )
+    assert SLOW_QUERIES[-1].plan == "Seq Scan on address"
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from src.api.utils.singleflight import SingleFlight
+
+
+class Loader:
+    def __init__(self, result="value", error=None):
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.cancelled = False
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight, loader = SingleFlight(), Loader()
+
+    waiters = [asyncio.create_task(flight.do(1, loader)) for _ in range(50)]
+    await loader.started.wait()
+    loader.release.set()
+
+    assert await asyncio.gather(*waiters) == ["value"] * 50
+    assert loader.calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    flight, loader = SingleFlight(), Loader()
+    loader.release.set()
+
+    await asyncio.gather(flight.do(1, loader), flight.do(2, loader))
+
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_error_is_raised_to_every_waiter_and_not_cached():
+    flight, loader = SingleFlight(), Loader(error=ValueError("boom"))
+
+    waiters = [asyncio.create_task(flight.do(1, loader)) for _ in range(3)]
+    await loader.started.wait()
+    loader.release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    loader.error = None
+    assert await flight.do(1, loader) == "value"
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_others():
+    flight, loader = SingleFlight(), Loader()
+
+    first = asyncio.create_task(flight.do(1, loader))
+    second = asyncio.create_task(flight.do(1, loader))
+    await loader.started.wait()
+    first.cancel()
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    assert await second == "value"
+    assert first.cancelled()
+    assert not loader.cancelled
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_when_last_waiter_gives_up():
+    flight, loader = SingleFlight(), Loader()
+
+    waiter = asyncio.create_task(flight.do(1, loader))
+    await loader.started.wait()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.sleep(0)
+
+    assert loader.cancelled
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_caller_joining_after_last_waiter_cancelled_starts_a_new_call():
+    flight, loader, fresh = SingleFlight(), Loader(), Loader(result="fresh")
+    fresh.release.set()
+
+    waiter = asyncio.create_task(flight.do(1, loader))
+    await loader.started.wait()
+    waiter.cancel()
+    # Runs right after the waiter cancels the shared call, before that call
+    # has processed its cancellation
+    joiner = asyncio.create_task(flight.do(1, fresh))
+
+    assert await joiner == "fresh"
+    assert waiter.cancelled()
+    assert loader.cancelled
+    assert fresh.calls == 1
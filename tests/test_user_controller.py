@@ -1,16 +1,19 @@
-from unittest.mock import AsyncMock, Mock
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from fastapi import FastAPI, status
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock
-from httpx import AsyncClient 
-
- 
+from httpx import AsyncClient
 
+from src.api.config import settings
 from src.api.controller.user_controller import router
 from src.api.dependencies.provider import get_user_service
+from src.api.mapper.user_mapper import UserMapper
+from src.api.model.enum import UserIdentifier, UserRole, UserStatus
 from src.api.service.user_service import UserService
+from src.api.utils.conditional import make_etag
+from src.api.utils.pagination import decode_cursor, encode_cursor
 from tests.test_data import (
     user_minimal,
     user_request_bad_email_json,
@@ -143,6 +146,7 @@ def cleanup(app):
     yield
     app.dependency_overrides.clear()
 
+
 # Test for GET/user/{id}
 @pytest.mark.asyncio
 async def test_get_user_success(
@@ -152,7 +156,9 @@ async def test_get_user_success(
     app.dependency_overrides[get_user_service] = mock_get_user_service
 
     # Prepare mock response
-    mock_user_service.get_user = AsyncMock(return_value=valid_user_service_response)
+    mock_user_service.get_user_entry = AsyncMock(
+        return_value=(valid_user_service_response, False)
+    )
 
     # Make request
     user_id = 1  # Example user ID
@@ -161,7 +167,8 @@ async def test_get_user_success(
     # Assertions
     assert response.status_code == status.HTTP_200_OK
     assert response.content.decode() == user_response_valid_json
-    mock_user_service.get_user.assert_called_once_with(user_id)
+    assert "x-cache-stale" not in response.headers
+    mock_user_service.get_user_entry.assert_called_once_with(user_id)
 
 
 @pytest.mark.asyncio
@@ -172,7 +179,7 @@ async def test_get_user_not_found(
     app.dependency_overrides[get_user_service] = mock_get_user_service
 
     # Simulate user not found (return None)
-    mock_user_service.get_user = AsyncMock(return_value=None)
+    mock_user_service.get_user_entry = AsyncMock(return_value=(None, False))
 
     # Make request
     user_id = 999  # Non-existent user ID
@@ -182,4 +189,344 @@ async def test_get_user_not_found(
     # Assertions
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert "User not found" in response.content.decode()
-    mock_user_service.get_user.assert_called_once_with(user_id)
+    mock_user_service.get_user_entry.assert_called_once_with(user_id)
+
+
+@pytest.mark.asyncio
+async def test_get_user_stale_sets_header(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.get_user_entry = AsyncMock(
+        return_value=(valid_user_service_response, True)
+    )
+
+    response = client.get("/api/v1/user/1")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Cache-Stale"] == "true"
+
+
+@pytest.mark.asyncio
+async def test_get_user_sets_etag_and_cache_control(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.get_user_entry = AsyncMock(
+        return_value=(valid_user_service_response, False)
+    )
+
+    response = client.get("/api/v1/user/123")
+
+    assert response.headers["ETag"] == make_etag(
+        valid_user_service_response.id, valid_user_service_response.updated_at
+    )
+    assert response.headers["Cache-Control"] == settings.USER_CACHE_CONTROL
+
+
+@pytest.mark.asyncio
+async def test_get_user_not_modified(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.get_user_entry = AsyncMock(
+        return_value=(valid_user_service_response, False)
+    )
+    etag = client.get("/api/v1/user/123").headers["ETag"]
+
+    with patch.object(UserMapper, "to_response") as to_response:
+        response = client.get("/api/v1/user/123", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    to_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_user_modified_returns_body(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.get_user_entry = AsyncMock(
+        return_value=(valid_user_service_response, False)
+    )
+
+    response = client.get("/api/v1/user/123", headers={"If-None-Match": '"old"'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content.decode() == user_response_valid_json
+
+
+@pytest.mark.asyncio
+async def test_check_availability(
+    app, client, mock_user_service, mock_get_user_service
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.check_availability = AsyncMock(return_value=(False, None))
+
+    response = client.get("/api/v1/user/availability", params={"username": "alice"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"username": False, "email": None}
+    mock_user_service.check_availability.assert_called_once_with("alice", None)
+
+
+@pytest.mark.asyncio
+async def test_check_availability_requires_username_or_email(
+    app, client, mock_user_service, mock_get_user_service
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+
+    response = client.get("/api/v1/user/availability")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_check_availability_rejects_invalid_email(
+    app, client, mock_user_service, mock_get_user_service
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+
+    response = client.get("/api/v1/user/availability", params={"email": "nope"})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_email(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.get_user_entry_by = AsyncMock(
+        return_value=(valid_user_service_response, False)
+    )
+
+    response = client.get("/api/v1/user/by-email/Test@Example.com")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content.decode() == user_response_valid_json
+    assert "ETag" in response.headers
+    mock_user_service.get_user_entry_by.assert_called_once_with(
+        UserIdentifier.EMAIL, "Test@Example.com"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_phone_not_found(
+    app, client, mock_user_service, mock_get_user_service
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.get_user_entry_by = AsyncMock(return_value=(None, False))
+
+    response = client.get("/api/v1/user/by-phone/+15550100199")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    mock_user_service.get_user_entry_by.assert_called_once_with(
+        UserIdentifier.PHONE, "+15550100199"
+    )
+
+
+# Tests for POST /users:batch
+@pytest.mark.asyncio
+async def test_register_users_batch_mixed_results(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.register_users = AsyncMock(
+        return_value=[valid_user_service_response, None]
+    )
+
+    response = client.post(
+        "/api/v1/users:batch", json=[user_request_valid_json, user_request_valid_json]
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["created"] == 1
+    assert body["conflicts"] == 1
+    assert body["results"][0]["status"] == "CREATED"
+    assert body["results"][0]["user"]["username"] == "testuser"
+    assert body["results"][1]["status"] == "CONFLICT"
+    assert body["results"][1]["user"] is None
+    assert len(mock_user_service.register_users.call_args.args[0]) == 2
+
+
+@pytest.mark.asyncio
+async def test_register_users_batch_too_large(
+    app, client, mock_user_service, mock_get_user_service, monkeypatch
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    monkeypatch.setattr(settings, "USER_BATCH_MAX_SIZE", 1)
+
+    response = client.post(
+        "/api/v1/users:batch", json=[user_request_valid_json, user_request_valid_json]
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_user_service.register_users.assert_not_called()
+
+
+# Tests for GET /users/export
+@pytest.mark.asyncio
+async def test_export_users_streams_ndjson(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.export_users.return_value = iter(
+        [[valid_user_service_response, valid_user_service_response], [user_minimal]]
+    )
+
+    response = client.get(
+        "/api/v1/users/export", headers={"Accept-Encoding": "identity"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    assert response.text.splitlines() == [user_response_valid_json] * 3
+
+
+@pytest.mark.asyncio
+async def test_export_users_gzip(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.export_users.return_value = iter([[valid_user_service_response]])
+
+    response = client.get("/api/v1/users/export", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    # The test client transparently decompresses the body
+    assert response.text.splitlines() == [user_response_valid_json]
+
+
+# Tests for GET /users
+@pytest.mark.asyncio
+async def test_list_users_returns_page_and_next_cursor(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    next_key = (datetime(2024, 11, 7, 18, 22, 38), 123)
+    mock_user_service.list_users = AsyncMock(
+        return_value=([valid_user_service_response], next_key)
+    )
+
+    response = client.get(
+        "/api/v1/users", params={"role": "GUEST", "status": "ACTIVE", "limit": 1}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert len(body["items"]) == 1
+    assert decode_cursor(body["nextCursor"]) == next_key
+    mock_user_service.list_users.assert_awaited_once_with(
+        1,
+        role=UserRole.GUEST,
+        user_status=UserStatus.ACTIVE,
+        created_from=None,
+        created_to=None,
+        after=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_users_continues_from_cursor(
+    app, client, mock_user_service, mock_get_user_service
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.list_users = AsyncMock(return_value=([], None))
+    key = (datetime(2024, 1, 1), 7)
+
+    response = client.get("/api/v1/users", params={"cursor": encode_cursor(key)})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"items": [], "nextCursor": None}
+    assert mock_user_service.list_users.call_args.kwargs["after"] == key
+    assert mock_user_service.list_users.call_args.args == (
+        settings.USER_PAGE_DEFAULT_SIZE,
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_users_rejects_invalid_cursor(
+    app, client, mock_user_service, mock_get_user_service
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.list_users = AsyncMock()
+
+    response = client.get("/api/v1/users", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_user_service.list_users.assert_not_called()
+
+
+# Tests for multi-get (GET /users?ids= and POST /users:batchGet)
+@pytest.mark.asyncio
+async def test_get_users_by_ids(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.get_users = AsyncMock(
+        return_value=([valid_user_service_response], [5])
+    )
+
+    response = client.get("/api/v1/users", params={"ids": "123,5"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["missing"] == [5]
+    assert [user["id"] for user in response.json()["items"]] == [123]
+    mock_user_service.get_users.assert_awaited_once_with([123, 5])
+
+
+@pytest.mark.asyncio
+async def test_get_users_by_ids_rejects_non_integer_ids(
+    app, client, mock_user_service, mock_get_user_service
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+
+    response = client.get("/api/v1/users", params={"ids": "1,abc"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_users_by_ids_rejects_filters(
+    app, client, mock_user_service, mock_get_user_service
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+
+    response = client.get("/api/v1/users", params={"ids": "1", "role": "GUEST"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_batch_get_users(
+    app, client, mock_user_service, mock_get_user_service, valid_user_service_response
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.get_users = AsyncMock(
+        return_value=([valid_user_service_response], [])
+    )
+
+    response = client.post("/api/v1/users:batchGet", json={"ids": [123]})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["missing"] == []
+    mock_user_service.get_users.assert_awaited_once_with([123])
+
+
+@pytest.mark.asyncio
+async def test_batch_get_users_rejects_oversized_list(
+    app, client, mock_user_service, mock_get_user_service
+):
+    app.dependency_overrides[get_user_service] = mock_get_user_service
+    mock_user_service.get_users = AsyncMock()
+    ids = list(range(settings.USER_MULTI_GET_MAX_IDS + 1))
+
+    response = client.post("/api/v1/users:batchGet", json={"ids": ids})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_user_service.get_users.assert_not_called()
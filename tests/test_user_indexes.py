@@ -0,0 +1,124 @@
+"""
+Checks the plans of the GET /api/v1/users query and of the lookups by
+identifier against a real database.
+
+Runs only when TEST_DATABASE_URL points at a Postgres database. The schema
+and docs/db.indexes.sql are applied to an empty scratch schema inside a
+transaction that is rolled back, so existing data neither skews the plans nor
+is touched.
+"""
+
+import itertools
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.api.model.enum import UserIdentifier, UserRole, UserStatus
+from src.api.repository import queries
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+DOCS = Path(__file__).resolve().parent.parent / "docs"
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set"
+)
+
+# Enough rows for the planner to cost the indexes realistically. The filter
+# values used below are rare (2% STAFF, 2.5% SUSPENDED), which is where
+# scanning the created_at index and discarding rows would be slowest.
+SEED_USERS = """
+    INSERT INTO "user" (username, email, phone_e164, role, status, created_at)
+    SELECT 'user' || n, 'user' || n || '@example.com', '+1555' || lpad(n::text, 7, '0'),
+           CASE WHEN n % 50 = 0 THEN 'STAFF' ELSE 'GUEST' END,
+           CASE WHEN n % 40 = 0 THEN 'SUSPENDED' ELSE 'ACTIVE' END,
+           TIMESTAMP '2024-01-01' + n * INTERVAL '1 minute'
+    FROM generate_series(1, 20000) AS n;
+"""
+
+EXPECTED_INDEX = {
+    (False, False): "user_created_at_id_idx",
+    (True, False): "user_role_created_at_id_idx",
+    (False, True): "user_status_created_at_id_idx",
+    (True, True): "user_role_status_created_at_id_idx",
+}
+
+
+@pytest.fixture(scope="module")
+def cursor():
+    conn = psycopg2.connect(TEST_DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("CREATE SCHEMA user_index_check")
+            cur.execute("SET LOCAL search_path = user_index_check")
+            cur.execute((DOCS / "db.schema.sql").read_text())
+            cur.execute((DOCS / "db.indexes.sql").read_text())
+            cur.execute(SEED_USERS)
+            cur.execute('ANALYZE address, "user"')
+            # Make any plan that avoids an index prohibitively expensive so
+            # the test checks that a suitable one exists.
+            cur.execute("SET LOCAL enable_seqscan = off")
+            yield cur
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(cursor, query, params):
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(plan_nodes(plan[0]["Plan"]))
+
+
+@pytest.mark.parametrize(
+    "by_role, by_status, by_range, after",
+    list(itertools.product([False, True], repeat=4)),
+)
+def test_list_users_uses_index_for_every_filter_combination(
+    cursor, by_role, by_status, by_range, after
+):
+    query, params = queries.select_users_page(
+        50,
+        role=UserRole.STAFF if by_role else None,
+        status=UserStatus.SUSPENDED if by_status else None,
+        created_from=datetime(2024, 1, 2) if by_range else None,
+        created_to=datetime(2024, 1, 12) if by_range else None,
+        after=(datetime(2024, 1, 5), 5760) if after else None,
+    )
+    nodes = explain(cursor, query, params)
+
+    user_scan = next(node for node in nodes if node.get("Relation Name") == "user")
+    assert user_scan["Node Type"] in ("Index Scan", "Index Only Scan")
+    assert user_scan["Index Name"] == EXPECTED_INDEX[(by_role, by_status)]
+    # The index order satisfies ORDER BY, so a page never needs a sort
+    assert not any(node["Node Type"] == "Sort" for node in nodes)
+
+
+@pytest.mark.parametrize(
+    "identifier, value, index",
+    [
+        (UserIdentifier.USERNAME, "user42", "user_username_key"),
+        (UserIdentifier.EMAIL, "user42@example.com", "user_lower_email_idx"),
+        (UserIdentifier.PHONE, "+15550000042", "user_phone_e164_idx"),
+    ],
+)
+def test_lookup_by_identifier_uses_index(cursor, identifier, value, index):
+    query = queries.SELECT_USER_BY_IDENTIFIER[identifier]
+
+    nodes = explain(cursor, query, (value,))
+
+    user_scan = next(node for node in nodes if node.get("Relation Name") == "user")
+    assert user_scan["Node Type"] in ("Index Scan", "Bitmap Heap Scan")
+    assert index in {node.get("Index Name") for node in nodes}
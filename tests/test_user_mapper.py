@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.api.mapper.user_mapper import UserMapper
+from src.api.model.domain import Address, User
+from src.api.model.enum import UserRole, UserStatus
+from src.api.utils.responses import render_json
+from tests.test_data import get_user_dict, get_user_row
+
+
+@pytest.mark.parametrize(
+    "user",
+    [
+        User(
+            id=1,
+            username="testuser",
+            email="test@example.com",
+            created_at=datetime(2024, 11, 7, 18, 22, 38, 816855, tzinfo=timezone.utc),
+            updated_at=datetime(2024, 11, 7, 18, 22, 38, tzinfo=timezone.utc),
+        ),
+        User(
+            id=2,
+            phone_number="+15550100",
+            first_name="Zoë",
+            last_name='O"Brien',
+            address=Address(street="1 Main St", city="Town", postal_code="123"),
+            role=UserRole.STAFF,
+            status=UserStatus.SUSPENDED,
+            last_login_at=datetime(2024, 1, 2, 3, 4, 5, 6),
+            created_at=datetime(2024, 1, 1),
+            updated_at=datetime(2024, 1, 2, 3, 4, 5, 600000),
+        ),
+    ],
+)
+def test_response_dict_encodes_like_user_response(user):
+    expected = UserMapper.to_response(user).model_dump_json().encode()
+
+    assert render_json(UserMapper.to_response_dict(user)) == expected
+
+
+def test_row_mapper_decodes_tuple_rows_by_position():
+    to_user = UserMapper.row_mapper(tuple(get_user_dict[0]))
+
+    user = to_user(get_user_row[0])
+
+    assert (user.id, user.username, user.phone_number) == (1, "testuser", "1234567890")
+    assert (user.address.id, user.address.city) == (1, "Test City")
+    assert user.address.postal_code == "12345"
+    # Known values become enum members, unknown ones stay raw strings
+    assert user.status is UserStatus.ACTIVE
+    assert user.role == "USER"
+    assert UserMapper.row_mapper(tuple(get_user_dict[0])) is to_user
+
+
+def test_row_mapper_without_address_columns():
+    columns = tuple(get_user_dict[0])[:12]
+
+    user = UserMapper.row_mapper(columns)(get_user_row[0][:12])
+
+    assert user.address is None
+    assert user.created_at == get_user_dict[0]["created_at"]
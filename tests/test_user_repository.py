@@ -1,11 +1,22 @@
+from datetime import datetime
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from fastapi import HTTPException, status
 from psycopg2 import errors
 
+from src.api.cache import UserAvailabilityFilter
+from src.api.model.enum import UserIdentifier, UserRole, UserStatus
+from src.api.repository import queries
 from src.api.repository.user_repository import UserRepository
-from tests.test_data import address, get_user, save_user_dict, get_user_dict
+from tests.test_data import (
+    address,
+    get_user,
+    get_user_dict,
+    get_user_row,
+    save_user_dict,
+    user_row_description,
+)
 
 
 # Test fixtures
@@ -19,6 +30,8 @@ def mock_db_cursor():
     cursor = MagicMock()
     cursor.__enter__ = Mock(return_value=cursor)
     cursor.__exit__ = Mock(return_value=None)
+    cursor.description = user_row_description
+    cursor.rowcount = 1
     return cursor
 
 
@@ -59,6 +72,7 @@ def test_check_db_connection_success(user_repository, mock_db_pool):
 
     # Set execute method to ensure it works as expected
     mock_cursor.execute.return_value = None
+    mock_cursor.rowcount = 1
 
     # Act
     result = user_repository.check_db_connection()
@@ -104,12 +118,22 @@ def test_save_user_success(
     mock_db_connection.commit.assert_called_once()
 
 
-def test_save_user_unique_violation(
+def test_save_user_single_statement(
     user_repository, mock_db_pool, mock_db_connection, mock_db_cursor, sample_user
 ):
-    # Arrange
-    mock_db_pool.get_connection.return_value = mock_db_connection
-    mock_db_cursor.execute.side_effect = errors.UniqueViolation("Duplicate user")
+    mock_db_cursor.fetchone.side_effect = save_user_dict
+
+    result = user_repository.save(sample_user)
+
+    assert result.address.city == "Test City"
+    mock_db_cursor.execute.assert_called_once_with(*queries.insert_user(sample_user))
+
+
+def test_save_user_conflict(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor, sample_user
+):
+    # Arrange: ON CONFLICT DO NOTHING returns no row
+    mock_db_cursor.fetchone.return_value = None
 
     # Act & Assert
     with pytest.raises(HTTPException) as exc_info:
@@ -117,22 +141,44 @@ def test_save_user_unique_violation(
 
     assert exc_info.value.status_code == status.HTTP_409_CONFLICT
     assert "User already exists" in str(exc_info.value.detail)
+    mock_db_connection.rollback.assert_called_once()
+    mock_db_connection.commit.assert_not_called()
 
-def test_get_user_success(user_repository, mock_db_pool, mock_db_connection, mock_db_cursor):
-     # Arrange
+
+def test_save_user_error_rolls_back(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor, sample_user
+):
+    mock_db_cursor.execute.side_effect = errors.OperationalError("connection lost")
+
+    with pytest.raises(Exception) as exc_info:
+        user_repository.save(sample_user)
+
+    assert "Error saving user" in str(exc_info.value)
+    mock_db_connection.rollback.assert_called_once()
+    mock_db_connection.commit.assert_not_called()
+
+
+def test_get_user_success(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor
+):
+    # Arrange
     mock_db_pool.get_connection.return_value = mock_db_connection
-    
+
     # Simulate a valid user returned from the database
-    mock_db_cursor.fetchone.side_effect = get_user_dict
-    
+    mock_db_cursor.fetchone.side_effect = get_user_row
+
     # Call the repository method
     user = user_repository.get_user(1)
 
     # Assertions
     assert user.username == "testuser"
-    mock_db_cursor.execute.assert_called()
+    assert user.address.city == "Test City"
+    mock_db_cursor.execute.assert_called_once_with(queries.SELECT_USER_BY_ID, (1,))
+
 
-def test_get_user_not_found(user_repository, mock_db_pool, mock_db_connection, mock_db_cursor):
+def test_get_user_not_found(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor
+):
     # Simulate no user found in the database
     mock_db_cursor.fetchone.return_value = None
 
@@ -141,9 +187,163 @@ def test_get_user_not_found(user_repository, mock_db_pool, mock_db_connection, m
 
     # Assertions
     assert user is None
-    mock_db_cursor.execute.assert_called_once_with("""
-                        SELECT id, username, email, first_name, last_name, phone_number,
-                               address_id, role, status, last_login_at, created_at, updated_at
-                        FROM "user"
-                        WHERE id = %s;
-                    """, (999,))
+    mock_db_cursor.execute.assert_called_once_with(queries.SELECT_USER_BY_ID, (999,))
+
+
+def test_get_user_by_email_uses_lower_email_query(
+    user_repository, mock_db_pool, mock_db_cursor
+):
+    mock_db_cursor.fetchone.side_effect = get_user_row
+
+    user = user_repository.get_user_by(UserIdentifier.EMAIL, "test@example.com")
+
+    assert user.email == "test@example.com"
+    mock_db_cursor.execute.assert_called_once_with(
+        queries.SELECT_USER_BY_EMAIL, ("test@example.com",)
+    )
+
+
+def test_insert_user_stores_e164_phone(sample_user):
+    sample_user.phone_number = "(555) 010-0199"
+
+    _, params = queries.insert_user(sample_user)
+
+    assert params[params.index("(555) 010-0199") + 1] == "+15550100199"
+
+
+def test_get_user_without_address(user_repository, mock_db_pool, mock_db_cursor):
+    # LEFT JOIN yields NULL address columns when the user has no address
+    row = dict(get_user_dict[0], address_id=None, street=None, city=None)
+    mock_db_cursor.fetchone.return_value = tuple(row.values())
+
+    user = user_repository.get_user(1)
+
+    assert user.username == "testuser"
+    assert user.address is None
+    mock_db_cursor.execute.assert_called_once()
+
+
+# Tests for save_many method
+def test_save_many_reports_conflicts_and_removes_their_addresses(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor, sample_user
+):
+    # Two users with addresses; the second one conflicts
+    mock_db_cursor.fetchone.return_value = {"user_ids": [1, 2], "address_ids": [7, 8]}
+    mock_db_cursor.fetchall.return_value = save_user_dict
+
+    results = user_repository.save_many([sample_user, sample_user])
+
+    assert results[0].id == 1
+    assert results[1] is None
+    mock_db_cursor.execute.assert_any_call(queries.DELETE_ADDRESSES, ([8],))
+    mock_db_connection.commit.assert_called_once()
+
+
+def test_save_many_error_rolls_back(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor, sample_user
+):
+    mock_db_cursor.execute.side_effect = errors.OperationalError("connection lost")
+
+    with pytest.raises(Exception) as exc_info:
+        user_repository.save_many([sample_user])
+
+    assert "Error saving users" in str(exc_info.value)
+    mock_db_connection.rollback.assert_called_once()
+
+
+# Tests for iter_users method
+def test_iter_users_streams_batches_from_named_cursor(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor
+):
+    mock_db_cursor.fetchmany.side_effect = [get_user_row * 2, get_user_row, []]
+
+    batches = list(user_repository.iter_users(2))
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert batches[0][0].address.city == "Test City"
+    assert mock_db_connection.cursor.call_args.kwargs["name"] == "user_export"
+    mock_db_cursor.execute.assert_called_once_with(queries.SELECT_ALL_USERS)
+    mock_db_connection.rollback.assert_called_once()
+
+
+# Tests for list_users method
+def test_select_users_page_builds_keyset_condition():
+    after = (datetime(2024, 1, 1), 7)
+
+    query, params = queries.select_users_page(
+        10, role=UserRole.STAFF, created_to=datetime(2024, 2, 1), after=after
+    )
+
+    assert "u.role = %s AND u.created_at < %s" in query
+    assert "(u.created_at, u.id) > (%s, %s)" in query
+    assert params == ("STAFF", datetime(2024, 2, 1), *after, 10)
+
+
+def test_select_users_page_without_filters_has_no_where_clause():
+    query, params = queries.select_users_page(10)
+
+    assert "WHERE" not in query
+    assert params == (10,)
+
+
+def test_list_users_success(user_repository, mock_db_pool, mock_db_cursor):
+    mock_db_cursor.fetchall.return_value = get_user_row
+
+    users = user_repository.list_users(10, user_status=UserStatus.ACTIVE)
+
+    assert [user.username for user in users] == ["testuser"]
+    query, params = mock_db_cursor.execute.call_args.args
+    assert "u.status = %s" in query
+    assert params == ("ACTIVE", 10)
+
+
+# Tests for get_users method
+def test_get_users_uses_single_query(user_repository, mock_db_pool, mock_db_cursor):
+    mock_db_cursor.fetchall.return_value = get_user_row
+
+    users = user_repository.get_users([1, 2])
+
+    assert [user.address.city for user in users] == ["Test City"]
+    mock_db_cursor.execute.assert_called_once_with(
+        queries.SELECT_USERS_BY_IDS, ([1, 2],)
+    )
+
+
+# Tests for the availability filter
+def test_save_records_user_in_availability_filter(
+    mock_db_pool, mock_db_cursor, sample_user
+):
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    availability_filter.loaded = True
+    user_repository = UserRepository(availability_filter)
+    mock_db_cursor.fetchone.side_effect = save_user_dict
+
+    user_repository.save(sample_user)
+
+    assert availability_filter.might_be_taken("testuser", "test@example.com") == (
+        True,
+        True,
+    )
+
+
+def test_find_taken_uses_single_query(user_repository, mock_db_pool, mock_db_cursor):
+    mock_db_cursor.fetchone.return_value = (True, False)
+
+    taken = user_repository.find_taken("testuser", None)
+
+    assert taken == (True, False)
+    mock_db_cursor.execute.assert_called_once_with(
+        queries.SELECT_TAKEN, ("testuser", None)
+    )
+
+
+def test_iter_identities_streams_from_named_cursor(
+    user_repository, mock_db_pool, mock_db_connection, mock_db_cursor
+):
+    mock_db_cursor.fetchmany.side_effect = [[("a", None), (None, "b@x.io")], []]
+
+    batches = list(user_repository.iter_identities(1000))
+
+    assert batches == [[("a", None), (None, "b@x.io")]]
+    assert mock_db_connection.cursor.call_args.kwargs["name"] == "user_identities"
+    mock_db_connection.rollback.assert_called_once()
@@ -1,13 +1,18 @@
+import asyncio
+import threading
 from unittest.mock import MagicMock
 
 import pytest
 from fastapi import HTTPException
 from psycopg2 import errors
-from unittest.mock import MagicMock
 
+from src.api.cache import LRUTTLCache, MemoryCacheBackend, UserAvailabilityFilter
+from src.api.model.enum import UserIdentifier, UserRole
+from src.api.repository.async_user_repository import AsyncUserRepository
 from src.api.repository.user_repository import UserRepository
 from src.api.service.user_service import UserService
-from tests.test_data import user
+from tests.test_data import get_user, user
+from tests.test_lru_cache import FakeClock
 
 
 @pytest.fixture
@@ -43,7 +48,7 @@ async def test_register_user_failed(user_service, mock_user_repository, mock_use
         await user_service.register_user(mock_user)
 
     assert exc_info.value.status_code == 500
-    assert exc_info.value.detail == "500: Failed to create user"
+    assert exc_info.value.detail == "Failed to create user"
     mock_user_repository.save.assert_called_once_with(mock_user)
 
 
@@ -74,6 +79,20 @@ async def test_register_user_record_exists(
     assert exc_info.value.detail == "User already exists"
     mock_user_repository.save.assert_called_once_with(mock_user)
 
+
+@pytest.mark.asyncio
+async def test_register_user_conflict(user_service, mock_user_repository, mock_user):
+    mock_user_repository.save.side_effect = HTTPException(
+        status_code=409, detail="User already exists: username or email is taken"
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await user_service.register_user(mock_user)
+
+    assert exc_info.value.status_code == 409
+    mock_user_repository.save.assert_called_once_with(mock_user)
+
+
 @pytest.mark.asyncio
 async def test_get_user_by_id_success(user_service, mock_user_repository, mock_user):
     # Mock the repository method to return a mock user
@@ -97,3 +116,459 @@ async def test_get_user_by_id_not_found(user_service, mock_user_repository):
 
     assert user == None
     mock_user_repository.get_user.assert_called_once_with(999)
+
+
+@pytest.mark.asyncio
+async def test_get_user_with_async_repository(mock_user):
+    async_repository = MagicMock(spec=AsyncUserRepository)
+    async_repository.get_user.return_value = mock_user
+    service = UserService(async_repository)
+
+    user = await service.get_user(1)
+
+    assert user == mock_user
+    async_repository.get_user.assert_awaited_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_register_users_success(user_service, mock_user_repository, mock_user):
+    mock_user_repository.save_many.return_value = [mock_user, None]
+
+    results = await user_service.register_users([mock_user, mock_user])
+
+    assert results == [mock_user, None]
+    mock_user_repository.save_many.assert_called_once_with([mock_user, mock_user])
+
+
+@pytest.mark.asyncio
+async def test_register_users_exception(user_service, mock_user_repository, mock_user):
+    mock_user_repository.save_many.side_effect = Exception("Database error")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await user_service.register_users([mock_user])
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail == "Database error"
+
+
+@pytest.mark.asyncio
+async def test_list_users_returns_next_key_when_more_rows_exist(
+    user_service, mock_user_repository
+):
+    users = [get_user(None) for _ in range(3)]
+    for user_id, page_user in enumerate(users, start=1):
+        page_user.id = user_id
+    mock_user_repository.list_users.return_value = users
+
+    page, next_key = await user_service.list_users(2, role=UserRole.STAFF)
+
+    assert page == users[:2]
+    assert next_key == (users[1].created_at, 2)
+    mock_user_repository.list_users.assert_called_once_with(
+        3,
+        role=UserRole.STAFF,
+        user_status=None,
+        created_from=None,
+        created_to=None,
+        after=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_repository_calls_run_off_the_event_loop(
+    user_service, mock_user_repository, mock_user
+):
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def record_thread(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return [mock_user]
+
+    mock_user_repository.save.side_effect = lambda user: record_thread() and user
+    mock_user_repository.save_many.side_effect = record_thread
+    mock_user_repository.get_users.side_effect = record_thread
+    mock_user_repository.list_users.side_effect = record_thread
+
+    await user_service.register_user(mock_user)
+    await user_service.register_users([mock_user])
+    await user_service.get_users([mock_user.id])
+    await user_service.list_users(2, role=UserRole.STAFF)
+
+    assert len(threads) == 4
+    assert loop_thread not in threads
+
+
+@pytest.mark.asyncio
+async def test_list_users_last_page_has_no_next_key(
+    user_service, mock_user_repository, mock_user
+):
+    mock_user_repository.list_users.return_value = [mock_user]
+
+    page, next_key = await user_service.list_users(2)
+
+    assert page == [mock_user]
+    assert next_key is None
+
+
+@pytest.mark.asyncio
+async def test_get_users_preserves_order_and_reports_missing(
+    user_service, mock_user_repository
+):
+    users = [get_user(None) for _ in range(2)]
+    users[0].id, users[1].id = 1, 2
+    mock_user_repository.get_users.return_value = users
+
+    found, missing = await user_service.get_users([2, 9, 1, 2])
+
+    assert found == [users[1], users[0]]
+    assert missing == [9]
+    mock_user_repository.get_users.assert_called_once_with([2, 9, 1])
+
+
+@pytest.fixture
+def cached_user_service(mock_user_repository):
+    return UserService(
+        mock_user_repository, MemoryCacheBackend(LRUTTLCache(max_size=10, ttl=60))
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_user_is_served_from_cache(
+    cached_user_service, mock_user_repository, mock_user
+):
+    mock_user_repository.get_user.return_value = mock_user
+
+    first = await cached_user_service.get_user(1)
+    second = await cached_user_service.get_user(1)
+
+    assert first is second is mock_user
+    mock_user_repository.get_user.assert_called_once_with(1)
+    assert cached_user_service.cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_user_does_not_cache_missing_users(
+    cached_user_service, mock_user_repository
+):
+    mock_user_repository.get_user.return_value = None
+
+    await cached_user_service.get_user(1)
+    await cached_user_service.get_user(1)
+
+    assert mock_user_repository.get_user.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_register_user_invalidates_cache(
+    cached_user_service, mock_user_repository, mock_user
+):
+    await cached_user_service.cache.set(f"user:{mock_user.id}", "stale")
+    mock_user_repository.save.return_value = mock_user
+
+    await cached_user_service.register_user(mock_user)
+
+    assert await cached_user_service.cache.get(f"user:{mock_user.id}") is None
+
+
+@pytest.mark.asyncio
+async def test_register_users_invalidates_saved_users(
+    cached_user_service, mock_user_repository, mock_user
+):
+    await cached_user_service.cache.set(f"user:{mock_user.id}", "stale")
+    mock_user_repository.save_many.return_value = [mock_user, None]
+
+    await cached_user_service.register_users([mock_user, mock_user])
+
+    assert await cached_user_service.cache.get(f"user:{mock_user.id}") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_user_calls_share_one_query(mock_user):
+    async_repository = MagicMock(spec=AsyncUserRepository)
+    release = asyncio.Event()
+
+    async def get_user(user_id):
+        await release.wait()
+        return mock_user
+
+    async_repository.get_user.side_effect = get_user
+    service = UserService(async_repository)
+
+    waiters = [asyncio.create_task(service.get_user(1)) for _ in range(20)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [mock_user] * 20
+    async_repository.get_user.assert_awaited_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_user_calls_share_errors():
+    async_repository = MagicMock(spec=AsyncUserRepository)
+    async_repository.get_user.side_effect = Exception("Database error")
+    service = UserService(async_repository)
+
+    results = await asyncio.gather(
+        service.get_user(1), service.get_user(1), return_exceptions=True
+    )
+
+    assert [result.status_code for result in results] == [500, 500]
+    assert async_repository.get_user.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_users_reads_cache_first_and_fetches_only_misses(
+    cached_user_service, mock_user_repository
+):
+    cached, fetched = get_user(None), get_user(None)
+    cached.id, fetched.id = 1, 2
+    await cached_user_service.cache.set("user:1", cached)
+    mock_user_repository.get_users.return_value = [fetched]
+
+    found, missing = await cached_user_service.get_users([1, 2, 3])
+
+    assert found == [cached, fetched]
+    assert missing == [3]
+    mock_user_repository.get_users.assert_called_once_with([2, 3])
+    assert await cached_user_service.cache.get("user:2") is fetched
+
+
+@pytest.fixture
+def stale_cache():
+    clock = FakeClock()
+    cache = MemoryCacheBackend(
+        LRUTTLCache(max_size=10, ttl=60, stale_ttl=300, clock=clock)
+    )
+    return cache, clock
+
+
+@pytest.mark.asyncio
+async def test_get_user_entry_serves_stale_and_refreshes_in_background(
+    stale_cache, mock_user_repository, mock_user
+):
+    cache, clock = stale_cache
+    service = UserService(mock_user_repository, cache, stale_while_revalidate=30)
+    await cache.set("user:1", "stale user")
+    clock.now = 70
+    mock_user_repository.get_user.return_value = mock_user
+
+    assert await service.get_user_entry(1) == ("stale user", True)
+    await asyncio.gather(*service._refreshes)
+
+    assert await service.get_user_entry(1) == (mock_user, False)
+    mock_user_repository.get_user.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_get_user_entry_serves_stale_if_database_fails(
+    stale_cache, mock_user_repository
+):
+    cache, clock = stale_cache
+    service = UserService(
+        mock_user_repository, cache, stale_while_revalidate=30, stale_if_error=120
+    )
+    await cache.set("user:1", "stale user")
+    mock_user_repository.get_user.side_effect = Exception("Database error")
+
+    clock.now = 150
+    assert await service.get_user_entry(1) == ("stale user", True)
+
+    clock.now = 200
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_user_entry(1)
+    assert exc_info.value.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_get_user_ignores_stale_entries_by_default(
+    stale_cache, mock_user_repository, mock_user
+):
+    cache, clock = stale_cache
+    service = UserService(mock_user_repository, cache)
+    await cache.set("user:1", "stale user")
+    clock.now = 70
+    mock_user_repository.get_user.return_value = mock_user
+
+    assert await service.get_user(1) is mock_user
+
+
+@pytest.fixture
+def availability_filter():
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    availability_filter.add("alice", "alice@example.com")
+    availability_filter.loaded = True
+    return availability_filter
+
+
+@pytest.mark.asyncio
+async def test_check_availability_skips_database_for_definitely_free_values(
+    mock_user_repository, availability_filter
+):
+    service = UserService(mock_user_repository, availability_filter=availability_filter)
+
+    result = await service.check_availability("bob", "bob@example.com")
+
+    assert result == (True, True)
+    mock_user_repository.find_taken.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_check_availability_confirms_maybe_taken_values(
+    mock_user_repository, availability_filter
+):
+    mock_user_repository.find_taken.return_value = (True, False)
+    service = UserService(mock_user_repository, availability_filter=availability_filter)
+
+    result = await service.check_availability("alice", "bob@example.com")
+
+    assert result == (False, True)
+    # Only the value the filter could not rule out is queried
+    mock_user_repository.find_taken.assert_called_once_with("alice", None)
+
+
+@pytest.mark.asyncio
+async def test_check_availability_without_filter_queries_database(
+    user_service, mock_user_repository
+):
+    mock_user_repository.find_taken.return_value = (False, False)
+
+    result = await user_service.check_availability(None, "bob@example.com")
+
+    assert result == (None, True)
+    mock_user_repository.find_taken.assert_called_once_with(None, "bob@example.com")
+
+
+@pytest.mark.asyncio
+async def test_load_availability_filter_streams_identities(mock_user_repository):
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    mock_user_repository.iter_identities.return_value = iter(
+        [[("alice", "alice@example.com"), ("bob", None)], [(None, "carol@example.com")]]
+    )
+    service = UserService(mock_user_repository, availability_filter=availability_filter)
+
+    await service.load_availability_filter(2)
+
+    assert availability_filter.loaded
+    assert availability_filter.bloom.count == 4
+    assert availability_filter.might_be_taken("bob", "carol@example.com") == (
+        True,
+        True,
+    )
+    mock_user_repository.iter_identities.assert_called_once_with(2)
+
+
+@pytest.mark.asyncio
+async def test_load_availability_filter_failure_leaves_it_unloaded(
+    mock_user_repository,
+):
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    mock_user_repository.iter_identities.side_effect = Exception("Database error")
+    service = UserService(mock_user_repository, availability_filter=availability_filter)
+
+    await service.load_availability_filter(2)
+
+    assert not availability_filter.loaded
+
+
+@pytest.mark.asyncio
+async def test_reloading_availability_filter_picks_up_users_created_elsewhere(
+    mock_user_repository,
+):
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    mock_user_repository.iter_identities.side_effect = [
+        iter([[("alice", None)]]),
+        # "bob" was registered by another worker meanwhile
+        iter([[("alice", None), ("bob", None)]]),
+        Exception("Database error"),
+    ]
+    service = UserService(mock_user_repository, availability_filter=availability_filter)
+
+    await service.load_availability_filter(2)
+    assert availability_filter.might_be_taken("bob", None) == (False, False)
+
+    await service.load_availability_filter(2)
+    assert availability_filter.might_be_taken("bob", None) == (True, False)
+
+    # A failed rebuild keeps serving the previous filter
+    await service.load_availability_filter(2)
+    assert availability_filter.loaded
+    assert availability_filter.might_be_taken("bob", None) == (True, False)
+
+
+@pytest.mark.asyncio
+async def test_refresh_availability_filter_rebuilds_every_interval(
+    mock_user_repository,
+):
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    mock_user_repository.iter_identities.side_effect = lambda batch_size: iter([])
+    service = UserService(mock_user_repository, availability_filter=availability_filter)
+
+    refresh = asyncio.create_task(service.refresh_availability_filter(2, 0.01))
+    await asyncio.sleep(0.05)
+    refresh.cancel()
+    await asyncio.gather(refresh, return_exceptions=True)
+
+    assert mock_user_repository.iter_identities.call_count >= 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_availability_filter_without_interval_loads_once(
+    mock_user_repository,
+):
+    availability_filter = UserAvailabilityFilter(max_bytes=1024, error_rate=0.01)
+    mock_user_repository.iter_identities.return_value = iter([])
+    service = UserService(mock_user_repository, availability_filter=availability_filter)
+
+    await service.refresh_availability_filter(2, 0)
+
+    assert availability_filter.loaded
+    mock_user_repository.iter_identities.assert_called_once_with(2)
+
+
+@pytest.mark.asyncio
+async def test_get_user_entry_by_email_normalizes_and_caches(
+    cached_user_service, mock_user_repository, mock_user
+):
+    mock_user_repository.get_user_by.return_value = mock_user
+
+    first = await cached_user_service.get_user_entry_by(
+        UserIdentifier.EMAIL, " Test@Example.com"
+    )
+    second = await cached_user_service.get_user_entry_by(
+        UserIdentifier.EMAIL, "test@example.COM"
+    )
+
+    assert first == second == (mock_user, False)
+    mock_user_repository.get_user_by.assert_called_once_with(
+        UserIdentifier.EMAIL, "test@example.com"
+    )
+    # Cached under the id too, so a lookup by id needs no query
+    assert await cached_user_service.get_user(mock_user.id) is mock_user
+    mock_user_repository.get_user.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_user_entry_by_phone_queries_e164_form(
+    user_service, mock_user_repository, mock_user
+):
+    mock_user_repository.get_user_by.return_value = mock_user
+
+    result = await user_service.get_user_entry_by(
+        UserIdentifier.PHONE, "0044 20 7946 0958"
+    )
+
+    assert result == (mock_user, False)
+    mock_user_repository.get_user_by.assert_called_once_with(
+        UserIdentifier.PHONE, "+442079460958"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_user_entry_by_invalid_phone_is_not_found(
+    user_service, mock_user_repository
+):
+    result = await user_service.get_user_entry_by(UserIdentifier.PHONE, "not a phone")
+
+    assert result == (None, False)
+    mock_user_repository.get_user_by.assert_not_called()